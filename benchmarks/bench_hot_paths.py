@@ -0,0 +1,348 @@
+""" Benchmark Resmon's per-tick hot paths under Qt's offscreen platform
+
+Feeds synthetic data through the process collector (ProcessFetcher's process walk and
+delta step), the process table, tree and cgroup groups (update_process_table and
+CgroupTreeModel.apply_groups), the process filter
+(one query per keystroke), the default alert rules, the Drives tab (update_drives), the graphs (update_graphs
+and RGraph/CoreHeatmap painting) and a sampling round with slow plugin collectors, and reports per-tick latency percentiles and
+allocations. Nothing here needs a display or anything from the
+running system beyond Linux itself.
+
+    python benchmarks/bench_hot_paths.py [--quick] [--only table graphs] [--save] [--compare results/abc123.json]
+
+Results are saved as JSON under benchmarks/results/, named after the current commit.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tracemalloc
+import subprocess
+from types import SimpleNamespace
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtWidgets import QApplication, QWidget, QVBoxLayout, QTableView, QTreeView
+
+import resmon
+from components.graph import RGraph
+from components.heatmap import CoreHeatmap
+from components.processes import ProcfsProcessCollector
+from components.query import ProcessQuery
+from components.alerts import AlertEngine, DEFAULT_RULES
+from components.processmodel import ProcessTableModel, ProcessTreeModel, CgroupTreeModel, ProcessSortProxy
+from components.sampler import Sampler
+from components.snapshot import SnapshotDiffer
+from components.plugins import PluginHost
+from synthetic import build_proc_tree, cleanup_proc_tree, build_process_rows, churn_process_rows
+
+
+
+""" Stand-in for the fetcher that the GUI slots report signal delivery to """
+IDLE_FETCHER = SimpleNamespace(delivered=lambda name: None)
+
+
+
+""" Utility function for summarising tick timings in milliseconds """
+def percentiles(timings):
+    ordered = sorted(timings)
+    def pick(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000
+    return {"p50": pick(0.50), "p95": pick(0.95), "p99": pick(0.99), "max": ordered[-1] * 1000}
+
+
+
+""" Utility function for running a tick function, timed and then under tracemalloc
+
+setup() is called before every tick outside the timed region and returns the
+argument handed to tick().
+"""
+def measure(setup, tick, ticks, alloc_ticks=5):
+    tick(setup())
+    timings = []
+    for _ in range(ticks):
+        argument = setup()
+        start = time.perf_counter()
+        tick(argument)
+        timings.append(time.perf_counter() - start)
+    result = percentiles(timings)
+    allocated = []
+    tracemalloc.start()
+    for _ in range(alloc_ticks):
+        argument = setup()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        tick(argument)
+        allocated.append(tracemalloc.get_traced_memory()[1] - before)
+    tracemalloc.stop()
+    result["alloc_kb"] = sum(allocated) / len(allocated) / 1024
+    return result
+
+
+
+""" Benchmark the process walk and delta step of ProcessFetcher over a synthetic /proc """
+def bench_collector(sizes, ticks):
+    results = {}
+    for size in sizes:
+        root = build_proc_tree(size)
+        try:
+            sampler = Sampler(enabled={"processes"})
+            sampler.process_collector = ProcfsProcessCollector(root)
+            results[f"collector/{size}"] = measure(lambda: None, lambda _: sampler.collect_processes(), ticks)
+        finally:
+            cleanup_proc_tree(root)
+    return results
+
+
+
+""" Utility function for a synthetic cgroup report: 200 services in 4 slices, with the given new PIDs assigned round robin """
+def synthetic_cgroups(rng, pids, reset=False):
+    paths = [f"/slice{index % 4}.slice/service{index}.service" for index in range(200)]
+    groups = [("/", None, None, None, None, None)] + [(f"/slice{index}.slice", rng.randint(1, 999), rng.uniform(1, 9000), rng.uniform(0, 400), rng.uniform(0, 1e7), rng.uniform(0, 1e7)) for index in range(4)]
+    groups += [(path, rng.randint(1, 99), rng.uniform(1, 2000), round(rng.uniform(0, 100), 1), rng.uniform(0, 1e6), rng.uniform(0, 1e6)) for path in paths]
+    return groups, {pid: paths[pid % len(paths)] for pid in pids}, reset
+
+
+
+""" Benchmark update_process_table with churning synthetic process rows, in list, tree or groups mode """
+def bench_table(sizes, ticks, mode="table"):
+    results = {}
+    for size in sizes:
+        rng = random.Random(size)
+        differ = SnapshotDiffer()
+        state = {"rows": build_process_rows(size), "next_pid": size + 1}
+        tree_model = {"tree": ProcessTreeModel, "groups": CgroupTreeModel}.get(mode, lambda: None)()
+        window = SimpleNamespace(process_model=ProcessTableModel(), active_tree=tree_model, fetcher=IDLE_FETCHER, inspector=None)
+        window.update_process_detail = lambda: None
+        window.update_column_pids = lambda: None
+        window.update_visible_rows = lambda: None
+        if tree_model:
+            proxy = ProcessSortProxy()
+            proxy.setSourceModel(tree_model)
+            view = QTreeView()
+            view.setModel(proxy)
+        else:
+            view = QTableView()
+            view.setModel(window.process_model)
+        view.setSortingEnabled(True)
+        view.resize(760, 500)
+        if mode == "groups":
+            tree_model.apply_groups(*synthetic_cgroups(rng, [row[0] for row in state["rows"]], True))
+        resmon.Resmon.update_process_table(window, differ.diff(state["rows"])[0], [], [], True)
+        if tree_model:
+            view.expandToDepth(0)
+
+        def setup():
+            state["rows"], state["next_pid"] = churn_process_rows(state["rows"], rng, state["next_pid"])
+            delta = differ.diff(state["rows"])
+            return delta, synthetic_cgroups(rng, [row[0] for row in delta[0]]) if mode == "groups" else None
+
+        def tick(sample):
+            delta, cgroups = sample
+            resmon.Resmon.update_process_table(window, *delta, False)
+            if cgroups:
+                tree_model.apply_groups(*cgroups)
+            QApplication.processEvents()
+
+        results[f"{mode}/{size}"] = measure(setup, tick, ticks)
+        view.deleteLater()
+    return results
+
+
+
+""" Benchmark typing a filter query into the process table, one keystroke at a time """
+def bench_filter(sizes, ticks):
+    results = {}
+    keystrokes = ["w", "wo", "wor", "work", "wor", "wo", "w", "", "cpu>5", "cpu>5 mem>200MB", "user:root", "/^proc1[0-9]-/", ""]
+    for size in sizes:
+        model = ProcessTableModel()
+        view = QTableView()
+        view.setModel(model)
+        view.setSortingEnabled(True)
+        view.resize(760, 500)
+        model.apply_delta(build_process_rows(size), [], [], True)
+        state = {"step": 0}
+
+        def setup():
+            state["step"] += 1
+            return ProcessQuery(keystrokes[state["step"] % len(keystrokes)])
+
+        def tick(query):
+            model.set_query(query)
+            QApplication.processEvents()
+
+        results[f"filter/{size}"] = measure(setup, tick, max(ticks, len(keystrokes)))
+        view.deleteLater()
+    return results
+
+
+
+""" Benchmark evaluating the default alert rules over churning synthetic process deltas """
+def bench_alerts(sizes, ticks):
+    results = {}
+    for size in sizes:
+        rng = random.Random(size)
+        differ = SnapshotDiffer()
+        state = {"rows": build_process_rows(size), "next_pid": size + 1}
+        engine = AlertEngine(DEFAULT_RULES)
+        engine.on_processes(differ.diff(state["rows"])[0], [], [], True)
+
+        def setup():
+            state["rows"], state["next_pid"] = churn_process_rows(state["rows"], rng, state["next_pid"])
+            return differ.diff(state["rows"])
+
+        results[f"alerts/{size}"] = measure(setup, lambda delta: engine.on_processes(*delta), ticks)
+    return results
+
+
+
+""" Benchmark update_drives with usage changing on every drive and one drive coming and going """
+def bench_drives(sizes, ticks):
+    results = {}
+    rng = random.Random(0)
+    for size in sizes:
+        container = QWidget()
+        window = SimpleNamespace(disk_tab_layout=QVBoxLayout(container), drive_widgets={}, fetcher=IDLE_FETCHER, local=False)
+        window.apply_drives = lambda drives: resmon.Resmon.apply_drives(window, drives)
+        state = {"flip": 0}
+
+        def setup():
+            state["flip"] ^= 1
+            total = 500 * 1024 ** 3
+            return [(f"/dev/sd{index}", f"/mnt/disk{index}", total, int(total * rng.random()), None) for index in range(size - state["flip"])]
+
+        def tick(drives):
+            resmon.Resmon.update_drives(window, drives)
+            QApplication.processEvents()
+
+        results[f"drives/{size}"] = measure(setup, tick, ticks)
+        container.deleteLater()
+    return results
+
+
+
+""" Benchmark update_graphs plus a repaint of every graph, for a range of core counts """
+def bench_graphs(core_counts, ticks):
+    results = {}
+    rng = random.Random(0)
+    image = QImage(760, 500, QImage.Format_ARGB32_Premultiplied)
+    for cores in core_counts:
+        heatmap = cores > resmon.MANY_CORE_THRESHOLD
+        window = SimpleNamespace(
+            fetcher=IDLE_FETCHER,
+            cpu_heatmap=CoreHeatmap(cores=cores, x_points=60, label="CPU") if heatmap else None,
+            cpu_graphs=[] if heatmap else [RGraph(x_points=60, y_points=100, label=f"CPU #{i}") for i in range(cores)],
+            memory_graph=RGraph(x_points=60, y_points=1024, label="Memory"),
+        )
+        window.apply_graphs = lambda cpu_usages, memory_usage: resmon.Resmon.apply_graphs(window, cpu_usages, memory_usage)
+        graphs = ([window.cpu_heatmap] if heatmap else window.cpu_graphs) + [window.memory_graph]
+        for graph in graphs:
+            graph.resize(760 // min(cores, 8), 120)
+            graph.show()
+        QApplication.processEvents()
+
+        def setup():
+            return [rng.uniform(0, 100) for _ in range(cores)], rng.uniform(0, 100)
+
+        def tick(sample):
+            resmon.Resmon.update_graphs(window, *sample)
+            painter = QPainter(image)
+            for graph in graphs:
+                graph.drawGraph(painter)
+            painter.end()
+
+        results[f"graphs/{cores}"] = measure(setup, tick, ticks)
+        for graph in graphs:
+            graph.deleteLater()
+    return results
+
+
+
+""" Benchmark the sampling thread's round with plugin collectors that take 20 ms each, which it only hands to the worker pool """
+def bench_plugins(counts, ticks):
+    results = {}
+    for count in counts:
+        sampler = Sampler(enabled=set())
+        host = PluginHost(sampler)
+        collectors = [host.add("bench", f"sleep{index}", lambda: time.sleep(0.02) or 1.0) for index in range(count)]
+        sampler.scheduler.run_pending()
+
+        def setup():
+            while any(collector.started is not None for collector in collectors):
+                time.sleep(0.005)
+                sampler.scheduler.run_pending()
+            for collector in sampler.scheduler.collectors.values():
+                collector.next_due = 0.0
+
+        results[f"plugins/{count}"] = measure(setup, lambda _: sampler.scheduler.run_due(), ticks)
+        host.close()
+    return results
+
+
+
+""" Utility function for naming a result file after the current commit """
+def current_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BENCH_DIR, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="smaller sizes and fewer ticks")
+    parser.add_argument("--only", nargs="+", choices=("collector", "table", "tree", "groups", "filter", "alerts", "drives", "graphs", "plugins"))
+    parser.add_argument("--ticks", type=int, default=None)
+    parser.add_argument("--save", action="store_true", help="write results to benchmarks/results/<commit>.json")
+    parser.add_argument("--compare", help="earlier result file to compare against")
+    args = parser.parse_args(argv)
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    resmon.loadStyle()
+    process_sizes = [100, 1000, 5000] if args.quick else [100, 1000, 5000, 20000]
+    core_counts = [4, 32, 64] if args.quick else [4, 16, 32, 64, 128, 256]
+    ticks = args.ticks or (10 if args.quick else 30)
+    suites = {
+        "collector": lambda: bench_collector(process_sizes, ticks),
+        "table": lambda: bench_table(process_sizes, ticks),
+        "tree": lambda: bench_table(process_sizes, ticks, "tree"),
+        "groups": lambda: bench_table(process_sizes, ticks, "groups"),
+        "filter": lambda: bench_filter(process_sizes, ticks),
+        "alerts": lambda: bench_alerts(process_sizes, ticks),
+        "drives": lambda: bench_drives([1, 8, 32], ticks),
+        "graphs": lambda: bench_graphs(core_counts, ticks),
+        "plugins": lambda: bench_plugins([1, 8, 32], ticks),
+    }
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)["results"]
+    results = {}
+    print(f"{'case':<20} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'alloc KB':>9}")
+    for name in args.only or suites:
+        for case, stats in suites[name]().items():
+            results[case] = stats
+            line = f"{case:<20} {stats['p50']:>9.2f} {stats['p95']:>9.2f} {stats['p99']:>9.2f} {stats['max']:>9.2f} {stats['alloc_kb']:>9.1f}"
+            if case in baseline:
+                line += f"   p50 x{stats['p50'] / max(baseline[case]['p50'], 1e-9):.2f}"
+            print(line, flush=True)
+    if args.save:
+        results_dir = os.path.join(BENCH_DIR, "results")
+        os.makedirs(results_dir, exist_ok=True)
+        revision = current_revision()
+        path = os.path.join(results_dir, f"{revision}.json")
+        with open(path, "w") as result_file:
+            json.dump({"revision": revision, "time": time.time(), "ticks": ticks, "results": results}, result_file, indent=2)
+        print(f"Saved {path}")
+    app.quit()
+
+
+
+if __name__ == "__main__":
+    main()
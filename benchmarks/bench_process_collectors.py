@@ -0,0 +1,55 @@
+""" Benchmark the /proc process collector against the psutil process_iter path
+
+Both collectors read the same synthetic /proc tree (see synthetic.py), so the
+numbers compare collection cost only, independent of what is running on the host.
+
+    python benchmarks/bench_process_collectors.py [--sizes 1000 5000 20000] [--repeat 5]
+"""
+import os
+import sys
+import time
+import argparse
+import statistics
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from components.processes import PsutilProcessCollector, ProcfsProcessCollector
+from synthetic import build_proc_tree, cleanup_proc_tree
+
+
+
+""" Utility function for timing repeated collect() calls after one warm-up call """
+def time_collector(collector, repeat):
+    collector.collect()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        collector.collect()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+    print(f"{'processes':>10} {'psutil (ms)':>12} {'procfs (ms)':>12} {'speedup':>8}")
+    for size in args.sizes:
+        root = build_proc_tree(size)
+        try:
+            psutil.PROCFS_PATH = root
+            psutil_time = time_collector(PsutilProcessCollector(), args.repeat)
+            procfs_time = time_collector(ProcfsProcessCollector(root), args.repeat)
+        finally:
+            psutil.PROCFS_PATH = "/proc"
+            cleanup_proc_tree(root)
+        print(f"{size:>10} {psutil_time * 1000:>12.1f} {procfs_time * 1000:>12.1f} {psutil_time / procfs_time:>7.1f}x")
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+""" Benchmark the agent protocol with several agents on loopback
+
+Starts N in-process agents fed with churning synthetic process tables, watches all
+of them from one RemoteHosts client and reports the client's CPU time per tick, in
+total and per host, plus the bytes sent per host per tick. The per-host figures
+should stay roughly flat as N grows.
+
+    python benchmarks/bench_remote.py [--hosts 1 2 4 8 16] [--processes 1000] [--ticks 30]
+"""
+import os
+import sys
+import time
+import random
+import argparse
+import threading
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from components.remote import AgentServer, RemoteHosts
+from components.snapshot import SnapshotDiffer
+from synthetic import build_process_rows, churn_process_rows
+
+
+
+""" Define the class for a stand-in Sampler that emits synthetic samples on demand """
+class SyntheticSampler:
+    disk_display = "50.0%"
+
+    def __init__(self, size, seed):
+        self.listeners = {}
+        self.differ = SnapshotDiffer()
+        self.resync_requested = True
+        self.paused = True
+        self.rng = random.Random(seed)
+        self.rows = build_process_rows(size, seed)
+        self.next_pid = size + 1
+
+    def connect(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+
+    def emit(self, event, *args):
+        for callback in self.listeners.get(event, ()):
+            callback(*args)
+
+    def set_paused(self, name, paused):
+        self.paused = paused
+
+    def request_resync(self):
+        self.resync_requested = True
+
+    def tick(self):
+        self.emit("cpu", self.rng.uniform(0, 100), [self.rng.uniform(0, 100) for _ in range(8)], self.rng.uniform(0, 100))
+        if self.paused:
+            return
+        self.rows, self.next_pid = churn_process_rows(self.rows, self.rng, self.next_pid)
+        added, removed, changed = self.differ.diff(self.rows)
+        if self.resync_requested:
+            self.resync_requested = False
+            self.emit("processes", self.differ.snapshot(), [], [], True)
+        else:
+            self.emit("processes", added, removed, changed, False)
+
+
+
+""" Define the class for a RemoteHosts client that counts deltas and its own CPU time """
+class CountingHosts(RemoteHosts):
+    def __init__(self, addresses):
+        super().__init__(addresses)
+        self.deltas = 0
+        self.received = 0
+        self.cpu_time = 0.0
+
+    def handle(self, host, message_type, reader):
+        self.received += len(reader.data)
+        if message_type == 2:
+            self.deltas += 1
+        super().handle(host, message_type, reader)
+
+    def run(self):
+        super().run()
+        self.cpu_time = time.thread_time()
+
+
+
+""" Utility function for waiting until a condition holds or a timeout passes """
+def wait_for(condition, timeout=30.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.005)
+    return condition()
+
+
+
+def bench_hosts(count, processes, ticks):
+    samplers = [SyntheticSampler(processes, seed) for seed in range(count)]
+    servers = [AgentServer(sampler, "127.0.0.1:0") for sampler in samplers]
+    for server in servers:
+        server.start()
+    client = CountingHosts([f"127.0.0.1:{server.bound_address[1]}" for server in servers])
+    thread = threading.Thread(target=client.run)
+    thread.start()
+    try:
+        if not wait_for(lambda: all(sampler.paused is False for sampler in samplers)):
+            raise RuntimeError("agents did not see the client connect")
+        for sampler in samplers:
+            sampler.tick()
+        wait_for(lambda: client.received > 0)
+        start_received = client.received
+        start_deltas = client.deltas
+        for _ in range(ticks):
+            for sampler in samplers:
+                sampler.tick()
+            expected = client.deltas
+            wait_for(lambda: client.deltas >= expected, 0.0)
+        wait_for(lambda: client.deltas - start_deltas >= ticks)
+        received = client.received - start_received
+    finally:
+        client.stop()
+        thread.join()
+        for server in servers:
+            server.close()
+    return client.cpu_time, received
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--hosts", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--processes", type=int, default=1000)
+    parser.add_argument("--ticks", type=int, default=30)
+    args = parser.parse_args(argv)
+    print(f"{'hosts':>6} {'client ms/tick':>15} {'per host ms':>12} {'KB/host/tick':>13}")
+    for count in args.hosts:
+        cpu_time, received = bench_hosts(count, args.processes, args.ticks)
+        per_tick = cpu_time * 1000 / args.ticks
+        print(f"{count:>6} {per_tick:>15.2f} {per_tick / count:>12.2f} {received / 1024 / args.ticks / count:>13.1f}", flush=True)
+
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+""" Benchmark Resmon's startup under Qt's offscreen platform
+
+Starts `resmon.py --startup-profile` several times, reads the report it prints once
+the first frame, the first data and the plugins are in, and reports the median and
+worst time of each phase since the interpreter started timing.
+
+    python benchmarks/bench_startup.py [--runs 9] [--timeout 30] [-- resmon arguments]
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+RESMON = os.path.join(os.path.dirname(BENCH_DIR), "resmon.py")
+
+
+
+""" Utility function for one run, returning {phase: ms} from the startup report """
+def run_once(extra, timeout):
+    env = dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen"))
+    process = subprocess.Popen([sys.executable, RESMON, "--startup-profile"] + extra, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, env=env, text=True)
+    phases = {}
+    try:
+        lines = iter(process.stderr)
+        for line in lines:
+            if line.startswith("startup phase"):
+                break
+        for line in lines:
+            parts = line.split()
+            if not parts:
+                break
+            phases[" ".join(parts[:-2])] = float(parts[-2])
+    finally:
+        process.kill()
+        process.wait(timeout)
+    return phases
+
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=9)
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("extra", nargs="*", help="arguments passed on to resmon.py")
+    args = parser.parse_args(argv)
+    runs = [run_once(args.extra, args.timeout) for _ in range(args.runs)]
+    phases = sorted({phase for run in runs for phase in run}, key=lambda phase: statistics.median(run[phase] for run in runs if phase in run))
+    print(f"{'phase':<20} {'median ms':>10} {'max ms':>10}")
+    for phase in phases:
+        values = [run[phase] for run in runs if phase in run]
+        print(f"{phase:<20} {statistics.median(values):>10.1f} {max(values):>10.1f}")
+
+
+
+if __name__ == "__main__":
+    main()
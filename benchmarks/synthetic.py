@@ -0,0 +1,84 @@
+""" Import the necessary modules for this module to work """
+import os
+import random
+import shutil
+import tempfile
+
+
+
+""" Utility function for building a synthetic /proc tree with a given number of processes
+
+The tree contains the files both process collectors read (stat, statm, status, comm,
+cmdline per PID, plus the system-wide stat, uptime and cpuinfo), so psutil can be
+pointed at it through psutil.PROCFS_PATH and ProcfsProcessCollector through its
+proc_path argument. Call cleanup_proc_tree() with the returned path when done.
+"""
+def build_proc_tree(count, seed=0):
+    rng = random.Random(seed)
+    root = tempfile.mkdtemp(prefix="resmon-proc-")
+    uid = os.getuid()
+    with open(os.path.join(root, "stat"), "w") as stat_file:
+        stat_file.write("cpu  100 0 100 1000 0 0 0 0 0 0\ncpu0 100 0 100 1000 0 0 0 0 0 0\nbtime 1700000000\n")
+    with open(os.path.join(root, "uptime"), "w") as uptime_file:
+        uptime_file.write("1000.00 1000.00\n")
+    with open(os.path.join(root, "cpuinfo"), "w") as cpuinfo_file:
+        cpuinfo_file.write("processor\t: 0\n")
+    for pid in range(1, count + 1):
+        name = f"proc{pid % 997}-{rng.choice(['worker', 'daemon', 'build'])}"
+        threads = rng.randint(1, 64)
+        rss_pages = rng.randint(100, 500000)
+        pid_dir = os.path.join(root, str(pid))
+        os.mkdir(pid_dir)
+        fields = ["S", "1", str(pid), str(pid), "0", "-1", "4194560", "0", "0", "0", "0",
+                  str(rng.randint(0, 100000)), str(rng.randint(0, 100000)), "0", "0", "20", "0",
+                  str(threads), "0", str(rng.randint(0, 50000)), "0", "0"] + ["0"] * 30
+        with open(os.path.join(pid_dir, "stat"), "w") as stat_file:
+            stat_file.write(f"{pid} ({name}) {' '.join(fields)}\n")
+        with open(os.path.join(pid_dir, "statm"), "w") as statm_file:
+            statm_file.write(f"{rss_pages * 2} {rss_pages} 100 10 0 {rss_pages} 0\n")
+        with open(os.path.join(pid_dir, "status"), "w") as status_file:
+            status_file.write(f"Name:\t{name}\nState:\tS (sleeping)\nPid:\t{pid}\nPPid:\t1\n"
+                              f"Uid:\t{uid}\t{uid}\t{uid}\t{uid}\nGid:\t0\t0\t0\t0\nThreads:\t{threads}\n")
+        with open(os.path.join(pid_dir, "comm"), "w") as comm_file:
+            comm_file.write(name + "\n")
+        with open(os.path.join(pid_dir, "cmdline"), "w") as cmdline_file:
+            cmdline_file.write(f"/usr/bin/{name}\0--flag\0")
+    return root
+
+
+
+""" Utility function for removing a synthetic /proc tree """
+def cleanup_proc_tree(root):
+    shutil.rmtree(root, ignore_errors=True)
+
+
+
+""" Utility function for generating process rows in the shape ProcessFetcher emits """
+def build_process_rows(count, seed=0):
+    rng = random.Random(seed)
+    users = ["root", "daemon", "build", "www-data"]
+    return [
+        [pid, f"proc{pid % 997}-{rng.choice(['worker', 'daemon', 'build'])}", rng.randint(1, 64),
+         rng.choice(users), rng.uniform(1, 2000), round(rng.uniform(0, 100), 1), rng.randint(0, pid - 1) // 8]
+        for pid in range(1, count + 1)
+    ]
+
+
+
+""" Utility function for advancing synthetic process rows by one tick
+
+Roughly `changed` of the rows get new CPU and memory values and `churn` of them exit
+and are replaced by new PIDs, which is about what a busy build host looks like
+between two samples.
+"""
+def churn_process_rows(rows, rng, next_pid, changed=0.05, churn=0.01):
+    rows = [list(row) for row in rows]
+    for row in rng.sample(rows, int(len(rows) * changed)):
+        row[4] = max(0.1, row[4] + rng.uniform(-5, 5))
+        row[5] = round(rng.uniform(0, 100), 1)
+    exits = set(rng.sample(range(len(rows)), int(len(rows) * churn)))
+    rows = [row for index, row in enumerate(rows) if index not in exits]
+    for _ in range(len(exits)):
+        rows.append([next_pid, f"proc{next_pid % 997}-worker", 1, "build", rng.uniform(1, 200), 0.0, rng.choice(rows)[0]])
+        next_pid += 1
+    return rows, next_pid
@@ -0,0 +1,362 @@
+""" Import the necessary modules for this component to work """
+import os
+import re
+import time
+from array import array
+from collections import deque
+
+from components.query import COMPARISONS, MEMORY_UNITS
+from components.profiling import PROFILER
+
+
+
+""" Define the metrics each rule scope can watch, with the unit they are shown in """
+METRICS = {
+    "process": {"cpu": "%", "memory": " MB", "growth": " MB/min"},
+    "system": {"cpu": "%", "memory": "%"},
+    "drive": {"usage": "%"},
+}
+
+""" Define the rules used when none are given and there is no rules file """
+DEFAULT_RULES = [
+    "process cpu > 90 for 30s",
+    "process growth > 100 for 60s",
+    "drive usage > 90",
+    "system memory > 95 for 30s",
+]
+RULES_FILE = os.path.join(os.path.expanduser("~"), "resmonalerts.txt")
+
+""" Define how far a value must fall back past the threshold to clear, as a fraction of it """
+HYSTERESIS = 0.1
+
+""" Define the window in seconds over which process memory growth is measured, and how often the memory of every process is snapshotted for it """
+GROWTH_WINDOW = 60.0
+GROWTH_STEP = 15.0
+
+DURATION_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600}
+NUMBER = r"(\d+(?:\.\d*)?|\.\d+)"
+RULE_PATTERN = re.compile(
+    rf"([a-z]+)\s+([a-z]+)\s*(>=|<=|>|<)\s*{NUMBER}\s*([a-z%]*)(?:/min)?"
+    rf"(?:\s+for\s+{NUMBER}\s*([smh]?))?(?:\s+clear\s+{NUMBER}\s*([a-z%]*)(?:/min)?)?$"
+)
+
+
+
+""" Utility function for reading a rule's number with an optional unit """
+def parse_value(number, unit, metric_unit):
+    unit = unit.replace("%", "")
+    if not unit:
+        return float(number)
+    if metric_unit.startswith(" MB") and unit in MEMORY_UNITS:
+        return float(number) * MEMORY_UNITS[unit]
+    raise ValueError(f"Unknown unit '{unit}'")
+
+
+
+""" Utility function for reading the rules to use
+
+Explicit rules win; otherwise every non-empty line of the rules file that is not a
+"#" comment, if the file exists (so an empty file turns alerts off), and otherwise
+DEFAULT_RULES.
+"""
+def load_rules(rules=None, path=RULES_FILE):
+    if rules:
+        return list(rules)
+    if os.path.exists(path):
+        with open(path) as rules_file:
+            return [line.strip() for line in rules_file if line.strip() and not line.strip().startswith("#")]
+    return list(DEFAULT_RULES)
+
+
+
+""" Define the class for one alert rule
+
+Rules read as "<scope> <metric> <op> <value> [for <duration>] [clear <value>]":
+
+    process cpu > 90 for 30s        any process above 90% CPU for 30 seconds
+    process growth > 100 for 1m     resident memory growing faster than 100 MB/min
+    process memory > 2GB            resident memory, in MB unless a unit is given
+    system memory > 95 clear 85     system CPU or memory percentage
+    drive usage > 90                any mounted drive more than 90% full
+
+A subject must breach the threshold continuously for the duration before the
+alert fires, and the alert clears only once the value is back past the clear level,
+by default 10% of the threshold on the safe side, so a value hovering around the
+threshold does not flap. Malformed rules raise ValueError.
+"""
+class AlertRule:
+    def __init__(self, text):
+        self.text = " ".join(text.split())
+        match = RULE_PATTERN.match(self.text.lower())
+        if not match:
+            raise ValueError(f"Invalid alert rule '{text}'")
+        scope, metric, symbol, number, unit, duration, duration_unit, clear, clear_unit = match.groups()
+        if scope not in METRICS:
+            raise ValueError(f"Unknown alert scope '{scope}' in '{text}'")
+        if metric not in METRICS[scope]:
+            raise ValueError(f"Unknown {scope} metric '{metric}' in '{text}'")
+        self.scope = scope
+        self.metric = metric
+        self.unit = METRICS[scope][metric]
+        self.threshold = parse_value(number, unit, self.unit)
+        self.duration = float(duration) * DURATION_UNITS[duration_unit or ""] if duration else 0.0
+        above = symbol.startswith(">")
+        if clear:
+            self.clear = parse_value(clear, clear_unit or "", self.unit)
+        else:
+            self.clear = self.threshold * (1 - HYSTERESIS if above else 1 + HYSTERESIS)
+        self.breached = COMPARISONS[symbol]
+        self.recovered = COMPARISONS["<" if above else ">"]
+        self.pending = {}
+        self.firing = {}
+
+
+
+""" Utility function for parsing rules one at a time, returning the rules that parsed and the errors of those that did not """
+def parse_rules(texts):
+    rules, errors = [], []
+    for text in texts:
+        try:
+            rules.append(AlertRule(text))
+        except ValueError as e:
+            errors.append(str(e))
+    return rules, errors
+
+
+
+""" Define the class for an alert that fired, and possibly cleared """
+class Alert:
+    __slots__ = ("rule", "key", "subject", "value", "fired", "cleared", "reason")
+
+    def __init__(self, rule, key, subject, value):
+        self.rule = rule
+        self.key = key
+        self.subject = subject
+        self.value = value
+        self.fired = time.time()
+        self.cleared = None
+        self.reason = None
+
+    def describe(self):
+        return f"{self.subject}: {self.rule.metric} {self.value:.1f}{self.rule.unit} ({self.rule.text})"
+
+
+
+""" Define the class for the alert rule engine
+
+attach() subscribes to a Sampler's processes, cpu and drives events (or those of
+anything with the same interface) and evaluates the rules on every one of them, on
+the sampling thread. Results are delivered to callbacks registered with connect():
+
+    "fired"     (alert)
+    "cleared"   (alert)            alert.reason is "exited" when the process went away
+    "evaluated" (seconds, rules)   cost of the evaluation that just ran
+
+Process CPU, memory and the memory and time each process was first seen with are
+kept as columns in flat arrays indexed by a slot per PID, updated from the deltas.
+Every GROWTH_STEP the whole memory column is snapshotted, and memory growth is the
+change since the newest snapshot at least GROWTH_WINDOW old (or since the process
+was first seen, if that is later), so a one-off jump stops counting once it leaves
+the trailing window instead of fading away over the life of the process. A rule only looks at the PIDs
+whose row changed plus those it is already timing or firing for, so a tick costs
+nothing for the thousands of processes that stayed put. Firing and clearing are
+appended to the optional log file, one line each.
+"""
+class AlertEngine:
+    def __init__(self, rules, log_path=None):
+        self.rules = [rule if isinstance(rule, AlertRule) else AlertRule(rule) for rule in rules]
+        self.process_rules = [rule for rule in self.rules if rule.scope == "process"]
+        self.system_rules = [rule for rule in self.rules if rule.scope == "system"]
+        self.drive_rules = [rule for rule in self.rules if rule.scope == "drive"]
+        self.listeners = {}
+        self.slot_of = {}
+        self.names = {}
+        self.free = []
+        self.cpu = array("d")
+        self.memory = array("d")
+        self.start_memory = array("d")
+        self.start_time = array("d")
+        self.snapshots = deque()
+        self.growth = any(rule.metric == "growth" for rule in self.process_rules)
+        self.log = open(log_path, "a", buffering=1) if log_path else None
+
+    def connect(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+
+    def emit(self, event, *args):
+        for callback in self.listeners.get(event, ()):
+            callback(*args)
+
+    def collectors(self):
+        needed = set()
+        if self.process_rules:
+            needed.add("processes")
+        if self.system_rules:
+            needed.add("cpu")
+        if self.drive_rules:
+            needed |= {"partitions", "drives"}
+        return needed
+
+    def attach(self, sampler):
+        if self.process_rules:
+            sampler.connect("processes", self.on_processes)
+        if self.system_rules:
+            sampler.connect("cpu", self.on_cpu)
+        if self.drive_rules:
+            sampler.connect("drives", self.on_drives)
+
+    def active(self):
+        return [alert for rule in self.rules for alert in rule.firing.values()]
+
+    def on_processes(self, added, removed, changed, reset=False):
+        start = time.perf_counter()
+        with PROFILER.measure("alerts/processes"):
+            now = time.monotonic()
+            if reset:
+                alive = {process[0] for process in added}
+                removed = [pid for pid in self.slot_of if pid not in alive]
+            for pid in removed:
+                self.release(pid)
+            touched = []
+            for process in added:
+                pid = process[0]
+                slot = self.slot_of.get(pid)
+                if slot is None:
+                    slot = self.allocate(pid)
+                    self.start_memory[slot] = process[4] or 0.0
+                    self.start_time[slot] = now
+                self.names[pid] = process[1]
+                self.cpu[slot] = process[5] or 0.0
+                self.memory[slot] = process[4] or 0.0
+                touched.append(pid)
+            for pid, fields in changed:
+                slot = self.slot_of.get(pid)
+                if slot is None:
+                    continue
+                if 1 in fields:
+                    self.names[pid] = fields[1]
+                if 5 in fields:
+                    self.cpu[slot] = fields[5] or 0.0
+                if 4 in fields:
+                    self.memory[slot] = fields[4] or 0.0
+                touched.append(pid)
+            if self.growth:
+                self.snapshot(now)
+            for rule in self.process_rules:
+                keys = set(touched)
+                keys.update(rule.pending)
+                keys.update(rule.firing)
+                keys = [pid for pid in keys if pid in self.slot_of]
+                self.evaluate(rule, keys, self.process_values(rule.metric, keys, now), now)
+        self.emit("evaluated", time.perf_counter() - start, len(self.process_rules))
+
+    def on_cpu(self, cpu_usage, cpu_core_usages, memory_percent):
+        start = time.perf_counter()
+        now = time.monotonic()
+        for rule in self.system_rules:
+            self.evaluate(rule, ["System"], [cpu_usage if rule.metric == "cpu" else memory_percent], now)
+        self.emit("evaluated", time.perf_counter() - start, len(self.system_rules))
+
+    def on_drives(self, drives):
+        start = time.perf_counter()
+        now = time.monotonic()
+        usage = {mountpoint: used / total * 100 for device, mountpoint, total, used, status in drives if total}
+        for rule in self.drive_rules:
+            for mountpoint in [mountpoint for mountpoint in rule.firing if mountpoint not in usage]:
+                self.clear(rule, mountpoint, "removed")
+            rule.pending = {mountpoint: since for mountpoint, since in rule.pending.items() if mountpoint in usage}
+            self.evaluate(rule, list(usage), list(usage.values()), now)
+        self.emit("evaluated", time.perf_counter() - start, len(self.drive_rules))
+
+    def process_values(self, metric, keys, now):
+        slot_of = self.slot_of
+        if metric == "cpu":
+            cpu = self.cpu
+            return [cpu[slot_of[pid]] for pid in keys]
+        memory = self.memory
+        if metric == "memory":
+            return [memory[slot_of[pid]] for pid in keys]
+        start_memory, start_time = self.start_memory, self.start_time
+        since, base_memory = self.snapshots[0] if self.snapshots else (now, memory)
+        values = []
+        for pid in keys:
+            slot = slot_of[pid]
+            if start_time[slot] > since or slot >= len(base_memory):
+                values.append((memory[slot] - start_memory[slot]) * 60 / max(1.0, now - start_time[slot]))
+            else:
+                values.append((memory[slot] - base_memory[slot]) * 60 / max(1.0, now - since))
+        return values
+
+    def evaluate(self, rule, keys, values, now):
+        pending, firing = rule.pending, rule.firing
+        threshold, clear = rule.threshold, rule.clear
+        breached, recovered = rule.breached, rule.recovered
+        for key, value in zip(keys, values):
+            alert = firing.get(key)
+            if alert is not None:
+                alert.value = value
+                if recovered(value, clear):
+                    self.clear(rule, key, None)
+            elif breached(value, threshold):
+                since = pending.setdefault(key, now)
+                if now - since >= rule.duration:
+                    del pending[key]
+                    self.fire(rule, key, value)
+            else:
+                pending.pop(key, None)
+
+    def fire(self, rule, key, value):
+        if rule.scope == "process":
+            subject = f"{self.names.get(key, '?')} ({key})"
+        else:
+            subject = key
+        alert = Alert(rule, key, subject, value)
+        rule.firing[key] = alert
+        self.write_log("FIRED", alert)
+        self.emit("fired", alert)
+
+    def clear(self, rule, key, reason):
+        alert = rule.firing.pop(key)
+        alert.cleared = time.time()
+        alert.reason = reason
+        self.write_log("CLEARED", alert)
+        self.emit("cleared", alert)
+
+    def write_log(self, action, alert):
+        if self.log:
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(alert.cleared or alert.fired))
+            reason = f" [{alert.reason}]" if alert.reason else ""
+            self.log.write(f"{stamp} {action} {alert.describe()}{reason}\n")
+
+    def allocate(self, pid):
+        if self.free:
+            slot = self.free.pop()
+        else:
+            slot = len(self.cpu)
+            for column in (self.cpu, self.memory, self.start_memory, self.start_time):
+                column.append(0.0)
+        self.slot_of[pid] = slot
+        return slot
+
+    def release(self, pid):
+        slot = self.slot_of.pop(pid, None)
+        if slot is None:
+            return
+        self.free.append(slot)
+        for rule in self.process_rules:
+            rule.pending.pop(pid, None)
+            if pid in rule.firing:
+                self.clear(rule, pid, "exited")
+        self.names.pop(pid, None)
+
+    def snapshot(self, now):
+        snapshots = self.snapshots
+        if not snapshots or now - snapshots[-1][0] >= GROWTH_STEP:
+            snapshots.append((now, array("d", self.memory)))
+        while len(snapshots) > 1 and now - snapshots[1][0] >= GROWTH_WINDOW:
+            snapshots.popleft()
+
+    def close(self):
+        if self.log:
+            self.log.close()
+            self.log = None
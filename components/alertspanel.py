@@ -0,0 +1,109 @@
+""" Import the necessary modules for this component to work """
+import time
+from collections import deque
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView, QSplitter
+
+
+
+""" Define the number of fired and cleared events kept in the Recent list """
+RECENT_EVENTS = 200
+
+
+
+""" Define the class for the Alerts panel
+
+Lists the alerts that are firing, with their current value, above the most recent
+fired and cleared events, under a line with the rules' evaluation cost. The engine
+runs on the sampling thread and reaches the panel through the fired, cleared and
+evaluated signals; the value column refreshes once a second while the panel is
+visible.
+"""
+class AlertsPanel(QWidget):
+    fired = pyqtSignal(object)
+    cleared = pyqtSignal(object)
+    evaluated = pyqtSignal(float, int)
+    active_columns = ["Subject", "Value", "Since", "Rule"]
+    recent_columns = ["Time", "Event", "Subject", "Value", "Rule"]
+
+    def __init__(self, engine, parent=None):
+        super().__init__(parent)
+        self.engine = engine
+        self.active = {}
+        self.recent = deque(maxlen=RECENT_EVENTS)
+        self.cost = deque(maxlen=64)
+        layout = QVBoxLayout(self)
+        self.status_label = QLabel("")
+        layout.addWidget(self.status_label)
+        splitter = QSplitter(Qt.Vertical)
+        self.active_table = self.create_table(self.active_columns)
+        self.recent_table = self.create_table(self.recent_columns)
+        splitter.addWidget(self.active_table)
+        splitter.addWidget(self.recent_table)
+        layout.addWidget(splitter)
+        self.fired.connect(self.add_alert)
+        self.cleared.connect(self.remove_alert)
+        self.evaluated.connect(lambda seconds, rules: self.cost.append(seconds))
+        engine.connect("fired", self.fired.emit)
+        engine.connect("cleared", self.cleared.emit)
+        engine.connect("evaluated", self.evaluated.emit)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def create_table(self, columns):
+        table = QTableWidget(0, len(columns))
+        table.setHorizontalHeaderLabels(columns)
+        table.verticalHeader().setVisible(False)
+        table.setEditTriggers(QTableWidget.NoEditTriggers)
+        table.setSelectionBehavior(QTableWidget.SelectRows)
+        table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        table.horizontalHeader().setStretchLastSection(True)
+        return table
+
+    def add_alert(self, alert):
+        self.active[(alert.rule, alert.key)] = alert
+        self.recent.appendleft((alert.fired, "Fired", alert.subject, self.format_value(alert), alert.rule.text))
+        self.refresh()
+
+    def remove_alert(self, alert):
+        self.active.pop((alert.rule, alert.key), None)
+        event = "Cleared" if alert.reason is None else f"Cleared ({alert.reason})"
+        self.recent.appendleft((alert.cleared, event, alert.subject, self.format_value(alert), alert.rule.text))
+        self.refresh()
+
+    def format_value(self, alert):
+        return f"{alert.value:.1f}{alert.rule.unit}"
+
+    def refresh(self):
+        cost = f", {max(self.cost) * 1000:.2f} ms per evaluation at most" if self.cost else ""
+        self.status_label.setText(f"{len(self.engine.rules)} rules, {len(self.active)} firing{cost}")
+        alerts = sorted(self.active.values(), key=lambda alert: alert.fired)
+        self.fill(self.active_table, [
+            (alert.subject, self.format_value(alert), time.strftime("%H:%M:%S", time.localtime(alert.fired)), alert.rule.text)
+            for alert in alerts
+        ])
+        self.fill(self.recent_table, [
+            (time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stamp)), event, subject, value, rule)
+            for stamp, event, subject, value, rule in self.recent
+        ])
+
+    def fill(self, table, rows):
+        table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                item = table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    table.setItem(row, column, item)
+                if item.text() != value:
+                    item.setText(value)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start(1000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
@@ -0,0 +1,168 @@
+""" Import the necessary modules for this component to work """
+import os
+import sys
+import time
+from components.processes import read_proc_file
+
+
+
+""" Utility function for finding where the unified (v2) cgroup hierarchy is mounted
+
+That is /sys/fs/cgroup on current distributions and /sys/fs/cgroup/unified on
+hybrid ones. Returns None outside Linux or without a cgroup2 mount.
+"""
+def find_cgroup_root(mounts_path="/proc/self/mounts"):
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        with open(mounts_path) as mounts:
+            for line in mounts:
+                fields = line.split()
+                if len(fields) > 2 and fields[2] == "cgroup2":
+                    return fields[1]
+    except OSError:
+        pass
+    return None
+
+
+
+""" Utility function for reading a process's cgroup v2 path from /proc/[pid]/cgroup
+
+Returns the path of the "0::" line, or None on a host with only v1 hierarchies.
+Raises OSError if the process has exited.
+"""
+def read_cgroup_path(pid, proc_path="/proc"):
+    for line in read_proc_file(f"{proc_path}/{pid}/cgroup").split(b"\n"):
+        if line.startswith(b"0::"):
+            return line[3:].decode(errors="replace") or "/"
+    return None
+
+
+
+""" Utility function for reading a cgroup interface file, or None if the controller is not enabled there """
+def read_cgroup_file(path):
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return os.read(fd, 65536)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+
+""" Utility function for the parent of a cgroup path, or None for the root """
+def parent_path(path):
+    if path == "/":
+        return None
+    return path.rsplit("/", 1)[0] or "/"
+
+
+
+""" Define the class for collecting per-cgroup totals on Linux
+
+Each PID is mapped to its cgroup once, from /proc/[pid]/cgroup, and the mapping is
+kept until the PID exits. Totals come straight from the v2 interface files, under
+root, of every occupied group and its ancestors: cpu.stat (usage_usec),
+memory.current, pids.current and io.stat (rbytes and wbytes over every device). A
+group's figures cost four small reads, whatever the number of processes in it, and
+include its descendants like the kernel accounts them. CPU% and disk rates are computed
+from the change since the previous call; CPU% is relative to one core, like the
+process rows.
+
+collect() takes the current PIDs and returns (groups, assigned, reset): groups is a
+list of (path, tasks, memory MB, CPU%, read B/s, write B/s), with None for a
+figure whose controller is not enabled in that group, and assigned holds the
+{pid: path} mappings made since the previous call, or all of them after a
+request_resync().
+"""
+class CgroupCollector:
+    def __init__(self, root, proc_path="/proc"):
+        self.root = root
+        self.proc_path = proc_path
+        self.members = {}
+        self.assigned = {}
+        self.previous = {}
+        self.previous_time = None
+        self.reset = True
+
+    def request_resync(self):
+        self.reset = True
+
+    def assign(self, pids):
+        members = self.members
+        for pid in members.keys() - pids:
+            del members[pid]
+            self.assigned.pop(pid, None)
+        for pid in pids:
+            if pid in members:
+                continue
+            try:
+                path = read_cgroup_path(pid, self.proc_path)
+            except OSError:
+                continue
+            if path is not None:
+                members[pid] = self.assigned[pid] = path
+
+    def read_usage(self, path):
+        directory = self.root if path == "/" else self.root + path
+        cpu_usage = read_bytes = write_bytes = None
+        stat = read_cgroup_file(directory + "/cpu.stat")
+        if stat:
+            for line in stat.split(b"\n"):
+                if line.startswith(b"usage_usec "):
+                    cpu_usage = int(line.split()[1])
+                    break
+        io = read_cgroup_file(directory + "/io.stat")
+        if io is not None:
+            read_bytes = write_bytes = 0
+            for line in io.split(b"\n"):
+                for field in line.split()[1:]:
+                    if field.startswith(b"rbytes="):
+                        read_bytes += int(field[7:])
+                    elif field.startswith(b"wbytes="):
+                        write_bytes += int(field[7:])
+        memory = read_cgroup_file(directory + "/memory.current")
+        tasks = read_cgroup_file(directory + "/pids.current")
+        return (
+            int(tasks) if tasks else None,
+            int(memory) / (1024 * 1024) if memory else None,
+            cpu_usage, read_bytes, write_bytes,
+        )
+
+    def collect(self, pids):
+        self.assign(pids)
+        now = time.monotonic()
+        elapsed = now - self.previous_time if self.previous_time is not None else 0.0
+        paths = set()
+        for path in set(self.members.values()):
+            while path is not None and path not in paths:
+                paths.add(path)
+                path = parent_path(path)
+        current = {}
+        groups = []
+        for path in sorted(paths):
+            tasks, memory, cpu_usage, read_bytes, write_bytes = current[path] = self.read_usage(path)
+            previous = self.previous.get(path)
+            cpu = read_rate = write_rate = None
+            if previous is not None and elapsed > 0:
+                if cpu_usage is not None and previous[2] is not None:
+                    cpu = round(max(0, cpu_usage - previous[2]) / (elapsed * 10000), 1)
+                if read_bytes is not None and previous[3] is not None:
+                    read_rate = max(0, read_bytes - previous[3]) / elapsed
+                    write_rate = max(0, write_bytes - previous[4]) / elapsed
+            groups.append((path, tasks, memory, cpu, read_rate, write_rate))
+        self.previous = current
+        self.previous_time = now
+        if self.reset:
+            self.reset = False
+            assigned = dict(self.members)
+            reset = True
+        else:
+            assigned = self.assigned
+            reset = False
+        self.assigned = {}
+        return groups, assigned, reset
@@ -0,0 +1,106 @@
+""" Import the necessary modules for this component to work """
+import time
+import psutil
+from components.profiling import PROFILER
+
+
+
+""" Define the class for one column of the process table
+
+A column shows a process row field (row is its index in the row), is drawn by the
+GUI alone (History), or is an extra column collected per PID outside the process
+walk. source names what has to be collected for the column: "threads" and "user"
+are optional fields of the walk itself, anything else is an ExtraColumnCollector
+source, shared by the columns that come from the same query. Collection cost is
+measured per source, as "column/<source>" in the profiler.
+"""
+class ProcessColumn:
+    __slots__ = ("key", "header", "row", "source", "visible")
+
+    def __init__(self, key, header, row=None, source=None, visible=True):
+        self.key = key
+        self.header = header
+        self.row = row
+        self.source = source
+        self.visible = visible
+
+
+
+""" Define every column of the process table, in model order, and whether each is shown by default """
+PROCESS_COLUMNS = [
+    ProcessColumn("pid", "Process ID", row=0),
+    ProcessColumn("name", "Program", row=1),
+    ProcessColumn("threads", "Threads", row=2, source="threads"),
+    ProcessColumn("user", "User", row=3, source="user"),
+    ProcessColumn("memory", "Memory", row=4),
+    ProcessColumn("cpu", "CPU", row=5),
+    ProcessColumn("history", "History"),
+    ProcessColumn("ppid", "Parent", row=6, visible=False),
+    ProcessColumn("nice", "Priority", source="nice", visible=False),
+    ProcessColumn("started", "Started", source="started", visible=False),
+    ProcessColumn("read", "Disk Read", source="io", visible=False),
+    ProcessColumn("write", "Disk Write", source="io", visible=False),
+]
+
+""" Define the optional fields of the process walk, which are left as None when no column needs them """
+WALK_SOURCES = frozenset({"threads", "user"})
+
+
+
+""" Define the class for collecting extra process columns outside the process walk
+
+Extra columns are collected on their own, slower schedule and, unless pids is None,
+only for the given PIDs (normally the rows in the visible part of the table).
+collect() returns {pid: {column key: value}} for the requested sources; a value the
+current user may not read is left out. psutil.Process objects are kept per PID
+until the PID leaves the process list, so start times and I/O counters are not
+looked up from scratch on every call.
+"""
+class ExtraColumnCollector:
+    def __init__(self):
+        self.sources = frozenset()
+        self.pids = None
+        self.processes = {}
+        self.io = {}
+
+    def collect(self, known_pids):
+        for pid in [pid for pid in self.processes if pid not in known_pids]:
+            del self.processes[pid]
+            self.io.pop(pid, None)
+        pids = [pid for pid in (known_pids if self.pids is None else self.pids) if pid in known_pids]
+        processes = {}
+        for pid in pids:
+            process = self.processes.get(pid)
+            if process is None:
+                try:
+                    process = self.processes[pid] = psutil.Process(pid)
+                except psutil.Error:
+                    continue
+            processes[pid] = process
+        values = {pid: {} for pid in processes}
+        for source in sorted(self.sources):
+            fetch = getattr(self, f"fetch_{source}")
+            started = time.perf_counter()
+            for pid, process in processes.items():
+                try:
+                    fetch(pid, process, values[pid])
+                except psutil.Error:
+                    pass
+            PROFILER.record(f"column/{source}", time.perf_counter() - started)
+        return values
+
+    def fetch_nice(self, pid, process, values):
+        nice = process.nice()
+        values["nice"] = nice.name.replace("_PRIORITY_CLASS", "").title() if hasattr(nice, "name") else nice
+
+    def fetch_started(self, pid, process, values):
+        values["started"] = process.create_time()
+
+    def fetch_io(self, pid, process, values):
+        counters = process.io_counters()
+        now = time.monotonic()
+        previous = self.io.get(pid)
+        self.io[pid] = (now, counters.read_bytes, counters.write_bytes)
+        if previous is not None and now > previous[0]:
+            values["read"] = max(0, counters.read_bytes - previous[1]) / (now - previous[0])
+            values["write"] = max(0, counters.write_bytes - previous[2]) / (now - previous[0])
@@ -0,0 +1,84 @@
+""" Import the necessary modules for this component to work """
+from PyQt5.QtCore import QTimer, pyqtSignal
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget, QTreeWidgetItem, QHeaderView
+from components.drives import format_size
+from components.inspector import DEFAULT_TTL
+
+
+
+""" Define the class for the process details pane
+
+Shows what a ProcessInspector collected for one PID, one collapsible section per
+kind of detail. Selecting a process shows its cached details at once, if there are
+any, while the inspector refreshes them in the background; the pane asks again
+every TTL while it is visible. Results arrive from the worker threads through the
+details_ready signal, so they are applied on the GUI thread.
+"""
+class ProcessDetails(QWidget):
+    details_ready = pyqtSignal(int, object)
+
+    def __init__(self, inspector, parent=None):
+        super().__init__(parent)
+        self.inspector = inspector
+        self.pid = None
+        self.collapsed = {"Environment", "Open Files", "Connections", "Children"}
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        header_layout = QHBoxLayout()
+        self.title_label = QLabel("")
+        header_layout.addWidget(self.title_label, 1)
+        close_button = QPushButton("Close")
+        close_button.clicked.connect(self.close_pane)
+        header_layout.addWidget(close_button)
+        layout.addLayout(header_layout)
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(2)
+        self.tree.setHeaderLabels(["Property", "Value"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.tree.itemCollapsed.connect(lambda item: self.collapsed.add(item.text(0)))
+        self.tree.itemExpanded.connect(lambda item: self.collapsed.discard(item.text(0)))
+        layout.addWidget(self.tree)
+        self.details_ready.connect(self.apply_details)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(lambda: self.show_process(self.pid))
+        self.timer.start(int(DEFAULT_TTL * 1000))
+
+    def show_process(self, pid):
+        if pid is None or not self.isVisible():
+            return
+        if pid != self.pid:
+            self.pid = pid
+            self.tree.clear()
+        cached = self.inspector.inspect(pid, self.details_ready.emit)
+        if cached is not None:
+            self.apply_details(pid, cached)
+        else:
+            self.title_label.setText(f"Process {pid} (loading...)")
+
+    def apply_details(self, pid, details):
+        if pid != self.pid:
+            return
+        if details is None:
+            self.title_label.setText(f"Process {pid} has exited")
+            self.tree.clear()
+            return
+        name = next((value for label, value in details[0][1] if label == "Name"), "")
+        refreshing = " (refreshing...)" if self.inspector.is_pending(pid) else ""
+        self.title_label.setText(f"{name} ({pid}){refreshing}")
+        scroll = self.tree.verticalScrollBar().value()
+        self.tree.setUpdatesEnabled(False)
+        self.tree.clear()
+        for section, rows in details:
+            section_item = QTreeWidgetItem([section, "" if rows else "None"])
+            for label, value in rows:
+                item = QTreeWidgetItem([label, format_size(value) if isinstance(value, int) else value])
+                item.setToolTip(1, item.text(1))
+                section_item.addChild(item)
+            self.tree.addTopLevelItem(section_item)
+            section_item.setExpanded(section not in self.collapsed)
+        self.tree.setUpdatesEnabled(True)
+        self.tree.verticalScrollBar().setValue(scroll)
+
+    def close_pane(self):
+        self.hide()
+        self.pid = None
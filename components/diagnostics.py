@@ -0,0 +1,87 @@
+""" Import the necessary modules for this component to work """
+import os
+import psutil
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem,
+    QHeaderView, QFileDialog, QMessageBox
+)
+from components.profiling import PROFILER
+
+
+
+""" Define the class for the Diagnostics panel
+
+Shows Resmon's own CPU and memory use next to the rolling timing histograms collected
+by the shared profiler, and exports both to a JSON file. The panel only refreshes
+while it is visible.
+"""
+class DiagnosticsPanel(QWidget):
+    columns = ["Timing", "Calls", "Mean", "p50", "p95", "p99", "Max"]
+
+    def __init__(self, parent=None, profiler=PROFILER):
+        super().__init__(parent)
+        self.profiler = profiler
+        self.process = psutil.Process(os.getpid())
+        self.process.cpu_percent(None)
+        layout = QVBoxLayout(self)
+        header_layout = QHBoxLayout()
+        self.usage_label = QLabel("")
+        header_layout.addWidget(self.usage_label)
+        header_layout.addStretch()
+        export_button = QPushButton("Export...")
+        export_button.clicked.connect(self.export)
+        header_layout.addWidget(export_button)
+        layout.addLayout(header_layout)
+        self.table = QTableWidget(0, len(self.columns))
+        self.table.setHorizontalHeaderLabels(self.columns)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        layout.addWidget(self.table)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def own_usage(self):
+        with self.process.oneshot():
+            return {
+                "cpu_percent": self.process.cpu_percent(None),
+                "rss_mb": self.process.memory_info().rss / (1024 * 1024),
+                "threads": self.process.num_threads(),
+            }
+
+    def refresh(self):
+        usage = self.own_usage()
+        self.usage_label.setText(f"Resmon: {usage['cpu_percent']:.1f}% CPU, {usage['rss_mb']:.1f} MB RSS, {usage['threads']} threads")
+        summary = self.profiler.summary()
+        self.table.setRowCount(len(summary))
+        for row, (name, stats) in enumerate(summary.items()):
+            values = [name, str(stats["count"])]
+            values += [f"{stats[key] * 1000:.2f} ms" if key in stats else "" for key in ("mean", "p50", "p95", "p99", "max")]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if column:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.table.setItem(row, column, item)
+                item.setText(value)
+
+    def export(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Diagnostics", "resmon-diagnostics.json", "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            self.profiler.export_json(path, {"process": self.own_usage()})
+        except OSError as e:
+            QMessageBox.warning(self, "Export Error", f"Failed to export diagnostics: {e}")
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start(1000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
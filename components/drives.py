@@ -0,0 +1,55 @@
+""" Import the necessary modules for this component to work """
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QProgressBar
+
+
+
+""" Utility function for formatting a byte count """
+def format_size(size):
+    for unit in ['B', 'KB', 'MB', 'GB', 'TB', 'PB', 'EB', 'ZB', 'YB']:
+        if size < 1024:
+            return f"{size:.2f} {unit}"
+        size /= 1024
+    return f"{size:.2f} YB"
+
+
+
+""" Define the class for a single drive in the Drives tab
+
+The widget is created once per mountpoint and updated in place when new usage
+figures arrive.
+"""
+class DriveWidget(QWidget):
+    def __init__(self, device, mountpoint, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.title_label = QLabel(f"{device} ({mountpoint})")
+        self.title_label.setFont(QFont("Arial", 14, QFont.Bold))
+        layout.addWidget(self.title_label)
+        self.usage_bar = QProgressBar()
+        self.usage_bar.setRange(0, 100000)
+        self.usage_bar.setTextVisible(False)
+        layout.addWidget(self.usage_bar)
+        self.usage_label = QLabel("")
+        self.usage_label.setFont(QFont("Arial", 12))
+        layout.addWidget(self.usage_label)
+        self.full = False
+        self.usage = None
+
+    def set_usage(self, total, used, status=None):
+        usage = (total, used, status)
+        if usage == self.usage:
+            return
+        self.usage = usage
+        if status:
+            self.usage_label.setText(status)
+            return
+        used_percentage = used / total * 100 if total else 0.0
+        self.usage_bar.setValue(round(used_percentage * 1000))
+        full = used_percentage > 90
+        if full != self.full:
+            self.full = full
+            self.usage_bar.setStyleSheet("QProgressBar::chunk { background-color: red; }" if full else "")
+        self.usage_label.setText(f"{format_size(used)}/{format_size(total)} ({used_percentage:.1f}%)")
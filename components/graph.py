@@ -1,14 +1,26 @@
 """ Import the necessary modules for this component to work """
-from math import floor
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QPixmap, QPainter, QPen, QColor, QPainterPath, QBrush
-from PyQt5.QtWidgets import QLabel, QSizePolicy, QWidget, QVBoxLayout
+from math import floor, log10
+from PyQt5.QtCore import Qt, QEvent, QPointF
+from PyQt5.QtGui import QPixmap, QPainter, QPen, QColor, QBrush, QPolygonF, QTransform
+from PyQt5.QtWidgets import QLabel, QSizePolicy
+from components.profiling import PROFILER
 
 
 
-""" Define the class for the RGraph component """
+""" Define the class for the RGraph component
+
+Samples live in a fixed-size ring buffer stored as a QPolygonF, where point i holds
+(i, value) for ring slot i. Adding a sample overwrites one slot, so the per-tick cost
+in Python does not depend on x_points; at paint time the two halves of the ring are
+translated into order and drawn in one fill and one polyline through a transform
+from sample space to pixels. The grid, border and label are cached in a background
+pixmap that is only rebuilt on resize or style change. setHistory() swaps in a
+longer stored series for display while live samples keep filling the ring. With
+autoscale, the top of the scale follows the largest value in the ring (rounded up to
+1, 2 or 5 times a power of ten) and never drops below the initial max.
+"""
 class RGraph(QLabel):
-    def __init__(self, x_points: int = 10, y_points: int = 10, min: int = 0, max: int = 100, hue_offset: int = 0, label: str = ''):
+    def __init__(self, x_points: int = 10, y_points: int = 10, min: int = 0, max: int = 100, hue_offset: int = 0, label: str = '', autoscale: bool = False):
         super().__init__()
         self.setMinimumWidth(100)
         self.setMinimumHeight(100)
@@ -20,28 +32,64 @@ class RGraph(QLabel):
         self.max_val = max
         if self.min_val > self.max_val:
             self.min_val = self.max_val - 1
-        self.data = [min] * (x_points + 1)
+        self.autoscale = autoscale
+        self.scale_floor = self.max_val
+        self.ring = QPolygonF([QPointF(i, self.min_val) for i in range(x_points + 1)])
+        self.head = 0
+        self.history = None
         self.hue_offset = hue_offset
         self.label = label
-        self.pixmap = QPixmap(self.size())
+        self.background = None
         self.styling = None
 
+    @property
+    def data(self):
+        return self.values()
+
+    def values(self):
+        size = self.ring.size()
+        return [self.ring.at((self.head + i) % size).y() for i in range(size)]
+
+    def setData(self, values):
+        size = self.ring.size()
+        values = list(values)[-size:]
+        values = [self.min_val] * (size - len(values)) + values
+        for i, value in enumerate(values):
+            self.ring.replace(i, QPointF(i, self.min_val if value is None else value))
+        self.head = 0
+        if self.autoscale:
+            self.rescale()
+        self.update()
+
+    def setHistory(self, values):
+        if values is None:
+            self.history = None
+        else:
+            self.history = QPolygonF([QPointF(i, self.min_val if value is None else value) for i, value in enumerate(values)])
+        self.update()
+
+    def setLabel(self, label: str):
+        self.label = label
+        self.background = None
+        self.update()
+
     def resizeEvent(self, event):
-        self.drawGraph()
+        self.background = None
         super().resizeEvent(event)
 
-    def drawGraph(self):
-        if not self.styling: return
-        size = self.size()
-        width, height = size.width(), size.height()
-        if width <= 0 or height <= 0:
-            return
-        self.pixmap = QPixmap(width, height)
-        self.pixmap.fill(self.styling[0])
-        painter = QPainter(self.pixmap)
+    def changeEvent(self, event):
+        if event.type() in (QEvent.StyleChange, QEvent.PaletteChange) and self.styling:
+            self.styling = self.get_styling()
+            self.background = None
+        super().changeEvent(event)
+
+    def drawBackground(self, width, height):
+        self.background = QPixmap(width, height)
+        self.background.fill(self.styling[0])
+        painter = QPainter(self.background)
         painter.setRenderHint(QPainter.Antialiasing)
-        line_amount_x = floor((width - (width % 40)) / 40)
-        line_amount_y = floor((height - (height % 40)) / 40)
+        line_amount_x = max(1, floor((width - (width % 40)) / 40))
+        line_amount_y = max(1, floor((height - (height % 40)) / 40))
         line_distance_x = width / line_amount_x
         line_distance_y = height / line_amount_y
         pen = QPen()
@@ -54,52 +102,71 @@ class RGraph(QLabel):
         for i in range(1, line_amount_y):
             line_y_pos = round(line_distance_y * i)
             painter.drawLine(0, line_y_pos, width, line_y_pos)
-        pen = QPen()
-        pen.setWidth(2)
         pen.setColor(self.styling[2])
         painter.setPen(pen)
         painter.drawRect(0, 0, width, height)
-        data_point_distance_x = width / self.x_points
-        valRange = self.max_val - self.min_val
-        drawable_height = height - 2
-        pen.setColor(self.styling[2])
-        painter.setPen(pen)
         painter.drawText(5, 15, self.label)
-        path = QPainterPath()
-        first_x = round(0)
-        first_y = round(height - ((self.data[0] - self.min_val) / valRange) * height) + 2
-        path.moveTo(first_x, first_y)
-        for i, point in enumerate(self.data):
-            x_pos = round(data_point_distance_x * i)
-            y_pos = round(drawable_height - ((point - self.min_val) / valRange) * drawable_height) + 2
-            path.lineTo(x_pos, y_pos)
-        path.lineTo(x_pos, height)
-        path.lineTo(first_x, height)
-        path.closeSubpath()
+        painter.end()
+
+    def drawGraph(self, painter):
+        if not self.styling: return
+        width, height = self.width(), self.height()
+        if width <= 0 or height <= 0:
+            return
+        if self.background is None or self.background.width() != width or self.background.height() != height:
+            self.drawBackground(width, height)
+        painter.drawPixmap(0, 0, self.background)
+        if self.history is not None:
+            line = self.history
+        else:
+            line = self.ring.mid(self.head).translated(-self.head, 0) + self.ring.mid(0, self.head).translated(self.ring.size() - self.head, 0)
+        size = line.size()
+        fill = QPolygonF(line)
+        fill.append(QPointF(size - 1, self.min_val))
+        fill.append(QPointF(0, self.min_val))
+        drawable_height = height - 2
+        scale_y = drawable_height / (self.max_val - self.min_val)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setTransform(QTransform(width / max(1, size - 1), 0, 0, -scale_y, 0, drawable_height + 2 + self.min_val * scale_y))
         fill_color = QColor(self.styling[3])
         fill_color.setAlpha(48)
         painter.setBrush(QBrush(fill_color))
         painter.setPen(Qt.NoPen)
-        painter.drawPath(path)
-        pen = QPen()
-        pen.setColor(self.styling[3])
+        painter.drawPolygon(fill)
+        pen = QPen(self.styling[3])
+        pen.setCosmetic(True)
         pen.setWidth(1)
         painter.setPen(pen)
-        prev_point = None
-        for i, point in enumerate(self.data):
-            x_pos = round(data_point_distance_x * i)
-            y_pos = round(drawable_height - ((point - self.min_val) / valRange) * drawable_height) + 2
-            if prev_point is not None:
-                painter.drawLine(prev_point[0], prev_point[1], x_pos, y_pos)
-            prev_point = (x_pos, y_pos)
-        painter.end()
-        self.setPixmap(self.pixmap)
+        painter.setBrush(Qt.NoBrush)
+        painter.drawPolyline(line)
+        painter.restore()
+
+    def paintEvent(self, event):
+        with PROFILER.measure("paint/RGraph.drawGraph"):
+            painter = QPainter(self)
+            self.drawGraph(painter)
+            painter.end()
 
     def updateLatestDatapoint(self, value: float = 0.0):
         append_value = self.min_val if value is None else value
-        self.data.pop(0)
-        self.data.append(append_value)
-        self.drawGraph()
+        self.ring.replace(self.head, QPointF(self.head, append_value))
+        self.head = (self.head + 1) % self.ring.size()
+        if self.autoscale:
+            self.rescale()
+        self.update()
+
+    def rescale(self):
+        bounds = self.ring.boundingRect()
+        peak = bounds.y() + bounds.height()
+        if peak <= self.scale_floor:
+            self.max_val = self.scale_floor
+            return
+        magnitude = 10 ** floor(log10(peak))
+        for step in (1, 2, 5, 10):
+            if peak <= step * magnitude:
+                self.max_val = step * magnitude
+                return
 
     def get_styling(self):
         palette = self.palette()
@@ -121,5 +188,5 @@ class RGraph(QLabel):
 
     def showEvent(self, event):
         self.styling = self.get_styling()
-        self.drawGraph()
+        self.background = None
         super().showEvent(event)
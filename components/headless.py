@@ -0,0 +1,201 @@
+""" Headless collector mode
+
+Streams samples from the Sampler to stdout or a file as JSON Lines or CSV, without
+importing PyQt5, so Resmon can run as a long-lived agent on machines without a
+display:
+
+    python resmon.py --headless --metrics cpu,memory,processes --interval 2 --output samples.jsonl
+
+With --record FILE every sample is also kept in a compact session file that the GUI
+can replay with --replay FILE. --alert-rule RULE (repeatable) evaluates alert rules
+on every sample and reports fired and cleared alerts on stderr and, with
+--alert-log FILE, in a log file.
+"""
+import sys
+import csv
+import json
+import time
+import argparse
+import psutil
+
+from components.sampler import Sampler
+from components.recording import SessionRecorder
+from components.alerts import AlertEngine
+
+
+
+""" Metrics that can be selected, and the names of the fields of a process row """
+METRICS = ("cpu", "percpu", "memory", "disk", "processes")
+PROCESS_FIELDS = ("pid", "name", "threads", "user", "memory_mb", "cpu_percent", "ppid")
+
+
+
+""" Define the class for writing sample records in JSON Lines or CSV
+
+Records go straight into a block-buffered stream, so memory use is bounded by the
+buffer size; the stream is flushed when the buffer fills or at most every
+flush_interval seconds, whichever comes first, so readers tailing the output see
+data promptly without a write per sample.
+"""
+class SampleWriter:
+    def __init__(self, stream, output_format, metrics, flush_interval=1.0):
+        self.stream = stream
+        self.output_format = output_format
+        self.flush_interval = flush_interval
+        self.last_flush = time.monotonic()
+        self.csv_writer = None
+        if output_format == "csv":
+            self.csv_columns = ["time"] + [metric for metric in ("cpu", "memory", "disk") if metric in metrics]
+            self.csv_writer = csv.writer(stream)
+            header = list(self.csv_columns)
+            if "percpu" in metrics:
+                header += [f"cpu{i}" for i in range(psutil.cpu_count(logical=True))]
+            if not stream.seekable() or stream.tell() == 0:
+                self.csv_writer.writerow(header)
+
+    def write(self, record):
+        if self.csv_writer:
+            self.csv_writer.writerow([record.get(column) for column in self.csv_columns] + (record.get("percpu") or []))
+        else:
+            self.stream.write(json.dumps(record, separators=(",", ":")))
+            self.stream.write("\n")
+        now = time.monotonic()
+        if now - self.last_flush >= self.flush_interval:
+            self.stream.flush()
+            self.last_flush = now
+
+    def close(self):
+        self.stream.flush()
+
+
+
+""" Define the class for collecting the latest values from a Sampler into records """
+class HeadlessCollector:
+    def __init__(self, sampler, writer, metrics, count=0):
+        self.sampler = sampler
+        self.writer = writer
+        self.metrics = metrics
+        self.count = count
+        self.written = 0
+        self.latest = {}
+        sampler.connect("cpu", self.on_cpu)
+        sampler.connect("disk", self.on_disk)
+        sampler.connect("snapshot", self.on_snapshot)
+
+    def on_cpu(self, cpu_usage, cpu_core_usages, memory_percent):
+        self.latest["cpu"] = round(cpu_usage, 1)
+        self.latest["percpu"] = cpu_core_usages
+        self.latest["memory"] = memory_percent
+
+    def on_disk(self, used_percentage):
+        self.latest["disk"] = round(used_percentage, 1)
+
+    def on_snapshot(self, processes_info):
+        self.latest["processes"] = processes_info
+
+    def output(self):
+        if self.writer:
+            record = {"time": round(time.time(), 3)}
+            for metric in self.metrics:
+                if metric == "processes":
+                    record["processes"] = [dict(zip(PROCESS_FIELDS, process)) for process in self.latest.get("processes", [])]
+                else:
+                    record[metric] = self.latest.get(metric)
+            self.writer.write(record)
+        self.written += 1
+        if self.count and self.written >= self.count:
+            self.sampler.stop()
+
+
+
+""" Utility function for parsing the headless command line """
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="resmon --headless", description="Stream Resmon samples without a GUI.")
+    parser.add_argument("--headless", action="store_true")
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--metrics", default="cpu,memory,disk", help=f"comma separated list of: {', '.join(METRICS)}")
+    parser.add_argument("--interval", type=float, default=1.0, help="seconds between samples")
+    parser.add_argument("--output", default=None, help="output file, or - for stdout (the default unless --record is given)")
+    parser.add_argument("--count", type=int, default=0, help="stop after this many samples (0 runs forever)")
+    parser.add_argument("--flush-interval", type=float, default=1.0, help="maximum seconds between flushes")
+    parser.add_argument("--record", metavar="FILE", help="also record every sample, process snapshot, drive and throughput report to a session file")
+    parser.add_argument("--alert-rule", action="append", metavar="RULE", help='alert rule such as "process cpu > 90 for 30s" (repeatable)')
+    parser.add_argument("--alert-log", metavar="FILE", help="append fired and cleared alerts to a log file")
+    args = parser.parse_args(argv)
+    args.metrics = [metric.strip() for metric in args.metrics.split(",") if metric.strip()]
+    unknown = [metric for metric in args.metrics if metric not in METRICS]
+    if unknown:
+        parser.error(f"unknown metrics: {', '.join(unknown)}")
+    if args.format == "csv" and "processes" in args.metrics:
+        parser.error("the processes metric is only available with --format jsonl")
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+    if args.alert_log and not args.alert_rule:
+        parser.error("--alert-log needs at least one --alert-rule")
+    if args.output is None and not args.record:
+        args.output = "-"
+    return args
+
+
+
+""" Entry point for the headless collector """
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    enabled = set()
+    if {"cpu", "percpu", "memory"} & set(args.metrics):
+        enabled.add("cpu")
+    if "disk" in args.metrics:
+        enabled.add("disk")
+    if "processes" in args.metrics:
+        enabled.add("processes")
+    intervals = {name: args.interval for name in enabled}
+    if args.record:
+        enabled |= {"cpu", "disk", "processes", "partitions", "drives", "io"}
+    try:
+        alerts = AlertEngine(args.alert_rule, args.alert_log) if args.alert_rule else None
+    except (OSError, ValueError) as e:
+        print(f"Cannot set up alerts: {e}", file=sys.stderr)
+        return 1
+    if alerts:
+        enabled |= alerts.collectors()
+        alerts.connect("fired", lambda alert: print(f"FIRED {alert.describe()}", file=sys.stderr, flush=True))
+        alerts.connect("cleared", lambda alert: print(f"CLEARED {alert.describe()}", file=sys.stderr, flush=True))
+    try:
+        recorder = SessionRecorder(args.record) if args.record else None
+    except (OSError, ValueError) as e:
+        print(f"Cannot record to {args.record}: {e}", file=sys.stderr)
+        return 1
+    sampler = Sampler(intervals=intervals, enabled=enabled)
+    if recorder:
+        recorder.attach(sampler)
+    if alerts:
+        alerts.attach(sampler)
+    if args.output is None:
+        stream = None
+    elif args.output == "-":
+        stream = sys.stdout
+    else:
+        stream = open(args.output, "a", buffering=1 << 16, newline="" if args.format == "csv" else None)
+    writer = SampleWriter(stream, args.format, args.metrics, args.flush_interval) if stream else None
+    collector = HeadlessCollector(sampler, writer, args.metrics, args.count)
+    output = sampler.scheduler.add("output", args.interval, collector.output)
+    output.next_due += args.interval
+    try:
+        sampler.run()
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        return 0
+    finally:
+        if recorder:
+            recorder.close()
+        if alerts:
+            alerts.close()
+        try:
+            if writer:
+                writer.close()
+        except BrokenPipeError:
+            pass
+        if stream is not None and stream is not sys.stdout:
+            stream.close()
+    return 0
@@ -0,0 +1,142 @@
+""" Import the necessary modules for this component to work """
+from PyQt5.QtCore import QEvent, QRectF
+from PyQt5.QtGui import QImage, QPainter, QPen, QColor
+from PyQt5.QtWidgets import QLabel, QSizePolicy
+from components.profiling import PROFILER
+
+
+
+""" Define the class for the CoreHeatmap component
+
+Draws the recent history of every CPU core in a single widget: one row per core, one
+column per sample, with the colour running from the background to the graph colour
+as usage rises. The history is an 8-bit indexed QImage used as a ring buffer, so a
+tick writes one column of pixels and the whole grid is painted with two scaled image
+blits regardless of the core count. setHistory() swaps in stored per-core series
+for display while live samples keep filling the ring, copying each core's row into
+the image as one scanline of bytes. The tooltip reads the value under the cursor
+from whichever of the two is on screen.
+"""
+class CoreHeatmap(QLabel):
+    def __init__(self, cores: int, x_points: int = 60, min: int = 0, max: int = 100, hue_offset: int = 0, label: str = ''):
+        super().__init__()
+        self.setMinimumWidth(100)
+        self.setMinimumHeight(100 if cores < 50 else cores * 2)
+        self.setMouseTracking(True)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        self.setObjectName('RGraph')
+        self.cores = cores
+        self.x_points = x_points
+        self.min_val = min
+        self.max_val = max
+        self.hue_offset = hue_offset
+        self.label = label
+        self.image = QImage(x_points, cores, QImage.Format_Indexed8)
+        self.image.setColorCount(101)
+        self.image.fill(0)
+        self.head = 0
+        self.history_image = None
+        self.styling = None
+
+    def updateLatestDatapoints(self, values):
+        value_range = self.max_val - self.min_val
+        for core, value in enumerate(values[:self.cores]):
+            level = 0 if value is None else round((value - self.min_val) / value_range * 100)
+            self.image.setPixel(self.head, core, min(100, max(0, level)))
+        self.head = (self.head + 1) % self.x_points
+        self.update()
+
+    def setHistory(self, rows):
+        if rows is None:
+            self.history_image = None
+        else:
+            points = max(len(values) for values in rows) if rows else 1
+            value_range = self.max_val - self.min_val
+            self.history_image = QImage(points, self.cores, QImage.Format_Indexed8)
+            self.history_image.setColorTable(self.image.colorTable())
+            self.history_image.fill(0)
+            scale = 100 / value_range
+            for core, values in enumerate(rows[:self.cores]):
+                line = bytes(0 if value is None else min(100, max(0, round((value - self.min_val) * scale))) for value in values)
+                pointer = self.history_image.scanLine(core)
+                pointer.setsize(len(line))
+                pointer[:len(line)] = line
+        self.update()
+
+    def applyStyling(self):
+        self.styling = self.get_styling()
+        background, foreground = self.styling[0], self.styling[3]
+        for level in range(101):
+            blend = level / 100
+            self.image.setColor(level, QColor(
+                round(background.red() + (foreground.red() - background.red()) * blend),
+                round(background.green() + (foreground.green() - background.green()) * blend),
+                round(background.blue() + (foreground.blue() - background.blue()) * blend)
+            ).rgb())
+        if self.history_image is not None:
+            self.history_image.setColorTable(self.image.colorTable())
+
+    def changeEvent(self, event):
+        if event.type() in (QEvent.StyleChange, QEvent.PaletteChange) and self.styling:
+            self.applyStyling()
+        super().changeEvent(event)
+
+    def drawGraph(self, painter):
+        if not self.styling: return
+        width, height = self.width(), self.height()
+        if width <= 0 or height <= 0:
+            return
+        painter.fillRect(0, 0, width, height, self.styling[0])
+        top = 20
+        area = QRectF(0, top, width, height - top)
+        if self.history_image is not None:
+            painter.drawImage(area, self.history_image, QRectF(self.history_image.rect()))
+        else:
+            self.drawRing(painter, area)
+        pen = QPen(self.styling[2])
+        pen.setWidth(2)
+        painter.setPen(pen)
+        painter.drawRect(0, 0, width, height)
+        painter.drawText(5, 15, f"{self.label} ({self.cores} cores)")
+
+    def drawRing(self, painter, area):
+        top, width = area.top(), area.width()
+        older = self.x_points - self.head
+        split_x = area.width() * older / self.x_points
+        painter.drawImage(QRectF(0, top, split_x, area.height()), self.image, QRectF(self.head, 0, older, self.cores))
+        if self.head:
+            painter.drawImage(QRectF(split_x, top, width - split_x, area.height()), self.image, QRectF(0, 0, self.head, self.cores))
+
+    def paintEvent(self, event):
+        with PROFILER.measure("paint/CoreHeatmap.drawGraph"):
+            painter = QPainter(self)
+            self.drawGraph(painter)
+            painter.end()
+
+    def mouseMoveEvent(self, event):
+        top = 20
+        if event.y() >= top and self.height() > top and self.width() > 0:
+            core = min(int((event.y() - top) / (self.height() - top) * self.cores), self.cores - 1)
+            if self.history_image is not None:
+                column = min(int(event.x() / self.width() * self.history_image.width()), self.history_image.width() - 1)
+                level = self.history_image.pixelIndex(max(0, column), core)
+            else:
+                level = self.image.pixelIndex((self.head - 1) % self.x_points, core)
+            self.setToolTip(f"CPU #{core}: {self.min_val + level * (self.max_val - self.min_val) / 100:.0f}%")
+        super().mouseMoveEvent(event)
+
+    def get_styling(self):
+        palette = self.palette()
+        background_color = QColor(palette.color(self.backgroundRole()).name())
+        foreground_color = QColor(palette.color(self.foregroundRole()).name())
+        bh, bs, bl, _ = background_color.getHsl()
+        fh, fs, fl, _ = foreground_color.getHsl()
+        fh = (fh + self.hue_offset) % 360
+        bg_border = QColor()
+        bg_border.setHsl(bh, bs, 32 if bl > 128 else 224)
+        foreground_color.setHsl(fh, fs, fl)
+        return [background_color, None, bg_border, foreground_color]
+
+    def showEvent(self, event):
+        self.applyStyling()
+        super().showEvent(event)
@@ -0,0 +1,300 @@
+""" Import the necessary modules for this component to work """
+import os
+import mmap
+import time
+import struct
+import threading
+
+
+
+""" Define the default history tiers as (resolution in seconds, number of slots)
+
+1s for an hour, 10s for a day and 1min for 30 days.
+"""
+DEFAULT_TIERS = [(1, 3600), (10, 8640), (60, 43200)]
+
+""" Define the on-disk layout of a series file """
+MAGIC = b"RMHIST02"
+HEADER = struct.Struct("<8sI")
+SLOT = struct.Struct("<IfffI")
+
+""" Define how many slots one locked read of a window covers, and how many slots old a slot must be before it is final """
+READ_CHUNK_SLOTS = 2048
+SETTLE_SLOTS = 3
+
+
+
+""" Define the class for a rollup bucket that is still being filled
+
+rolled_total and rolled_count are the part of the bucket already folded into the
+next tier, so folding it again only passes on what was added since.
+"""
+class Bucket:
+    __slots__ = ("start", "low", "high", "total", "count", "rolled_total", "rolled_count")
+
+    def __init__(self, start, low, high, total, count, rolled_total=0.0, rolled_count=0):
+        self.start = start
+        self.low = low
+        self.high = high
+        self.total = total
+        self.count = count
+        self.rolled_total = rolled_total
+        self.rolled_count = rolled_count
+
+    def add(self, low, high, total, count):
+        self.low = min(self.low, low)
+        self.high = max(self.high, high)
+        self.total += total
+        self.count += count
+
+
+
+""" Define the class for a single metric series backed by a memory-mapped file
+
+Each tier is a fixed ring of slots addressed by time: a bucket starting at t lives
+in slot (t // resolution) % slots and stores its own start time, so stale slots
+left over from an earlier run are recognised and skipped when reading. Samples go
+into the open bucket of the finest tier; when a bucket closes it is written to its
+slot and its min/max/sum/count are folded into the open bucket of the next tier,
+so every coarser tier is built incrementally from the one below it.
+
+flush() writes the open buckets and folds what they gained since the last fold into
+the next tier as well, so every slot on disk has been rolled up. A bucket opened for
+a start that its slot already holds, as after a restart within the same period,
+carries on from the slot's contents instead of overwriting them.
+"""
+class HistorySeries:
+    def __init__(self, path, tiers):
+        self.tiers = tiers
+        self.offsets = []
+        offset = HEADER.size
+        for resolution, slots in tiers:
+            self.offsets.append(offset)
+            offset += slots * SLOT.size
+        self.size = offset
+        new_file = not os.path.exists(path) or os.path.getsize(path) != self.size
+        self.file = open(path, "w+b" if new_file else "r+b")
+        if new_file:
+            self.file.truncate(self.size)
+        self.map = mmap.mmap(self.file.fileno(), self.size)
+        if new_file or HEADER.unpack_from(self.map, 0) != (MAGIC, len(tiers)):
+            self.map[:self.size] = bytes(self.size)
+            HEADER.pack_into(self.map, 0, MAGIC, len(tiers))
+        self.open_buckets = [None] * len(tiers)
+
+    def record(self, value, timestamp):
+        self.add(0, int(timestamp), value, value, value, 1)
+
+    def add(self, tier, timestamp, low, high, total, count):
+        resolution = self.tiers[tier][0]
+        start = timestamp - timestamp % resolution
+        bucket = self.open_buckets[tier]
+        if bucket is not None and bucket.start == start:
+            bucket.add(low, high, total, count)
+            return
+        if bucket is not None:
+            self.write(tier, bucket)
+            self.roll_up(tier, bucket)
+        bucket = self.resume(tier, start)
+        if bucket is None:
+            bucket = Bucket(start, low, high, total, count)
+        else:
+            bucket.add(low, high, total, count)
+        self.open_buckets[tier] = bucket
+
+    def roll_up(self, tier, bucket):
+        if tier + 1 < len(self.tiers) and bucket.count > bucket.rolled_count:
+            total, count = bucket.total - bucket.rolled_total, bucket.count - bucket.rolled_count
+            bucket.rolled_total, bucket.rolled_count = bucket.total, bucket.count
+            self.add(tier + 1, bucket.start, bucket.low, bucket.high, total, count)
+
+    def resume(self, tier, start):
+        resolution, slots = self.tiers[tier]
+        slot = (start // resolution) % slots
+        stamp, low, high, average, count = SLOT.unpack_from(self.map, self.offsets[tier] + slot * SLOT.size)
+        if stamp != start or not count:
+            return None
+        return Bucket(start, low, high, average * count, count, average * count, count)
+
+    def write(self, tier, bucket):
+        resolution, slots = self.tiers[tier]
+        slot = (bucket.start // resolution) % slots
+        SLOT.pack_into(self.map, self.offsets[tier] + slot * SLOT.size, bucket.start, bucket.low, bucket.high, bucket.total / bucket.count, bucket.count)
+
+    def read(self, tier, start, end):
+        resolution, slots = self.tiers[tier]
+        first = start - start % resolution
+        count = min(slots, (end - first) // resolution + 1)
+        offset = self.offsets[tier]
+        first_slot = (first // resolution) % slots
+        last_slot = min(slots, first_slot + count)
+        wrapped = count - (last_slot - first_slot)
+        view = memoryview(self.map)
+        chunks = [view[offset + first_slot * SLOT.size:offset + last_slot * SLOT.size]]
+        if wrapped:
+            chunks.append(view[offset:offset + wrapped * SLOT.size])
+        records = {}
+        for chunk in chunks:
+            for stamp, low, high, average, count in SLOT.iter_unpack(chunk):
+                if first <= stamp <= end:
+                    records[stamp] = (low, high, average)
+            chunk.release()
+        view.release()
+        bucket = self.open_buckets[tier]
+        if bucket is not None and first <= bucket.start <= end:
+            records[bucket.start] = (bucket.low, bucket.high, bucket.total / bucket.count)
+        return [(stamp, *records[stamp]) for stamp in sorted(records)]
+
+    def flush(self):
+        for tier in range(len(self.tiers)):
+            bucket = self.open_buckets[tier]
+            if bucket is not None:
+                self.write(tier, bucket)
+                self.roll_up(tier, bucket)
+        self.map.flush()
+
+    def close(self):
+        self.flush()
+        self.map.close()
+        self.file.close()
+
+
+
+""" Define the class for a downsampled window over one series, kept up to date incrementally
+
+Each output point averages `group` slots, aligned to absolute time rather than to
+the start of the window, so sliding the window only adds points at the end and
+drops them at the front. Slots are folded into their point's running sum once they
+are SETTLE_SLOTS old, by which time every finer tier has rolled into them; the
+newer slots are read again on every update. Only the first update reads the whole
+window, and it does so in chunks of READ_CHUNK_SLOTS, so the caller can release
+the store lock between them.
+"""
+class HistoryWindow:
+    def __init__(self, resolution, seconds, max_points=None):
+        self.resolution = resolution
+        self.seconds = seconds
+        points = seconds // resolution + 1
+        self.span = resolution * (-(-points // max_points) if max_points else 1)
+        self.sums = {}
+        self.settled_until = None
+
+    def update(self, read, end):
+        resolution, span = self.resolution, self.span
+        first = end - self.seconds
+        first -= first % span
+        settled = end - end % resolution - SETTLE_SLOTS * resolution
+        start = first if self.settled_until is None else max(first, self.settled_until)
+        recent = {}
+        for chunk_start in range(start, end + 1, READ_CHUNK_SLOTS * resolution):
+            for stamp, low, high, average in read(chunk_start, min(end, chunk_start + READ_CHUNK_SLOTS * resolution - 1)):
+                entry = (self.sums if stamp < settled else recent).setdefault(stamp - stamp % span, [0.0, 0])
+                entry[0] += average
+                entry[1] += 1
+        self.settled_until = max(start, settled)
+        for point in [point for point in self.sums if point < first]:
+            del self.sums[point]
+        values = []
+        for point in range(first, end + 1, span):
+            total, count = self.sums.get(point, (0.0, 0))
+            extra = recent.get(point)
+            if extra is not None:
+                total, count = total + extra[0], count + extra[1]
+            values.append(total / count if count else None)
+        return values
+
+
+
+""" Define the class for the metric history store
+
+Keeps one HistorySeries file per metric name in a directory (by default the
+"resmonhistory" folder in the user's home), so the footprint is fixed by the tier
+layout and history survives restarts. Recording and reading may happen from
+different threads. read_window() keeps a HistoryWindow per series, range and point
+count, so refreshing a long range only reads the slots written since the last
+call; it is meant to be called from one thread at a time, off the GUI thread.
+"""
+class HistoryStore:
+    def __init__(self, directory=None, tiers=None):
+        self.directory = directory or os.path.join(os.path.expanduser("~"), "resmonhistory")
+        self.tiers = tiers or DEFAULT_TIERS
+        os.makedirs(self.directory, exist_ok=True)
+        self.series = {}
+        self.windows = {}
+        self.lock = threading.Lock()
+
+    def get_series(self, name):
+        series = self.series.get(name)
+        if series is None:
+            series = HistorySeries(os.path.join(self.directory, f"{name}.rmh"), self.tiers)
+            self.series[name] = series
+        return series
+
+    def record(self, name, value, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        with self.lock:
+            self.get_series(name).record(value, timestamp)
+
+    def record_many(self, values, timestamp=None):
+        timestamp = time.time() if timestamp is None else timestamp
+        with self.lock:
+            for name, value in values.items():
+                self.get_series(name).record(value, timestamp)
+
+    def tier_for(self, seconds):
+        for tier, (resolution, slots) in enumerate(self.tiers):
+            if resolution * slots >= seconds:
+                return tier
+        return len(self.tiers) - 1
+
+    def read(self, name, seconds, max_points=None, now=None):
+        end = int(time.time() if now is None else now)
+        tier = self.tier_for(seconds)
+        resolution = self.tiers[tier][0]
+        with self.lock:
+            records = self.get_series(name).read(tier, end - seconds, end)
+        points = (seconds // resolution) + 1
+        values = [None] * points
+        first = end - seconds
+        first -= first % resolution
+        for stamp, low, high, average in records:
+            index = (stamp - first) // resolution
+            if 0 <= index < points:
+                values[index] = average
+        if max_points and points > max_points:
+            values = downsample(values, max_points)
+        return values
+
+    def read_window(self, name, seconds, max_points=None, now=None):
+        end = int(time.time() if now is None else now)
+        tier = self.tier_for(seconds)
+        window = self.windows.get((name, seconds, max_points))
+        if window is None:
+            window = self.windows[(name, seconds, max_points)] = HistoryWindow(self.tiers[tier][0], seconds, max_points)
+
+        def read(start, stop):
+            with self.lock:
+                return self.get_series(name).read(tier, start, stop)
+        return window.update(read, end)
+
+    def flush(self):
+        with self.lock:
+            for series in self.series.values():
+                series.flush()
+
+    def close(self):
+        with self.lock:
+            for series in self.series.values():
+                series.close()
+            self.series = {}
+
+
+
+""" Utility function for averaging a value list down to a number of points, ignoring gaps """
+def downsample(values, max_points):
+    step = len(values) / max_points
+    result = []
+    for point in range(max_points):
+        chunk = [value for value in values[int(point * step):int((point + 1) * step)] if value is not None]
+        result.append(sum(chunk) / len(chunk) if chunk else None)
+    return result
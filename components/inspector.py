@@ -0,0 +1,172 @@
+""" Import the necessary modules for this component to work """
+import time
+import socket
+import threading
+import psutil
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+
+""" Define the defaults for the inspector's cache and worker pool """
+DEFAULT_TTL = 5.0
+DEFAULT_CAPACITY = 64
+DEFAULT_WORKERS = 2
+
+""" Define the most open files, connections and children listed for one process """
+MAX_LIST_ROWS = 500
+
+
+
+""" Utility function for running one psutil query, turning a refusal into a row """
+def attempt(query):
+    try:
+        return query()
+    except psutil.AccessDenied:
+        return [("", "Access denied")]
+    except (NotImplementedError, AttributeError):
+        return [("", "Not available on this platform")]
+
+
+
+""" Utility function for formatting a socket address """
+def format_address(address):
+    if not address:
+        return ""
+    if isinstance(address, str):
+        return address
+    return f"[{address.ip}]:{address.port}" if ":" in address.ip else f"{address.ip}:{address.port}"
+
+
+
+""" Utility function for collecting the details of one process
+
+Returns a list of (section, rows) with rows of (label, value), or None if the
+process has exited. Values are strings, except byte counts, which are ints for the
+caller to format. A section the current user may not read holds a single
+"Access denied" row instead of failing the whole inspection.
+"""
+def collect_details(pid):
+    try:
+        process = psutil.Process(pid)
+        with process.oneshot():
+            return [
+                ("General", attempt(lambda: general_rows(process))),
+                ("Memory", attempt(lambda: memory_rows(process))),
+                ("I/O", attempt(lambda: io_rows(process))),
+                ("Open Files", attempt(lambda: [("", f.path) for f in process.open_files()[:MAX_LIST_ROWS]])),
+                ("Connections", attempt(lambda: connection_rows(process))),
+                ("Children", attempt(lambda: [(str(child.pid), child_name(child)) for child in process.children(recursive=True)[:MAX_LIST_ROWS]])),
+                ("Environment", attempt(lambda: sorted(process.environ().items()))),
+            ]
+    except (psutil.NoSuchProcess, psutil.ZombieProcess):
+        return None
+
+
+
+""" Utility function for the General section: identity, command line and start time """
+def general_rows(process):
+    rows = [("Name", process.name()), ("Status", process.status()), ("Parent", str(process.ppid()))]
+    for label, query in (("User", process.username), ("Executable", process.exe), ("Command Line", lambda: " ".join(process.cmdline())), ("Working Directory", process.cwd)):
+        try:
+            rows.append((label, query()))
+        except psutil.AccessDenied:
+            rows.append((label, "Access denied"))
+    rows.append(("Started", time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(process.create_time()))))
+    return rows
+
+
+
+""" Utility function for the Memory section, including USS and PSS where the platform has them """
+def memory_rows(process):
+    memory = process.memory_full_info()
+    labels = [("rss", "Resident (RSS)"), ("vms", "Virtual (VMS)"), ("uss", "Unique (USS)"), ("pss", "Proportional (PSS)"), ("swap", "Swapped")]
+    return [(label, getattr(memory, field)) for field, label in labels if hasattr(memory, field)]
+
+
+
+""" Utility function for the I/O section """
+def io_rows(process):
+    counters = process.io_counters()
+    return [
+        ("Reads", str(counters.read_count)), ("Read", counters.read_bytes),
+        ("Writes", str(counters.write_count)), ("Written", counters.write_bytes),
+    ]
+
+
+
+""" Utility function for the Connections section, one row per inet socket """
+def connection_rows(process):
+    connections = process.net_connections(kind="inet") if hasattr(process, "net_connections") else process.connections(kind="inet")
+    rows = []
+    for connection in connections[:MAX_LIST_ROWS]:
+        protocol = "TCP" if connection.type == socket.SOCK_STREAM else "UDP"
+        remote = f" -> {format_address(connection.raddr)}" if connection.raddr else ""
+        rows.append((protocol, f"{format_address(connection.laddr)}{remote} {connection.status if connection.status != 'NONE' else ''}".strip()))
+    return rows
+
+
+
+""" Utility function for a child's name, which may exit while being listed """
+def child_name(child):
+    try:
+        return child.name()
+    except psutil.Error:
+        return "?"
+
+
+
+""" Define the class for the process inspector
+
+Collects process details on a small thread pool, never on the caller's thread,
+and keeps the results in a per-PID cache with a time-to-live and least recently
+used eviction. inspect() returns whatever is cached straight away (or None) and,
+if that is missing or older than the TTL, queues one refresh for the PID; the
+callback receives (pid, details) on a worker thread when it finishes. Exited
+PIDs should be forgotten so a reused PID never shows stale details.
+"""
+class ProcessInspector:
+    def __init__(self, ttl=DEFAULT_TTL, capacity=DEFAULT_CAPACITY, workers=DEFAULT_WORKERS):
+        self.ttl = ttl
+        self.capacity = capacity
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="inspector")
+        self.cache = OrderedDict()
+        self.pending = set()
+        self.lock = threading.Lock()
+
+    def inspect(self, pid, callback):
+        with self.lock:
+            entry = self.cache.get(pid)
+            if entry is not None:
+                self.cache.move_to_end(pid)
+            if (entry is None or time.monotonic() - entry[0] >= self.ttl) and pid not in self.pending:
+                self.pending.add(pid)
+                self.executor.submit(self.refresh, pid, callback)
+        return entry[1] if entry is not None else None
+
+    def is_pending(self, pid):
+        with self.lock:
+            return pid in self.pending
+
+    def refresh(self, pid, callback):
+        try:
+            details = collect_details(pid)
+        except Exception as e:
+            details = [("Error", [("", str(e))])]
+        with self.lock:
+            self.pending.discard(pid)
+            if details is None:
+                self.cache.pop(pid, None)
+            else:
+                self.cache[pid] = (time.monotonic(), details)
+                self.cache.move_to_end(pid)
+                while len(self.cache) > self.capacity:
+                    self.cache.popitem(last=False)
+        callback(pid, details)
+
+    def forget(self, pid):
+        with self.lock:
+            self.cache.pop(pid, None)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,57 @@
+""" Import the necessary modules for this component to work """
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem, QHeaderView
+from components.drives import format_size
+
+
+
+""" Define the class for the Hosts overview shown when watching remote agents
+
+One row per agent with its status, CPU, memory, boot disk, process count and busiest
+process, under a line that aggregates every connected host. Double-clicking a row
+asks for that host to be shown in the other tabs.
+"""
+class HostOverview(QWidget):
+    host_selected = pyqtSignal(str)
+    columns = ["Host", "Address", "Status", "CPU", "Memory", "Disk", "Processes", "Busiest Process"]
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        layout = QVBoxLayout(self)
+        self.total_label = QLabel("")
+        layout.addWidget(self.total_label)
+        self.table = QTableWidget(0, len(self.columns))
+        self.table.setHorizontalHeaderLabels(self.columns)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.table.setSelectionMode(QTableWidget.SingleSelection)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.table.cellDoubleClicked.connect(lambda row, column: self.host_selected.emit(self.table.item(row, 1).text()))
+        layout.addWidget(self.table)
+
+    def update_hosts(self, hosts):
+        connected = [host for host in hosts if host["status"] == "Connected"]
+        cores = sum(host["cores"] for host in connected)
+        cpu = sum(host["cpu"] * host["cores"] for host in connected) / cores if cores else 0.0
+        memory_total = sum(host["memory_total"] for host in connected)
+        memory_used = sum(host["memory_total"] * host["memory"] / 100 for host in connected)
+        self.total_label.setText(
+            f"{len(connected)} of {len(hosts)} hosts connected: {cores} cores at {cpu:.1f}%, "
+            f"{format_size(memory_used)}/{format_size(memory_total)} memory, {sum(host['processes'] for host in connected)} processes"
+        )
+        self.table.setRowCount(len(hosts))
+        for row, host in enumerate(hosts):
+            values = [
+                host["name"], host["address"], host["status"], f"{host['cpu']:.1f}%", f"{host['memory']:.1f}%",
+                host["disk"], str(host["processes"]), host["top"],
+            ]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if 3 <= column <= 6:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.table.setItem(row, column, item)
+                if item.text() != value:
+                    item.setText(value)
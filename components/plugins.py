@@ -0,0 +1,253 @@
+""" Import the necessary modules for this component to work """
+import time
+import queue
+import threading
+from components.profiling import PROFILER
+
+
+
+""" Define the defaults for plugin collectors: worker threads, seconds per run, seconds before a run is given up on """
+PLUGIN_WORKERS = 2
+DEFAULT_BUDGET = 0.05
+DEFAULT_TIMEOUT = 10.0
+
+""" Define the most a slow collector's interval is stretched, and the failures in a row that disable it """
+MAX_THROTTLE = 8.0
+MAX_FAILURES = 5
+
+
+
+""" Define the class for a small pool of daemon worker threads
+
+Unlike a ThreadPoolExecutor, the workers never hold up the interpreter's exit, and
+spawn() adds a worker to stand in for one that is stuck in a call that will not
+return, which Python has no way to interrupt.
+"""
+class WorkerPool:
+    def __init__(self, workers, name):
+        self.name = name
+        self.tasks = queue.SimpleQueue()
+        self.workers = 0
+        for _ in range(workers):
+            self.spawn()
+
+    def spawn(self):
+        self.workers += 1
+        threading.Thread(target=self.work, name=f"{self.name}-{self.workers}", daemon=True).start()
+
+    def submit(self, func, done):
+        self.tasks.put((func, done))
+
+    def work(self):
+        while True:
+            task = self.tasks.get()
+            if task is None:
+                return
+            func, done = task
+            try:
+                result, error = func(), None
+            except Exception as e:
+                result, error = None, e
+            done(result, error)
+
+    def close(self):
+        for _ in range(self.workers):
+            self.tasks.put(None)
+
+
+
+""" Define the class for one sampling function registered by a plugin
+
+key ("plugin/<plugin>/<name>") names it in the scheduler and the profiler. target
+is what the window does with each result on the GUI thread. throttle is the factor
+its interval is currently stretched by, and state is "running", "throttled",
+"paused" or "disabled"; the counters and cost are read by the Plugins panel.
+"""
+class PluginCollector:
+    def __init__(self, plugin, name, func, interval, budget, timeout, pids=False):
+        self.plugin = plugin
+        self.name = name
+        self.key = f"plugin/{plugin}/{name}"
+        self.func = func
+        self.interval = interval
+        self.budget = budget
+        self.timeout = timeout
+        self.pids = pids
+        self.target = None
+        self.throttle = 1.0
+        self.cost = None
+        self.started = None
+        self.paused = False
+        self.state = "running"
+        self.runs = 0
+        self.overruns = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.failures = 0
+        self.error = None
+
+
+
+""" Define the class for running plugin collectors off the sampling thread
+
+Collectors are added to the Sampler's scheduler, so they keep its grid, back off
+with it while the window is minimized and pause with it, but each tick only hands
+the plugin's function to a worker pool; the sampling thread never waits for a
+plugin. A tick that finds the previous run still going skips, and one that finds
+it going for longer than its timeout disables the collector and adds a worker in
+place of the stuck one. Results are handed to "result" listeners as (collector,
+value) on the sampling thread, like the Sampler's events.
+
+Every run is timed under the collector's key in the profiler. A run over the
+collector's budget counts as an overrun, and the interval is stretched by the
+smoothed cost over the budget, up to MAX_THROTTLE, so a slow plugin gets its
+share of a worker rather than all of it; it returns to its own interval as soon
+as it is fast again. MAX_FAILURES exceptions in a row disable a collector too.
+Collectors with pids=True are called with the PIDs the extra table columns are
+collected for.
+"""
+class PluginHost:
+    def __init__(self, sampler, workers=PLUGIN_WORKERS, profiler=PROFILER, clock=time.monotonic):
+        self.sampler = sampler
+        self.scheduler = sampler.scheduler
+        self.workers = workers
+        self.profiler = profiler
+        self.clock = clock
+        self.pool = None
+        self.collectors = {}
+        self.listeners = {}
+
+    def connect(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+
+    def emit(self, event, *args):
+        for callback in self.listeners.get(event, ()):
+            callback(*args)
+
+    def add(self, plugin, name, func, interval=2.0, budget=DEFAULT_BUDGET, timeout=DEFAULT_TIMEOUT, pids=False):
+        if interval <= 0 or budget <= 0 or timeout <= 0:
+            raise ValueError("interval, budget and timeout must be positive")
+        collector = PluginCollector(plugin, name, func, interval, budget, timeout, pids)
+        if collector.key in self.collectors:
+            raise ValueError(f"'{collector.key}' is already registered")
+        self.collectors[collector.key] = collector
+        if self.pool is None:
+            self.pool = WorkerPool(self.workers, "resmon-plugins")
+        self.scheduler.post(lambda: self.scheduler.add(collector.key, interval, lambda: self.tick(collector)))
+        return collector
+
+    def set_paused(self, collector, paused):
+        if paused == collector.paused:
+            return
+        collector.paused = paused
+        if collector.state != "disabled":
+            collector.state = "paused" if paused else "throttled" if collector.throttle > 1 else "running"
+            self.scheduler.post(lambda: self.scheduler.set_enabled(collector.key, not paused))
+
+    def disable(self, collector, reason):
+        if collector.state == "disabled":
+            return
+        collector.state = "disabled"
+        collector.error = reason
+        self.scheduler.post(lambda: self.scheduler.set_enabled(collector.key, False))
+        print(f"Plugin collector '{collector.key}' disabled: {reason}")
+
+    def column_pids(self):
+        known = self.sampler.differ.previous
+        pids = self.sampler.columns.pids
+        return list(known) if pids is None else [pid for pid in pids if pid in known]
+
+    def tick(self, collector):
+        if collector.started is not None:
+            if self.clock() - collector.started > collector.timeout:
+                collector.timeouts += 1
+                self.pool.spawn()
+                self.disable(collector, f"no result after {collector.timeout:g} s")
+            return
+        args = (self.column_pids(),) if collector.pids else ()
+        collector.started = self.clock()
+        self.pool.submit(lambda: self.call(collector, args), lambda result, error: self.scheduler.post(lambda: self.finish(collector, result, error)))
+
+    def call(self, collector, args):
+        started = time.perf_counter()
+        value = collector.func(*args)
+        return value, time.perf_counter() - started
+
+    def finish(self, collector, result, error):
+        collector.started = None
+        if error is not None:
+            collector.errors += 1
+            collector.failures += 1
+            collector.error = f"{type(error).__name__}: {error}"
+            if collector.failures >= MAX_FAILURES:
+                self.disable(collector, f"failed {collector.failures} times in a row ({collector.error})")
+            return
+        value, seconds = result
+        collector.failures = 0
+        collector.runs += 1
+        self.profiler.record(collector.key, seconds)
+        if collector.state == "disabled":
+            return
+        if seconds > collector.timeout:
+            collector.timeouts += 1
+            self.disable(collector, f"took {seconds:.1f} s, over its {collector.timeout:g} s timeout")
+            return
+        if seconds > collector.budget:
+            collector.overruns += 1
+        collector.cost = seconds if collector.cost is None else collector.cost * 0.75 + seconds * 0.25
+        throttle = min(MAX_THROTTLE, max(1.0, round(collector.cost / collector.budget, 1)))
+        if throttle != collector.throttle:
+            collector.throttle = throttle
+            self.scheduler.set_interval(collector.key, collector.interval * throttle)
+        if not collector.paused:
+            collector.state = "throttled" if throttle > 1 else "running"
+        self.emit("result", collector, value)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.close()
+
+
+
+""" Define the class handed to a plugin as app_context["collectors"]
+
+Every method registers a sampling function that runs on the plugin worker pool, on
+its own interval, and returns its PluginCollector (or None when Resmon is not
+sampling this machine, as when replaying or watching agents):
+
+    add_collector(name, func, callback)   callback(value) runs on the GUI thread
+    add_series(name, func, label)         func() returns a number, drawn in a graph on the Plugins tab
+    add_column(name, func, header)        func(pids) returns {pid: value} for a process table column
+
+budget is the seconds a run is expected to take at most, and timeout the seconds
+after which a run that has not returned disables the collector.
+"""
+class PluginAPI:
+    def __init__(self, host, plugin, window):
+        self.host = host
+        self.plugin = plugin
+        self.window = window
+
+    def add(self, name, func, interval, budget, timeout, pids=False):
+        if self.host is None:
+            print(f"Plugin '{self.plugin}': collectors only run while monitoring this machine")
+            return None
+        return self.host.add(self.plugin, name, func, interval, budget, timeout, pids)
+
+    def add_collector(self, name, func, callback=None, interval=2.0, budget=DEFAULT_BUDGET, timeout=DEFAULT_TIMEOUT):
+        collector = self.add(name, func, interval, budget, timeout)
+        if collector is not None:
+            collector.target = self.window.add_plugin_collector(collector, callback)
+        return collector
+
+    def add_series(self, name, func, label=None, unit="", maximum=100, autoscale=True, interval=1.0, budget=DEFAULT_BUDGET, timeout=DEFAULT_TIMEOUT):
+        collector = self.add(name, func, interval, budget, timeout)
+        if collector is not None:
+            collector.target = self.window.add_plugin_series(collector, label or name, unit, maximum, autoscale)
+        return collector
+
+    def add_column(self, name, func, header=None, interval=2.0, budget=DEFAULT_BUDGET, timeout=DEFAULT_TIMEOUT):
+        collector = self.add(name, func, interval, budget, timeout, pids=True)
+        if collector is not None:
+            collector.target = self.window.add_plugin_column(collector, header or name)
+        return collector
@@ -0,0 +1,80 @@
+""" Import the necessary modules for this component to work """
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QGridLayout, QTableWidget, QTableWidgetItem, QHeaderView
+from components.graph import RGraph
+from components.profiling import PROFILER
+
+
+
+""" Define the number of plugin graphs placed side by side """
+GRAPH_COLUMNS = 2
+
+
+
+""" Define the class for the Plugins panel
+
+Lists every plugin collector with its state, effective interval and run
+statistics (runs, overruns of its budget, timeouts, errors, and the p95 run time
+from the profiler), above the graphs of the series plugins add. The table only
+refreshes while the panel is visible; graphs are updated as results arrive.
+"""
+class PluginsPanel(QWidget):
+    columns = ["Collector", "State", "Interval", "Runs", "Overruns", "Timeouts", "Errors", "p95", "Last error"]
+
+    def __init__(self, host, parent=None, profiler=PROFILER):
+        super().__init__(parent)
+        self.host = host
+        self.profiler = profiler
+        layout = QVBoxLayout(self)
+        self.table = QTableWidget(0, len(self.columns))
+        self.table.setHorizontalHeaderLabels(self.columns)
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        layout.addWidget(self.table)
+        self.graph_layout = QGridLayout()
+        layout.addLayout(self.graph_layout)
+        self.graphs = 0
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+
+    def add_series(self, label, unit, maximum, autoscale):
+        graph = RGraph(x_points=60, y_points=100, max=maximum, hue_offset=60 * self.graphs, autoscale=autoscale, label=label)
+        self.graph_layout.addWidget(graph, self.graphs // GRAPH_COLUMNS, self.graphs % GRAPH_COLUMNS)
+        self.graphs += 1
+
+        def update(value):
+            graph.updateLatestDatapoint(value)
+            graph.setLabel(f"{label}: {value:.1f}{unit}")
+        return update
+
+    def refresh(self):
+        summary = self.profiler.summary()
+        collectors = list(self.host.collectors.values())
+        self.table.setRowCount(len(collectors))
+        for row, collector in enumerate(collectors):
+            p95 = summary.get(collector.key, {}).get("p95")
+            values = [
+                collector.key[len("plugin/"):], collector.state.title(), f"{collector.interval * collector.throttle:g} s",
+                str(collector.runs), str(collector.overruns), str(collector.timeouts), str(collector.errors),
+                "" if p95 is None else f"{p95 * 1000:.2f} ms", collector.error or "",
+            ]
+            for column, value in enumerate(values):
+                item = self.table.item(row, column)
+                if item is None:
+                    item = QTableWidgetItem()
+                    if 2 <= column <= 7:
+                        item.setTextAlignment(Qt.AlignRight | Qt.AlignVCenter)
+                    self.table.setItem(row, column, item)
+                if item.text() != value:
+                    item.setText(value)
+
+    def showEvent(self, event):
+        self.refresh()
+        self.timer.start(1000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
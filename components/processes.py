@@ -0,0 +1,168 @@
+""" Import the necessary modules for this component to work """
+import os
+import sys
+import time
+import psutil
+from components.columns import WALK_SOURCES
+from components.profiling import PROFILER
+
+try:
+    import pwd
+except ImportError:
+    pwd = None
+
+
+
+""" Define the class for collecting process rows through psutil
+
+This is the portable backend and the fallback on every platform without a usable
+/proc. Rows have the shape [pid, name, threads, user, memory (MB), cpu (%), ppid].
+Threads and user are only asked for while they are in fields, and are None
+otherwise; usernames are looked up in a separate, timed pass.
+"""
+class PsutilProcessCollector:
+    attrs = ['pid', 'name', 'memory_info', 'cpu_percent', 'ppid']
+
+    def __init__(self):
+        self.fields = WALK_SOURCES
+
+    def collect(self):
+        attrs = self.attrs + ['num_threads'] if "threads" in self.fields else self.attrs
+        processes_info = []
+        procs = []
+        for proc in psutil.process_iter(attrs):
+            if not proc.info['name'] or proc.info['name'] == "System Idle Process":
+                continue
+            procs.append(proc)
+            processes_info.append([
+                proc.info['pid'],
+                proc.info['name'],
+                proc.info.get('num_threads'),
+                None,
+                proc.info['memory_info'].rss / (1024 * 1024),
+                round(proc.info['cpu_percent'], 1),
+                proc.info['ppid']
+            ])
+        if "user" in self.fields:
+            with PROFILER.measure("column/user"):
+                for proc, process in zip(procs, processes_info):
+                    try:
+                        process[3] = proc.username()
+                    except psutil.Error:
+                        pass
+        return processes_info
+
+
+
+""" Utility function for reading a small /proc file with a single read call """
+def read_proc_file(path):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        return os.read(fd, 4096)
+    finally:
+        os.close(fd)
+
+
+
+""" Define the class for collecting process rows straight from /proc on Linux
+
+Each process costs two small reads: /proc/[pid]/stat for name, parent, threads and
+CPU ticks, and /proc/[pid]/statm for the resident set. While "user" is in fields,
+a separate, timed pass adds a stat of each /proc/[pid] directory for the owner uid;
+usernames are resolved once per uid. CPU% is computed from the tick delta since the
+previous call, keyed by the process start time so a recycled PID starts from zero
+like a new process in psutil.
+"""
+class ProcfsProcessCollector:
+    def __init__(self, proc_path="/proc"):
+        self.proc_path = proc_path
+        self.fields = WALK_SOURCES
+        self.clock_ticks = os.sysconf("SC_CLK_TCK")
+        self.page_size_mb = os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+        self.usernames = {}
+        self.previous_ticks = {}
+        self.previous_time = None
+
+    def username(self, uid):
+        name = self.usernames.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except KeyError:
+                name = str(uid)
+            self.usernames[uid] = name
+        return name
+
+    def full_name(self, pid_path, comm):
+        try:
+            cmdline = read_proc_file(pid_path + "/cmdline")
+        except OSError:
+            return comm
+        exe = os.path.basename(cmdline.split(b"\0", 1)[0].decode(errors="replace"))
+        return exe if exe.startswith(comm) else comm
+
+    def collect(self):
+        now = time.monotonic()
+        elapsed = now - self.previous_time if self.previous_time is not None else 0.0
+        cpu_scale = 100.0 / (self.clock_ticks * elapsed) if elapsed > 0 else 0.0
+        previous_ticks = self.previous_ticks
+        current_ticks = {}
+        page_size_mb = self.page_size_mb
+        proc_path = self.proc_path
+        processes_info = []
+        owners = []
+        with os.scandir(proc_path) as entries:
+            for entry in entries:
+                pid_name = entry.name
+                if not pid_name.isdigit():
+                    continue
+                pid_path = proc_path + "/" + pid_name
+                try:
+                    stat = read_proc_file(pid_path + "/stat")
+                    statm = read_proc_file(pid_path + "/statm")
+                except OSError:
+                    continue
+                rpar = stat.rfind(b")")
+                comm = stat[stat.find(b"(") + 1:rpar].decode(errors="replace")
+                if not comm:
+                    continue
+                fields = stat[rpar + 2:].split()
+                if len(comm) >= 15:
+                    comm = self.full_name(pid_path, comm)
+                pid = int(pid_name)
+                ticks = int(fields[11]) + int(fields[12])
+                start_time = fields[19]
+                current_ticks[pid] = (start_time, ticks)
+                previous = previous_ticks.get(pid)
+                if previous is not None and previous[0] == start_time:
+                    cpu = round((ticks - previous[1]) * cpu_scale, 1)
+                else:
+                    cpu = 0.0
+                processes_info.append([
+                    pid,
+                    comm,
+                    int(fields[17]),
+                    None,
+                    int(statm.split(None, 2)[1]) * page_size_mb,
+                    cpu,
+                    int(fields[1])
+                ])
+                owners.append(pid_path)
+        if "user" in self.fields:
+            with PROFILER.measure("column/user"):
+                for pid_path, process in zip(owners, processes_info):
+                    try:
+                        process[3] = self.username(os.stat(pid_path).st_uid)
+                    except OSError:
+                        pass
+        self.previous_ticks = current_ticks
+        self.previous_time = now
+        return processes_info
+
+
+
+""" Utility function for picking the fastest process collector for this platform """
+def create_process_collector():
+    if sys.platform.startswith("linux") and pwd is not None and os.path.isdir("/proc/self"):
+        return ProcfsProcessCollector()
+    return PsutilProcessCollector()
@@ -0,0 +1,681 @@
+""" Import the necessary modules for this component to work """
+import sys
+import time
+from PyQt5.QtCore import Qt, QAbstractItemModel, QAbstractTableModel, QModelIndex, QSortFilterProxyModel
+from components.proctree import ProcessTree, PPID
+from components.prochistory import ProcessHistory
+from components.cgroups import parent_path
+from components.drives import format_size
+from components.columns import PROCESS_COLUMNS
+
+
+
+""" Column headers, the roles used for sorting, for looking up a row's PID and for a row's history """
+COLUMN_HEADERS = [column.header for column in PROCESS_COLUMNS]
+SORT_ROLE = Qt.UserRole
+PID_ROLE = Qt.UserRole + 1
+SPARKLINE_ROLE = Qt.UserRole + 2
+
+""" The table-only column drawn as a sparkline, which sorts like the CPU column """
+HISTORY_COLUMN = 6
+
+""" The table column showing the parent PID (row column 6), and the extra columns by table column """
+PARENT_COLUMN = 7
+EXTRA_COLUMNS = {index: column.key for index, column in enumerate(PROCESS_COLUMNS) if column.row is None and column.source}
+NO_EXTRAS = {}
+
+""" Define the share of all processes that may move in one refresh before the model re-sorts everything instead """
+RESORT_FRACTION = 1 / 16
+
+""" Row columns shown by the tree model, with the program name first so it carries the branches """
+TREE_COLUMNS = [1, 0, 2, 3, 4, 5]
+
+""" Columns the cgroup tree model shows after the tree columns, and the group row columns holding them """
+GROUP_HEADERS = ["Disk Read", "Disk Write"]
+GROUP_RATE_COLUMNS = [7, 8]
+
+
+
+""" Utility function for the display and sort values of a process row cell """
+def cell_data(column, value, role):
+    if role == Qt.DisplayRole:
+        if column == 4:
+            return f"{value:.2f} MB"
+        if column == 5:
+            return f"{value:.1f}%"
+        return str(value) if value is not None else ""
+    if role == SORT_ROLE:
+        if column in (1, 3):
+            return (value or "").lower()
+        return value
+    return None
+
+
+
+""" Utility function for the display and sort values of an extra column, which may not be collected yet """
+def extra_data(key, value, role):
+    if role == Qt.DisplayRole:
+        if value is None:
+            return ""
+        if key == "started":
+            return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(value))
+        if key in ("read", "write"):
+            return f"{format_size(value)}/s"
+        if isinstance(value, float):
+            return f"{value:.1f}"
+        return str(value)
+    if role == SORT_ROLE:
+        return value
+    return None
+
+
+
+""" Utility function for the index at which a sort key belongs in a list of PIDs ordered by their keys in key_of """
+def sorted_position(pids, key_of, key, reverse):
+    low, high = 0, len(pids)
+    while low < high:
+        middle = (low + high) // 2
+        other = key_of[pids[middle]]
+        if (other > key) if reverse else (other < key):
+            low = middle + 1
+        else:
+            high = middle
+    return low
+
+
+
+""" Utility function for grouping sorted row indices into contiguous (first, last) runs """
+def contiguous_runs(indices):
+    runs = []
+    for index in indices:
+        if runs and runs[-1][1] + 1 == index:
+            runs[-1][1] = index
+        else:
+            runs.append([index, index])
+    return runs
+
+
+
+""" Define the class for the process table model
+
+Every known process is kept by PID together with a lowercase name and user index,
+and the model exposes only the rows that pass the current ProcessQuery, in the
+current sort order. The fetcher sends deltas (new rows, exited PIDs and changed
+columns), so a refresh only inserts and removes the rows that appeared, exited or
+crossed the filter, signals the cells that changed, and re-sorts only when a row
+moved on the sort column; persistent indexes (the selection) follow their PIDs.
+
+Sorting happens here rather than in a QSortFilterProxyModel because the proxy
+compares rows through Python data() calls, which takes seconds at 20k processes.
+The full PID list is kept sorted, so a new filter is one pass over it that
+preserves the order, and ties are broken by PID so the order is stable. The sort key
+each PID was placed with is kept too, so a refresh takes out only the rows whose
+key changed and puts them back by binary search; only when more than RESORT_FRACTION
+of the processes moved is everything sorted again.
+
+The model also feeds a ProcessHistory with every CPU and memory change; the
+History column hands (cpu, memory) series to the sparkline delegate through
+SPARKLINE_ROLE and is signalled as changed on every refresh, since time moves on
+for every row; set_visible_rows() narrows that to the rows the view shows.
+
+Columns start as PROCESS_COLUMNS, and add_column() appends more, such as plugin
+columns. Extra columns are not part of the rows: they arrive per PID through
+apply_columns(), usually for the visible rows only, and are blank until they do.
+Each delivery replaces the values of its own keys, so extras from different
+collectors stay side by side; keys that are not columns of the model are ignored,
+and a delivery with none that are changes nothing.
+"""
+class ProcessTableModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._processes = {}
+        self._names = {}
+        self._users = {}
+        self._sorted = []
+        self._keys = {}
+        self._rows = []
+        self._row_of = {}
+        self._extras = {}
+        self.columns = list(PROCESS_COLUMNS)
+        self.extra_columns = dict(EXTRA_COLUMNS)
+        self._query = None
+        self._sort_column = 1
+        self._sort_order = Qt.AscendingOrder
+        self.visible_rows = None
+        self.history = ProcessHistory()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.columns[section].header
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        pid = self._rows[index.row()]
+        if role == PID_ROLE:
+            return pid
+        if index.column() == HISTORY_COLUMN:
+            return self.history.series(pid) if role == SPARKLINE_ROLE else None
+        column = self.columns[index.column()]
+        if column.row is not None:
+            return cell_data(column.row, self._processes[pid][column.row], role)
+        return extra_data(column.key, self._extras.get(pid, NO_EXTRAS).get(column.key), role)
+
+    def pid_at(self, row):
+        return self._rows[row]
+
+    def row_of(self, pid):
+        return self._row_of.get(pid)
+
+    def process(self, pid):
+        return self._processes.get(pid)
+
+    def processes(self):
+        return list(self._processes.values())
+
+    def matches(self, pid):
+        query = self._query
+        if not query:
+            return True
+        process = self._processes.get(pid)
+        return process is not None and query.matches(process, self._names[pid], self._users[pid])
+
+    def set_query(self, query):
+        self._query = query if query else None
+        self.beginResetModel()
+        self._rows = self._select(self._sorted)
+        self._row_of = {pid: row for row, pid in enumerate(self._rows)}
+        self.endResetModel()
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        row = self.columns[column].row
+        self._sort_column = 5 if column == HISTORY_COLUMN else row if row is not None else column
+        self._sort_order = order
+        self._resort()
+
+    def sorted_by_extra(self):
+        return self._sort_column in self.extra_columns
+
+    def set_visible_rows(self, first, last):
+        self.visible_rows = (first, last) if first >= 0 else None
+
+    def add_column(self, column):
+        index = len(self.columns)
+        self.beginInsertColumns(QModelIndex(), index, index)
+        self.columns.append(column)
+        self.extra_columns[index] = column.key
+        self.endInsertColumns()
+        return index
+
+    def apply_columns(self, values, keys):
+        keys = set(keys)
+        indices = [index for index, key in self.extra_columns.items() if key in keys]
+        if not indices:
+            return
+        if len(indices) < len(keys):
+            keys = {self.extra_columns[index] for index in indices}
+            values = {pid: {key: value for key, value in columns.items() if key in keys} for pid, columns in values.items()}
+        processes, extras = self._processes, self._extras
+        for pid, columns in values.items():
+            if pid in processes:
+                kept = {key: value for key, value in extras.get(pid, NO_EXTRAS).items() if key not in keys}
+                extras[pid] = {**kept, **columns} if kept else columns
+        changed_rows = sorted(self._row_of[pid] for pid in values if pid in self._row_of)
+        first_column, last_column = min(indices), max(indices)
+        for first, last in contiguous_runs(changed_rows):
+            self.dataChanged.emit(self.index(first, first_column), self.index(last, last_column))
+        if self.sorted_by_extra() and changed_rows:
+            self._reposition([pid for pid in values if pid in processes], (), (), 0)
+
+    def apply_delta(self, added, removed, changed, reset=False):
+        processes, names, users = self._processes, self._names, self._users
+        history = self.history
+        history.advance()
+        if reset:
+            self.beginResetModel()
+            self._processes, self._names, self._users = {}, {}, {}
+            self._index(added)
+            self._extras = {pid: columns for pid, columns in self._extras.items() if pid in self._processes}
+            history.retain(self._processes)
+            for process in added:
+                if process[0] in history:
+                    history.record(process[0], process[5], process[4])
+            self._sort_all()
+            self._rows = self._select(self._sorted)
+            self._row_of = {pid: row for row, pid in enumerate(self._rows)}
+            self.endResetModel()
+            return
+        exited = []
+        for pid in removed:
+            if processes.pop(pid, None) is not None:
+                del names[pid], users[pid]
+                self._extras.pop(pid, None)
+                history.release(pid)
+                exited.append(pid)
+        hidden = list(exited)
+        query = self._query
+        sort_column = self._sort_column
+        shown = []
+        changed_pids = []
+        moved = []
+        for pid, fields in changed:
+            process = processes.get(pid)
+            if process is None:
+                continue
+            for column, value in fields.items():
+                process[column] = value
+            if 1 in fields:
+                names[pid] = (process[1] or "").lower()
+            if 3 in fields:
+                users[pid] = (process[3] or "").lower()
+            if 4 in fields or 5 in fields:
+                history.record(pid, process[5], process[4])
+            if sort_column in fields:
+                moved.append(pid)
+            if query and not query.columns.isdisjoint(fields):
+                visible = pid in self._row_of
+                if query.matches(process, names[pid], users[pid]) != visible:
+                    (hidden if visible else shown).append(pid)
+                    continue
+            changed_pids.append((pid, fields))
+        added = [process for process in added if process[0] not in processes]
+        if added:
+            self._index(added)
+            for process in added:
+                history.record(process[0], process[5], process[4])
+            shown += self._select([process[0] for process in added])
+        if hidden:
+            self._remove_rows(hidden)
+        if shown:
+            start = len(self._rows)
+            self.beginInsertRows(QModelIndex(), start, start + len(shown) - 1)
+            for pid in shown:
+                self._row_of[pid] = len(self._rows)
+                self._rows.append(pid)
+            self.endInsertRows()
+        if moved or exited or added or shown:
+            self._reposition(moved, exited, [process[0] for process in added], len(shown))
+        self._emit_changed(changed_pids)
+        first, last = self.visible_rows or (0, len(self._rows) - 1)
+        last = min(last, len(self._rows) - 1)
+        if first <= last:
+            self.dataChanged.emit(self.index(first, HISTORY_COLUMN), self.index(last, HISTORY_COLUMN), [SPARKLINE_ROLE])
+
+    def _index(self, processes):
+        for process in processes:
+            pid = process[0]
+            self._processes[pid] = list(process)
+            self._names[pid] = (process[1] or "").lower()
+            self._users[pid] = (process[3] or "").lower()
+
+    def _select(self, pids):
+        if not self._query:
+            return list(pids)
+        return self._query.select(pids, self._processes, self._names, self._users)
+
+    def _sort_key(self):
+        column = self._sort_column
+        if column == 1:
+            names = self._names
+            return lambda pid: (names[pid], pid)
+        if column == 3:
+            users = self._users
+            return lambda pid: (users[pid], pid)
+        if column in self.extra_columns:
+            extras, key = self._extras, self.extra_columns[column]
+            def extra_key(pid):
+                value = extras.get(pid, NO_EXTRAS).get(key)
+                return (value is not None, value if value is not None else 0, pid)
+            return extra_key
+        processes = self._processes
+        return lambda pid: (processes[pid][column] or 0, pid)
+
+    def _sort_all(self):
+        key = self._sort_key()
+        self._keys = keys = {pid: key(pid) for pid in self._processes}
+        self._sorted = sorted(keys, key=keys.__getitem__, reverse=self._sort_order == Qt.DescendingOrder)
+
+    def _resort(self):
+        self._sort_all()
+        visible = self._row_of
+        self._set_rows([pid for pid in self._sorted if pid in visible], 0)
+
+    def _reposition(self, moved, exited, added, shown):
+        if (len(moved) + len(exited) + len(added) + shown) > len(self._keys) * RESORT_FRACTION:
+            self._resort()
+            return
+        reverse = self._sort_order == Qt.DescendingOrder
+        key, keys, ordered = self._sort_key(), self._keys, self._sorted
+        changes = [(pid, new) for pid, new in ((pid, key(pid)) for pid in moved) if keys[pid] != new]
+        mirror = self._query is None
+        rows, visible = self._rows[:], self._row_of
+        tail = [] if mirror or not shown else rows[len(rows) - shown:]
+        del rows[len(rows) - len(tail):]
+        tail_pids = set(tail)
+        first = first_row = len(ordered)
+        for pid in exited:
+            if pid in keys:
+                index = sorted_position(ordered, keys, keys[pid], reverse)
+                del ordered[index]
+                del keys[pid]
+                first = min(first, index)
+        for pid, new in changes:
+            index = sorted_position(ordered, keys, keys[pid], reverse)
+            del ordered[index]
+            first = min(first, index)
+            if not mirror and pid in visible and pid not in tail_pids:
+                index = sorted_position(rows, keys, keys[pid], reverse)
+                del rows[index]
+                first_row = min(first_row, index)
+        for pid, new in changes:
+            keys[pid] = new
+            index = sorted_position(ordered, keys, new, reverse)
+            ordered.insert(index, pid)
+            first = min(first, index)
+            if not mirror and pid in visible and pid not in tail_pids:
+                index = sorted_position(rows, keys, new, reverse)
+                rows.insert(index, pid)
+                first_row = min(first_row, index)
+        for pid in added:
+            keys[pid] = key(pid)
+            index = sorted_position(ordered, keys, keys[pid], reverse)
+            ordered.insert(index, pid)
+            first = min(first, index)
+        if mirror:
+            self._set_rows(ordered[:], first)
+            return
+        for pid in tail:
+            index = sorted_position(rows, keys, keys[pid], reverse)
+            rows.insert(index, pid)
+            first_row = min(first_row, index)
+        self._set_rows(rows, min(first_row, len(rows) - shown))
+
+    def _set_rows(self, rows, first):
+        if rows == self._rows:
+            return
+        self.layoutAboutToBeChanged.emit([], QAbstractItemModel.VerticalSortHint)
+        persistent = self.persistentIndexList()
+        moved = [(self._rows[index.row()], index.column()) for index in persistent]
+        self._rows = rows
+        self._row_of.update(zip(rows[first:], range(first, len(rows))))
+        self.changePersistentIndexList(persistent, [self.index(self._row_of[pid], column) for pid, column in moved])
+        self.layoutChanged.emit([], QAbstractItemModel.VerticalSortHint)
+
+    def _remove_rows(self, pids):
+        row_of = self._row_of
+        removed_rows = sorted(row_of[pid] for pid in pids if pid in row_of)
+        if not removed_rows:
+            return
+        for first, last in reversed(contiguous_runs(removed_rows)):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._rows[first:last + 1]
+            self.endRemoveRows()
+        self._row_of = {pid: row for pid, row in row_of.items() if row < removed_rows[0]}
+        for row in range(removed_rows[0], len(self._rows)):
+            self._row_of[self._rows[row]] = row
+
+    def _emit_changed(self, changed):
+        changed_rows = []
+        first_column, last_column = len(self.columns), 0
+        for pid, fields in changed:
+            row = self._row_of.get(pid)
+            if row is None:
+                continue
+            columns = [PARENT_COLUMN if column == 6 else column for column in fields]
+            first_column = min(first_column, min(columns))
+            last_column = max(last_column, max(columns))
+            changed_rows.append(row)
+        if first_column > last_column:
+            return
+        changed_rows.sort()
+        for first, last in contiguous_runs(changed_rows):
+            self.dataChanged.emit(self.index(first, first_column), self.index(last, last_column))
+
+
+
+""" Define the class for the sorting and filtering proxy in front of the process tree model
+
+The filter is a callable taking a PID, normally ProcessTableModel.matches so both
+views share one name/user index; ancestors of a matching process stay visible.
+"""
+class ProcessSortProxy(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(SORT_ROLE)
+        self.setDynamicSortFilter(True)
+        self.accepts = None
+
+    def set_filter(self, accepts):
+        self.accepts = accepts
+        self.setRecursiveFilteringEnabled(accepts is not None)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if self.accepts is None:
+            return True
+        return self.accepts(self.sourceModel().index(source_row, 0, source_parent).data(PID_ROLE))
+
+
+
+""" Define the class for the process tree model
+
+A Qt view over a ProcessTree, fed the same deltas as the table model. Threads,
+Memory and CPU show the totals for each process's whole subtree. The tree tells the
+model about every insertion and removal as it happens, and the model only signals
+the rows whose totals changed, so the view is never rebuilt outside a resync.
+Indexes carry the PID as their internal id. Subclasses may add columns after the
+tree columns through extra_headers and answer for them in data().
+"""
+class ProcessTreeModel(QAbstractItemModel):
+    extra_headers = []
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.tree = ProcessTree(self)
+
+    def node_of(self, index):
+        return self.tree.nodes.get(index.internalId()) if index.isValid() else None
+
+    def index_of(self, node, column=0):
+        if node is None:
+            return QModelIndex()
+        return self.createIndex(node.position, column, node.pid)
+
+    def index(self, row, column, parent=QModelIndex()):
+        siblings = self.tree.children_of(self.node_of(parent))
+        if not 0 <= row < len(siblings) or not 0 <= column < self.columnCount():
+            return QModelIndex()
+        return self.createIndex(row, column, siblings[row].pid)
+
+    def parent(self, index):
+        node = self.node_of(index)
+        return self.index_of(node.parent) if node is not None else QModelIndex()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        return len(self.tree.children_of(self.node_of(parent)))
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(TREE_COLUMNS) + len(self.extra_headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            if section >= len(TREE_COLUMNS):
+                return self.extra_headers[section - len(TREE_COLUMNS)]
+            return COLUMN_HEADERS[TREE_COLUMNS[section]]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        node = self.node_of(index)
+        if node is None:
+            return None
+        if role == PID_ROLE:
+            return node.pid
+        if index.column() >= len(TREE_COLUMNS):
+            return None
+        column = TREE_COLUMNS[index.column()]
+        if column == 2:
+            value = node.threads
+        elif column == 4:
+            value = node.memory
+        elif column == 5:
+            value = node.cpu
+        else:
+            value = node.row[column]
+        return cell_data(column, value, role)
+
+    def apply_delta(self, added, removed, changed, reset=False):
+        self.tree.apply_delta(added, removed, changed, reset)
+
+    def begin_insert(self, parent, row):
+        self.beginInsertRows(self.index_of(parent), row, row)
+
+    def end_insert(self):
+        self.endInsertRows()
+
+    def begin_remove(self, parent, row):
+        self.beginRemoveRows(self.index_of(parent), row, row)
+
+    def end_remove(self):
+        self.endRemoveRows()
+
+    def begin_reset(self):
+        self.beginResetModel()
+
+    def end_reset(self):
+        self.endResetModel()
+
+    def totals_changed(self, nodes):
+        positions = {}
+        for node in nodes:
+            positions.setdefault(node.parent, []).append(node.position)
+        last_column = self.columnCount() - 1
+        for parent, rows in positions.items():
+            parent_index = self.index_of(parent)
+            rows.sort()
+            for first, last in contiguous_runs(rows):
+                self.dataChanged.emit(self.index(first, 0, parent_index), self.index(last, last_column, parent_index))
+
+
+
+""" Define the class for the cgroup tree model
+
+Groups processes by cgroup with the same ProcessTree as the process tree model:
+every cgroup is a node with a negative id under its parent cgroup (Qt hands
+internal ids back unsigned, so node_of() converts them back), and every
+process hangs under its cgroup instead of its parent process. Groups show the
+totals the kernel keeps for them, from a CgroupCollector, rather than sums over
+their processes, plus their disk read and write rates; processes show their own
+figures. A process whose cgroup is not known yet is held back until it is, so it
+never shows up in the wrong place first.
+"""
+class CgroupTreeModel(ProcessTreeModel):
+    extra_headers = GROUP_HEADERS
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.members = {}
+        self.group_ids = {}
+        self.paths = {}
+        self.groups = {}
+        self.pending = {}
+        self.next_id = -1
+
+    def node_of(self, index):
+        if not index.isValid():
+            return None
+        key = index.internalId()
+        return self.tree.nodes.get(key - 2 * (sys.maxsize + 1) if key > sys.maxsize else key)
+
+    def data(self, index, role=Qt.DisplayRole):
+        node = self.node_of(index)
+        if node is None or node.pid >= 0 or role == PID_ROLE:
+            return super().data(index, role)
+        if role == Qt.ToolTipRole:
+            return self.paths[node.pid]
+        if index.column() >= len(TREE_COLUMNS):
+            value = node.row[GROUP_RATE_COLUMNS[index.column() - len(TREE_COLUMNS)]]
+            if role == Qt.DisplayRole:
+                return f"{format_size(value)}/s" if value is not None else ""
+            return value if role == SORT_ROLE else None
+        column = TREE_COLUMNS[index.column()]
+        value = node.row[column]
+        if role == Qt.DisplayRole and (column == 0 or value is None):
+            return ""
+        return cell_data(column, value, role)
+
+    def apply_delta(self, added, removed, changed, reset=False):
+        if reset:
+            self.pending = {}
+            rows = [list(self.groups[group]) for group in sorted(self.groups, key=self.paths.get)]
+            for process in added:
+                self.place(process, rows)
+            self.tree.apply_delta(rows, [], [], True)
+            return
+        tree_removed = []
+        for pid in removed:
+            self.members.pop(pid, None)
+            if self.pending.pop(pid, None) is None:
+                tree_removed.append(pid)
+        tree_changed = []
+        for pid, fields in changed:
+            row = self.pending.get(pid)
+            if row is not None:
+                for column, value in fields.items():
+                    row[column] = value
+                continue
+            if PPID in fields:
+                fields = {column: value for column, value in fields.items() if column != PPID}
+            if fields:
+                tree_changed.append((pid, fields))
+        tree_added = []
+        for process in added:
+            self.place(process, tree_added)
+        self.tree.apply_delta(tree_added, tree_removed, tree_changed)
+
+    def place(self, process, rows):
+        group = self.group_ids.get(self.members.get(process[0]))
+        if group is None:
+            self.pending[process[0]] = list(process)
+            return
+        row = list(process)
+        row[PPID] = group
+        rows.append(row)
+
+    def apply_groups(self, groups, assigned, reset):
+        if reset:
+            self.members = {}
+        self.members.update(assigned)
+        reported = set()
+        added = []
+        changed = []
+        for path, tasks, memory, cpu, read_rate, write_rate in groups:
+            group = self.group_ids.get(path)
+            if group is None:
+                group = self.group_ids[path] = self.next_id
+                self.next_id -= 1
+                self.paths[group] = path
+            row = [group, path.rsplit("/", 1)[-1] or "/", tasks, "", memory, cpu, self.group_ids.get(parent_path(path), 0), read_rate, write_rate]
+            reported.add(group)
+            old = self.groups.get(group)
+            self.groups[group] = row
+            if old is None:
+                added.append(list(row))
+                continue
+            fields = {column: value for column, value in enumerate(row) if old[column] != value}
+            if fields:
+                changed.append((group, fields))
+        removed = [group for group in self.groups if group not in reported]
+        for group in removed:
+            del self.groups[group], self.group_ids[self.paths.pop(group)]
+        for pid in [pid for pid in self.pending if self.members.get(pid) in self.group_ids]:
+            self.place(self.pending.pop(pid), added)
+        self.tree.apply_delta(added, removed, changed)
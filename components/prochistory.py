@@ -0,0 +1,114 @@
+""" Import the necessary modules for this component to work """
+from array import array
+from collections import OrderedDict
+
+
+
+""" Define the default number of tracked processes and samples kept per process
+
+4096 processes of 60 samples of two float32 metrics is under 2 MB.
+"""
+DEFAULT_CAPACITY = 4096
+DEFAULT_LENGTH = 60
+
+
+
+""" Define the class for the per-process CPU and memory history
+
+Every tracked PID owns a slot in two preallocated float32 arrays (CPU% and resident
+memory in MB), each slot a ring of `length` samples indexed by tick. The table
+sends deltas, so a process is only written when its CPU or memory changed; the
+samples in between are filled forward from its last value when it is next written
+or read. Slots are handed out in least-recently-changed order: when all of them are
+in use, the process that has been idle longest gives up its slot, and slots of
+exited processes go back to a free list, so nothing is allocated after startup
+however many processes come and go. The pinned PID (the selected row) is never
+evicted. Qt-free so it can be used without a GUI.
+"""
+class ProcessHistory:
+    def __init__(self, capacity=DEFAULT_CAPACITY, length=DEFAULT_LENGTH):
+        self.capacity = capacity
+        self.length = length
+        self.cpu = array("f", bytes(4 * capacity * length))
+        self.memory = array("f", bytes(4 * capacity * length))
+        self.first = array("q", bytes(8 * capacity))
+        self.last = array("q", bytes(8 * capacity))
+        self.slots = OrderedDict()
+        self.free = list(range(capacity - 1, -1, -1))
+        self.tick = 0
+        self.pinned = None
+
+    def __contains__(self, pid):
+        return pid in self.slots
+
+    def __len__(self):
+        return len(self.slots)
+
+    def advance(self):
+        self.tick += 1
+
+    def record(self, pid, cpu, memory):
+        tick, length = self.tick, self.length
+        slot = self.slots.get(pid)
+        if slot is None:
+            slot = self.free.pop() if self.free else self.evict()
+            self.slots[pid] = slot
+            self.first[slot] = tick
+        else:
+            self.slots.move_to_end(pid)
+            self.fill(slot, tick)
+        offset = slot * length + tick % length
+        self.last[slot] = tick
+        self.cpu[offset] = cpu or 0.0
+        self.memory[offset] = memory or 0.0
+
+    def fill(self, slot, tick):
+        last, length = self.last[slot], self.length
+        if tick - last <= 1:
+            return
+        base = slot * length
+        previous_cpu, previous_memory = self.cpu[base + last % length], self.memory[base + last % length]
+        for missed in range(max(last + 1, tick - length + 1), tick):
+            self.cpu[base + missed % length] = previous_cpu
+            self.memory[base + missed % length] = previous_memory
+
+    def evict(self):
+        pid, slot = self.slots.popitem(last=False)
+        if pid == self.pinned and self.slots:
+            self.slots[pid] = slot
+            pid, slot = self.slots.popitem(last=False)
+        return slot
+
+    def release(self, pid):
+        slot = self.slots.pop(pid, None)
+        if slot is not None:
+            self.free.append(slot)
+
+    def retain(self, pids):
+        for pid in [pid for pid in self.slots if pid not in pids]:
+            self.release(pid)
+
+    def clear(self):
+        self.slots.clear()
+        self.free = list(range(self.capacity - 1, -1, -1))
+
+    def pin(self, pid):
+        self.pinned = pid
+
+    def series(self, pid):
+        slot = self.slots.get(pid)
+        if slot is None:
+            return None
+        tick, length = self.tick, self.length
+        base = slot * length
+        first, last = self.first[slot], self.last[slot]
+        cpu, memory = [], []
+        for moment in range(tick - length + 1, tick + 1):
+            if moment < first:
+                cpu.append(None)
+                memory.append(None)
+            else:
+                offset = base + min(moment, last) % length
+                cpu.append(self.cpu[offset])
+                memory.append(self.memory[offset])
+        return cpu, memory
@@ -0,0 +1,187 @@
+""" Define the process row columns the tree aggregates over its subtrees """
+THREADS, MEMORY, CPU, PPID = 2, 4, 5, 6
+
+
+
+""" Define the class for a single process in the tree """
+class ProcessNode:
+    __slots__ = ("pid", "row", "parent", "position", "children", "threads", "memory", "cpu", "waits")
+
+    def __init__(self, row):
+        self.pid = row[0]
+        self.row = list(row)
+        self.parent = None
+        self.position = 0
+        self.children = []
+        self.threads = row[THREADS] or 0
+        self.memory = row[MEMORY] or 0.0
+        self.cpu = row[CPU] or 0.0
+        self.waits = None
+
+
+
+""" Define the class for a parent->children index of processes with subtree totals
+
+The tree is maintained from the same deltas as the process table. Every node holds
+the sum of threads, memory and CPU over its whole subtree; when a process appears,
+exits, changes parent or changes its own figures, only the difference is pushed up
+its chain of ancestors, so a tick costs O(changes x depth) instead of a rebuild.
+A node without children takes its own figures rather than the running sum, and no
+total drops below the node's own figures, so float error cannot build up into
+negative or leftover totals.
+
+Processes whose parent is unknown (or would form a cycle) sit at the top level; if
+their parent shows up later they are moved under it. Children of an exited process
+move to the top level until a later delta reports their new parent. A top-level
+node is listed in waiting under the parent PID it waits for only while it is in the
+tree, so PIDs that never come back do not accumulate.
+
+An optional listener is told about structural changes before and after they happen
+(begin_insert/end_insert/begin_remove/end_remove with the parent node, or None for
+the top level, and the child position; begin_reset/end_reset around a full resync),
+and about nodes whose totals changed, so a Qt model can keep views in sync. Each node
+knows its position among its siblings, so a model can map a node to an index in O(1).
+"""
+class ProcessTree:
+    def __init__(self, listener=None):
+        self.listener = listener
+        self.nodes = {}
+        self.roots = []
+        self.waiting = {}
+
+    def children_of(self, node):
+        return self.roots if node is None else node.children
+
+    def apply_delta(self, added, removed, changed, reset=False):
+        touched = set()
+        if reset:
+            listener = self.listener
+            if listener:
+                listener.begin_reset()
+            self.listener = None
+            self.nodes = {}
+            self.roots = []
+            self.waiting = {}
+            try:
+                self.apply_delta(added, [], [])
+            finally:
+                self.listener = listener
+            if listener:
+                listener.end_reset()
+            return set(self.nodes.values())
+        for pid in removed:
+            self.remove(pid, touched)
+        new_nodes = []
+        for row in added:
+            if row[0] in self.nodes:
+                continue
+            node = ProcessNode(row)
+            self.nodes[node.pid] = node
+            new_nodes.append(node)
+        for node in new_nodes:
+            self.attach(node, self.find_parent(node), touched)
+            for orphan_pid in self.waiting.pop(node.pid, ()):
+                orphan = self.nodes.get(orphan_pid)
+                if orphan is not None and orphan.waits == node.pid:
+                    orphan.waits = None
+                    if orphan.parent is None and orphan.row[PPID] == node.pid:
+                        self.move(orphan, node, touched)
+        for pid, fields in changed:
+            node = self.nodes.get(pid)
+            if node is None:
+                continue
+            row = node.row
+            old_threads, old_memory, old_cpu = row[THREADS] or 0, row[MEMORY] or 0.0, row[CPU] or 0.0
+            for column, value in fields.items():
+                row[column] = value
+            if PPID in fields:
+                self.move(node, self.find_parent(node), touched)
+            if THREADS in fields or MEMORY in fields or CPU in fields:
+                self.propagate(node, (row[THREADS] or 0) - old_threads, (row[MEMORY] or 0.0) - old_memory, (row[CPU] or 0.0) - old_cpu, touched)
+            touched.add(node)
+        touched = {node for node in touched if node.pid in self.nodes and self.nodes[node.pid] is node}
+        if self.listener:
+            self.listener.totals_changed(touched)
+        return touched
+
+    def find_parent(self, node):
+        parent = self.nodes.get(node.row[PPID])
+        ancestor = parent
+        while ancestor is not None:
+            if ancestor is node:
+                return None
+            ancestor = ancestor.parent
+        return parent
+
+    def propagate(self, node, threads, memory, cpu, touched):
+        while node is not None:
+            row = node.row
+            node.threads += threads
+            if node.children:
+                node.memory = max(node.memory + memory, row[MEMORY] or 0.0)
+                node.cpu = max(node.cpu + cpu, row[CPU] or 0.0)
+            else:
+                node.memory = row[MEMORY] or 0.0
+                node.cpu = row[CPU] or 0.0
+            touched.add(node)
+            node = node.parent
+
+    def wait(self, node):
+        self.unwait(node)
+        ppid = node.row[PPID]
+        if node.parent is None and ppid not in self.nodes:
+            node.waits = ppid
+            self.waiting.setdefault(ppid, set()).add(node.pid)
+
+    def unwait(self, node):
+        if node.waits is None:
+            return
+        waiting = self.waiting.get(node.waits)
+        if waiting is not None:
+            waiting.discard(node.pid)
+            if not waiting:
+                del self.waiting[node.waits]
+        node.waits = None
+
+    def attach(self, node, parent, touched):
+        siblings = self.children_of(parent)
+        if self.listener:
+            self.listener.begin_insert(parent, len(siblings))
+        node.position = len(siblings)
+        siblings.append(node)
+        node.parent = parent
+        if self.listener:
+            self.listener.end_insert()
+        self.wait(node)
+        self.propagate(parent, node.threads, node.memory, node.cpu, touched)
+
+    def detach(self, node, touched):
+        parent = node.parent
+        siblings = self.children_of(parent)
+        position = node.position
+        if self.listener:
+            self.listener.begin_remove(parent, position)
+        del siblings[position]
+        for sibling in siblings[position:]:
+            sibling.position -= 1
+        node.parent = None
+        self.unwait(node)
+        if self.listener:
+            self.listener.end_remove()
+        self.propagate(parent, -node.threads, -node.memory, -node.cpu, touched)
+
+    def move(self, node, parent, touched):
+        if node.parent is parent:
+            self.wait(node)
+            return
+        self.detach(node, touched)
+        self.attach(node, parent, touched)
+
+    def remove(self, pid, touched):
+        node = self.nodes.get(pid)
+        if node is None:
+            return
+        for child in list(node.children):
+            self.move(child, None, touched)
+        self.detach(node, touched)
+        del self.nodes[pid]
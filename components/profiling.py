@@ -0,0 +1,149 @@
+""" Import the necessary modules for this component to work """
+import sys
+import json
+import math
+import time
+import threading
+from array import array
+from contextlib import contextmanager
+
+
+
+""" Define the upper bounds of the histogram buckets, in seconds
+
+Four buckets per decade from 10µs to 10s, plus an overflow bucket.
+"""
+BUCKET_BOUNDS = [10 ** (exponent / 4) for exponent in range(-20, 5)]
+
+
+
+""" Define the class for a rolling histogram of durations
+
+Keeps the last `window` durations in a fixed ring, so percentiles and bucket counts
+always describe recent behaviour, plus lifetime totals for the call count and time.
+"""
+class RollingHistogram:
+    def __init__(self, window=512):
+        self.samples = array("d", bytes(8 * window))
+        self.window = window
+        self.head = 0
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, seconds):
+        self.samples[self.head] = seconds
+        self.head = (self.head + 1) % self.window
+        self.count += 1
+        self.total += seconds
+
+    def recent(self):
+        if self.count >= self.window:
+            return list(self.samples)
+        return list(self.samples[:self.head])
+
+    def summary(self):
+        recent = sorted(self.recent())
+        if not recent:
+            return {"count": self.count, "total": self.total}
+        def pick(fraction):
+            return recent[min(len(recent) - 1, int(fraction * len(recent)))]
+        buckets = [0] * (len(BUCKET_BOUNDS) + 1)
+        for seconds in recent:
+            index = 0 if seconds <= 0 else max(0, min(len(BUCKET_BOUNDS), math.ceil(math.log10(seconds) * 4) + 20))
+            buckets[index] += 1
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": sum(recent) / len(recent),
+            "p50": pick(0.50),
+            "p95": pick(0.95),
+            "p99": pick(0.99),
+            "max": recent[-1],
+            "buckets": buckets,
+        }
+
+
+
+""" Define the class for collecting timings of Resmon's own hot paths
+
+Timings are recorded by name, with a prefix for the area they belong to
+("collector/", "column/", "plugin/", "sysinfo/", "signal/", "gui/", "paint/").
+Recording is thread-safe and cheap enough to leave on permanently.
+"""
+class Profiler:
+    def __init__(self, window=512):
+        self.window = window
+        self.histograms = {}
+        self.lock = threading.Lock()
+        self.started = time.time()
+
+    def record(self, name, seconds):
+        with self.lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = RollingHistogram(self.window)
+            histogram.add(seconds)
+
+    @contextmanager
+    def measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - start)
+
+    def summary(self):
+        with self.lock:
+            return {name: histogram.summary() for name, histogram in sorted(self.histograms.items())}
+
+    def export_json(self, path, extra=None):
+        report = {
+            "started": self.started,
+            "exported": time.time(),
+            "bucket_bounds": BUCKET_BOUNDS,
+            "timings": self.summary(),
+        }
+        if extra:
+            report.update(extra)
+        with open(path, "w") as report_file:
+            json.dump(report, report_file, indent=2)
+
+
+
+""" Shared profiler instance used by the collectors and the GUI """
+PROFILER = Profiler()
+
+
+
+""" Define the class for timing Resmon's startup phases
+
+Marks are measured from a start time taken before the heavier imports, each only
+the first time it is reached, and recorded in the profiler under "startup/". With
+report set, every mark so far is printed to stderr, followed by a blank line, once
+all the expected ones are in.
+"""
+class StartupProfile:
+    def __init__(self, started, expected=(), report=False, profiler=PROFILER):
+        self.started = started
+        self.expected = set(expected)
+        self.report = report
+        self.profiler = profiler
+        self.marks = {}
+
+    def mark(self, name):
+        if name in self.marks:
+            return
+        elapsed = time.perf_counter() - self.started
+        self.marks[name] = elapsed
+        self.profiler.record(f"startup/{name}", elapsed)
+        if self.report and self.expected <= self.marks.keys():
+            self.report = False
+            print(self.format(), end="\n\n", file=sys.stderr, flush=True)
+
+    def format(self):
+        lines = [f"{'startup phase':<20} {'ms':>8} {'+ms':>8}"]
+        previous = 0.0
+        for name, elapsed in sorted(self.marks.items(), key=lambda item: item[1]):
+            lines.append(f"{name:<20} {elapsed * 1000:>8.1f} {(elapsed - previous) * 1000:>8.1f}")
+            previous = elapsed
+        return "\n".join(lines)
@@ -0,0 +1,109 @@
+""" Import the necessary modules for this component to work """
+import re
+import operator
+
+
+
+""" Define the numeric fields a query can compare, keyed by name, as process row columns """
+NUMERIC_FIELDS = {"pid": 0, "threads": 2, "mem": 4, "memory": 4, "cpu": 5, "ppid": 6}
+
+""" Define the size suffixes accepted for memory, as multipliers to the row's MB figure """
+MEMORY_UNITS = {"b": 1 / (1024 * 1024), "k": 1 / 1024, "kb": 1 / 1024, "m": 1, "mb": 1, "g": 1024, "gb": 1024, "t": 1024 * 1024, "tb": 1024 * 1024}
+
+""" Define the comparison operators a numeric term may use """
+COMPARISONS = {">": operator.gt, ">=": operator.ge, "<": operator.lt, "<=": operator.le, "=": operator.eq, "==": operator.eq, "!=": operator.ne}
+
+""" Define the pattern splitting a query into terms, keeping double-quoted text together """
+TOKEN_PATTERN = re.compile(r'(?:[^\s"]|"[^"]*")+')
+
+""" Define the pattern of a numeric term: field, operator, number and optional unit """
+NUMERIC_PATTERN = re.compile(r"([a-z]+)(>=|<=|==|!=|>|<|=)(\d+(?:\.\d*)?|\.\d+)([a-z]*)$")
+
+
+
+""" Utility function for building a name or user test from a substring or a /regex/ """
+def text_test(pattern, field):
+    if len(pattern) >= 2 and pattern.startswith("/") and pattern.endswith("/"):
+        try:
+            search = re.compile(pattern[1:-1], re.IGNORECASE).search
+        except re.error as e:
+            raise ValueError(f"Invalid regular expression {pattern}: {e}")
+        if field == "user":
+            return lambda row, name, user: search(user) is not None
+        return lambda row, name, user: search(name) is not None
+    needle = pattern.lower()
+    if field == "user":
+        return lambda row, name, user: needle in user
+    return lambda row, name, user: needle in name
+
+
+
+""" Utility function for building a numeric comparison such as cpu>5 or mem>=1.5GB """
+def numeric_test(match):
+    field, symbol, number, unit = match.groups()
+    if field not in NUMERIC_FIELDS:
+        raise ValueError(f"Unknown field '{field}'")
+    column = NUMERIC_FIELDS[field]
+    if unit and column != 4:
+        raise ValueError(f"'{field}' does not take a unit")
+    if unit and unit not in MEMORY_UNITS:
+        raise ValueError(f"Unknown size unit '{unit}'")
+    limit = float(number) * MEMORY_UNITS[unit or "mb"] if column == 4 else float(number)
+    compare = COMPARISONS[symbol]
+    return lambda row, name, user: row[column] is not None and compare(row[column], limit)
+
+
+
+""" Define the class for a compiled process filter query
+
+A query is a space-separated list of terms that must all hold:
+
+    firefox             name contains "firefox" (case-insensitive)
+    /^kworker/          name matches a regular expression
+    name:foo, name:/re/ the same, spelled out
+    user:root, user:/re/ the owning user contains or matches
+    cpu>5 mem>500MB     numeric comparisons on cpu, mem, threads, pid and ppid
+                        with >, >=, <, <=, = and !=; memory defaults to MB
+
+Double quotes keep spaces inside a term. Terms test a process row together with its
+lowercase name and user, which callers keep precomputed, and select() applies one
+term at a time over a list of PIDs so each pass is a single tight comprehension.
+Malformed queries raise ValueError when compiled.
+"""
+class ProcessQuery:
+    def __init__(self, text):
+        self.text = text.strip()
+        self.terms = []
+        self.columns = set()
+        for token in TOKEN_PATTERN.findall(self.text):
+            token = token.replace('"', "")
+            if not token:
+                continue
+            lowered = token.lower()
+            numeric = NUMERIC_PATTERN.match(lowered)
+            if numeric:
+                self.terms.append(numeric_test(numeric))
+                self.columns.add(NUMERIC_FIELDS.get(numeric.group(1)))
+            elif lowered.startswith("user:"):
+                self.terms.append(text_test(token[5:], "user"))
+                self.columns.add(3)
+            elif lowered.startswith("name:"):
+                self.terms.append(text_test(token[5:], "name"))
+                self.columns.add(1)
+            else:
+                self.terms.append(text_test(token, "name"))
+                self.columns.add(1)
+
+    def __bool__(self):
+        return bool(self.terms)
+
+    def matches(self, row, name, user):
+        for term in self.terms:
+            if not term(row, name, user):
+                return False
+        return True
+
+    def select(self, pids, rows, names, users):
+        for term in self.terms:
+            pids = [pid for pid in pids if term(rows[pid], names[pid], users[pid])]
+        return pids
@@ -0,0 +1,510 @@
+""" Import the necessary modules for this component to work """
+import json
+import time
+import zlib
+import struct
+import bisect
+import threading
+
+from components.snapshot import SnapshotDiffer
+from components.profiling import PROFILER
+
+
+
+""" Define the on-disk layout of a recording
+
+A recording is the magic string followed by self-contained chunks, each behind an
+uncompressed header of (payload length, flags, event count, first and last event
+time), so a reader can index a file by skipping from header to header and a crash
+loses at most the chunk that was still open.
+"""
+MAGIC = b"RMREC001"
+CHUNK_HEADER = struct.Struct("<IBIdd")
+FLAG_ZLIB = 1
+
+""" Event kinds, in the order of the Sampler events they record """
+EVENT_STATS, EVENT_PROCESSES, EVENT_DRIVES, EVENT_IO = range(4)
+
+""" Fixed-point scales for the numeric columns """
+PERCENT_SCALE = 100
+MEMORY_SCALE = 1024
+
+
+
+""" Utility function for appending an unsigned LEB128 varint """
+def write_varint(out, value):
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+
+""" Utility function for appending a signed value as a zigzag varint """
+def write_signed(out, value):
+    write_varint(out, value * 2 if value >= 0 else -value * 2 - 1)
+
+
+
+""" Define the class for reading varints and strings back out of a chunk payload """
+class ChunkReader:
+    def __init__(self, data):
+        self.data = data
+        self.position = 0
+
+    def varint(self):
+        data = self.data
+        position = self.position
+        byte = data[position]
+        position += 1
+        value = byte & 0x7F
+        shift = 7
+        while byte & 0x80:
+            byte = data[position]
+            position += 1
+            value |= (byte & 0x7F) << shift
+            shift += 7
+        self.position = position
+        return value
+
+    def signed(self):
+        value = self.varint()
+        return value >> 1 if not value & 1 else -(value >> 1) - 1
+
+    def blob(self):
+        length = self.varint()
+        start = self.position
+        self.position += length
+        return bytes(self.data[start:self.position])
+
+
+
+""" Define the class for a per-chunk string dictionary
+
+The first use of a string writes the next free id followed by the string itself;
+later uses write only the id. Readers rebuild the same table as they go, so each
+chunk decodes on its own.
+"""
+class StringDictionary:
+    def __init__(self):
+        self.ids = {}
+        self.strings = []
+
+    def write(self, out, string):
+        string = string or ""
+        string_id = self.ids.get(string)
+        if string_id is not None:
+            write_varint(out, string_id)
+            return
+        string_id = len(self.strings)
+        self.ids[string] = string_id
+        self.strings.append(string)
+        write_varint(out, string_id)
+        encoded = string.encode()
+        write_varint(out, len(encoded))
+        out += encoded
+
+    def read(self, reader):
+        string_id = reader.varint()
+        if string_id == len(self.strings):
+            self.strings.append(reader.blob().decode(errors="replace"))
+        return self.strings[string_id]
+
+
+
+""" Define the class for encoding one chunk of events column by column
+
+Event kinds and times form the first two columns. Process snapshots are sorted by
+PID and stored as one column per field: PIDs as gaps to the previous PID, names
+and users as dictionary ids, and threads, memory (KB), CPU (0.01%) and parent PID
+as the change from the same PID's previous snapshot in the chunk, so a steady
+process costs a handful of zero bytes. CPU and memory samples are stored the same
+way against the previous sample. Drive and throughput reports are small and
+irregular and go in as compact JSON.
+"""
+class ChunkEncoder:
+    def __init__(self):
+        self.kinds = bytearray()
+        self.times = bytearray()
+        self.body = bytearray()
+        self.strings = StringDictionary()
+        self.count = 0
+        self.first_time = None
+        self.last_time = None
+        self.last_millis = 0
+        self.previous_stats = None
+        self.previous_processes = {}
+
+    def add(self, timestamp, kind, data):
+        millis = round(timestamp * 1000)
+        if self.first_time is None:
+            self.first_time = timestamp
+            self.last_millis = millis
+        write_varint(self.times, max(0, millis - self.last_millis))
+        self.last_millis = max(millis, self.last_millis)
+        self.last_time = timestamp
+        self.kinds.append(kind)
+        self.count += 1
+        if kind == EVENT_STATS:
+            self.add_stats(*data)
+        elif kind == EVENT_PROCESSES:
+            self.add_processes(data)
+        else:
+            encoded = json.dumps(data, separators=(",", ":")).encode()
+            write_varint(self.body, len(encoded))
+            self.body += encoded
+
+    def add_stats(self, cpu_usage, cpu_core_usages, memory_percent, disk_display):
+        body = self.body
+        values = [round(cpu_usage * PERCENT_SCALE), round(memory_percent * PERCENT_SCALE)]
+        values += [round(usage * PERCENT_SCALE) for usage in cpu_core_usages]
+        previous = self.previous_stats
+        if previous is None or len(previous) != len(values):
+            previous = [0] * len(values)
+        write_varint(body, len(cpu_core_usages))
+        for value, old in zip(values, previous):
+            write_signed(body, value - old)
+        self.strings.write(body, disk_display)
+        self.previous_stats = values
+
+    def add_processes(self, processes_info):
+        body = self.body
+        strings = self.strings
+        rows = sorted(processes_info, key=lambda process: process[0])
+        previous = self.previous_processes
+        current = {}
+        write_varint(body, len(rows))
+        last_pid = 0
+        for process in rows:
+            write_varint(body, process[0] - last_pid)
+            last_pid = process[0]
+        for process in rows:
+            strings.write(body, process[1])
+        for process in rows:
+            strings.write(body, process[3])
+        encoded = []
+        for process in rows:
+            values = (process[2] or 0, round((process[4] or 0.0) * MEMORY_SCALE), round((process[5] or 0.0) * PERCENT_SCALE), process[6] or 0)
+            current[process[0]] = values
+            encoded.append((values, previous.get(process[0], (0, 0, 0, 0))))
+        for column in range(4):
+            for values, old in encoded:
+                write_signed(body, values[column] - old[column])
+        self.previous_processes = current
+
+    def payload(self):
+        out = bytearray()
+        write_varint(out, self.count)
+        out += self.kinds
+        out += self.times
+        out += self.body
+        return bytes(out)
+
+
+
+""" Utility function for decoding a chunk payload into (time, kind, data) events """
+def decode_chunk(payload, first_time):
+    reader = ChunkReader(memoryview(payload))
+    count = reader.varint()
+    kinds = bytes(reader.data[reader.position:reader.position + count])
+    reader.position += count
+    times = []
+    millis = round(first_time * 1000)
+    for _ in range(count):
+        millis += reader.varint()
+        times.append(millis / 1000)
+    times[0] = first_time
+    strings = StringDictionary()
+    previous_stats = None
+    previous_processes = {}
+    events = []
+    for timestamp, kind in zip(times, kinds):
+        if kind == EVENT_STATS:
+            cores = reader.varint()
+            if previous_stats is None or len(previous_stats) != cores + 2:
+                previous_stats = [0] * (cores + 2)
+            values = [old + reader.signed() for old in previous_stats]
+            previous_stats = values
+            disk_display = strings.read(reader)
+            data = (values[0] / PERCENT_SCALE, [value / PERCENT_SCALE for value in values[2:]], values[1] / PERCENT_SCALE, disk_display)
+        elif kind == EVENT_PROCESSES:
+            size = reader.varint()
+            pids = []
+            pid = 0
+            for _ in range(size):
+                pid += reader.varint()
+                pids.append(pid)
+            names = [strings.read(reader) for _ in range(size)]
+            users = [strings.read(reader) or None for _ in range(size)]
+            olds = [previous_processes.get(pid, (0, 0, 0, 0)) for pid in pids]
+            columns = [[old[column] + reader.signed() for old in olds] for column in range(4)]
+            current = {}
+            data = []
+            for index, pid in enumerate(pids):
+                values = (columns[0][index], columns[1][index], columns[2][index], columns[3][index])
+                current[pid] = values
+                data.append([pid, names[index], values[0], users[index], values[1] / MEMORY_SCALE, values[2] / PERCENT_SCALE, values[3]])
+            previous_processes = current
+        else:
+            data = json.loads(reader.blob())
+            if kind == EVENT_DRIVES:
+                data = [tuple(drive) for drive in data]
+            else:
+                data = tuple({name: tuple(rates) for name, rates in group.items()} for group in data)
+        events.append((timestamp, kind, data))
+    return events
+
+
+
+""" Define the class for recording a Sampler's output to an append-only file
+
+attach() subscribes to the Sampler's cpu, snapshot, drives and io events. Events
+are buffered into a chunk that is encoded and appended once it spans
+chunk_seconds, and on close(); chunks are zlib-compressed unless compress is False.
+Appending to an existing recording continues it.
+"""
+class SessionRecorder:
+    def __init__(self, path, compress=True, chunk_seconds=30.0):
+        self.compress = compress
+        self.chunk_seconds = chunk_seconds
+        self.lock = threading.Lock()
+        self.file = open(path, "ab")
+        if self.file.tell() == 0:
+            self.file.write(MAGIC)
+        else:
+            with open(path, "rb") as existing:
+                if existing.read(len(MAGIC)) != MAGIC:
+                    self.file.close()
+                    raise ValueError(f"{path} is not a Resmon recording")
+        self.encoder = ChunkEncoder()
+        self.sampler = None
+
+    def attach(self, sampler):
+        self.sampler = sampler
+        sampler.connect("cpu", self.on_cpu)
+        sampler.connect("snapshot", lambda processes_info: self.add(EVENT_PROCESSES, processes_info))
+        sampler.connect("drives", lambda drives: self.add(EVENT_DRIVES, drives))
+        sampler.connect("io", lambda disk_rates, nic_rates: self.add(EVENT_IO, (disk_rates, nic_rates)))
+
+    def on_cpu(self, cpu_usage, cpu_core_usages, memory_percent):
+        self.add(EVENT_STATS, (cpu_usage, cpu_core_usages, memory_percent, self.sampler.disk_display))
+
+    def add(self, kind, data):
+        with self.lock:
+            if self.file is None:
+                return
+            timestamp = time.time()
+            encoder = self.encoder
+            if encoder.count and timestamp - encoder.first_time >= self.chunk_seconds:
+                self.write_chunk()
+                encoder = self.encoder
+            encoder.add(timestamp, kind, data)
+
+    def write_chunk(self):
+        encoder = self.encoder
+        self.encoder = ChunkEncoder()
+        if not encoder.count:
+            return
+        with PROFILER.measure("record/chunk"):
+            payload = encoder.payload()
+            flags = 0
+            if self.compress:
+                payload = zlib.compress(payload, 6)
+                flags |= FLAG_ZLIB
+            self.file.write(CHUNK_HEADER.pack(len(payload), flags, encoder.count, encoder.first_time, encoder.last_time))
+            self.file.write(payload)
+            self.file.flush()
+
+    def close(self):
+        with self.lock:
+            if self.file is None:
+                return
+            self.write_chunk()
+            self.file.close()
+            self.file = None
+
+
+
+""" Define the class for random access to the chunks of a recording """
+class SessionReader:
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        if self.file.read(len(MAGIC)) != MAGIC:
+            self.file.close()
+            raise ValueError(f"{path} is not a Resmon recording")
+        self.chunks = []
+        size = self.file.seek(0, 2)
+        offset = len(MAGIC)
+        while offset + CHUNK_HEADER.size <= size:
+            self.file.seek(offset)
+            length, flags, count, first_time, last_time = CHUNK_HEADER.unpack(self.file.read(CHUNK_HEADER.size))
+            offset += CHUNK_HEADER.size
+            if offset + length > size:
+                break
+            self.chunks.append((offset, length, flags, count, first_time, last_time))
+            offset += length
+        self.first_times = [chunk[4] for chunk in self.chunks]
+
+    @property
+    def start_time(self):
+        return self.chunks[0][4] if self.chunks else 0.0
+
+    @property
+    def end_time(self):
+        return self.chunks[-1][5] if self.chunks else 0.0
+
+    def chunk_at(self, timestamp):
+        return max(0, bisect.bisect_right(self.first_times, timestamp) - 1)
+
+    def events(self, index):
+        offset, length, flags, count, first_time, last_time = self.chunks[index]
+        self.file.seek(offset)
+        payload = self.file.read(length)
+        if flags & FLAG_ZLIB:
+            payload = zlib.decompress(payload)
+        return decode_chunk(payload, first_time)
+
+    def close(self):
+        self.file.close()
+
+
+
+""" Define the class for playing a recording back through the Sampler's interface
+
+The player emits the same events as a live Sampler (cpu, drives, io, snapshot and
+processes deltas from its own SnapshotDiffer, plus "position" with the time of each
+CPU sample), so anything built on a Sampler can be driven from a file. Events are
+paced by their recorded times divided by the speed; a speed of 0 plays as fast as
+possible, which makes replays deterministic for tests. seek(), set_speed() and
+set_playing() may be called from any thread. At the end of the recording the
+player waits for a seek or stop().
+"""
+class SessionPlayer:
+    def __init__(self, path, speed=1.0):
+        self.reader = SessionReader(path)
+        self.listeners = {}
+        self.differ = SnapshotDiffer()
+        self.disk_display = "0%"
+        self.condition = threading.Condition()
+        self.speed = speed
+        self.playing = True
+        self.stopped = False
+        self.seek_to = self.reader.start_time
+        self.paused = set()
+        self.resync_requested = True
+        self.finished = False
+
+    def connect(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+
+    def emit(self, event, *args):
+        for callback in self.listeners.get(event, ()):
+            callback(*args)
+
+    def request_resync(self):
+        self.resync_requested = True
+
+    def set_paused(self, name, paused):
+        if paused:
+            self.paused.add(name)
+        else:
+            self.paused.discard(name)
+
+    def set_slowdown(self, name, factor):
+        pass
+
+    def set_backoff(self, scale):
+        pass
+
+    def seek(self, timestamp):
+        with self.condition:
+            self.seek_to = timestamp
+            self.condition.notify_all()
+
+    def set_speed(self, speed):
+        with self.condition:
+            self.speed = speed
+            self.condition.notify_all()
+
+    def set_playing(self, playing):
+        with self.condition:
+            self.playing = playing
+            self.condition.notify_all()
+
+    def stop(self):
+        with self.condition:
+            self.stopped = True
+            self.condition.notify_all()
+
+    def deliver(self, kind, data):
+        if kind == EVENT_STATS:
+            cpu_usage, cpu_core_usages, memory_percent, self.disk_display = data
+            self.emit("cpu", cpu_usage, cpu_core_usages, memory_percent)
+        elif kind == EVENT_PROCESSES:
+            if "processes" in self.paused:
+                return
+            self.emit("snapshot", data)
+            added, removed, changed = self.differ.diff(data)
+            if self.resync_requested:
+                self.resync_requested = False
+                self.emit("processes", self.differ.snapshot(), [], [], True)
+            elif added or removed or changed:
+                self.emit("processes", added, removed, changed, False)
+        elif kind == EVENT_DRIVES:
+            self.emit("drives", data)
+        elif kind == EVENT_IO:
+            self.emit("io", *data)
+
+    def jump(self, timestamp):
+        index = self.reader.chunk_at(timestamp)
+        events = self.reader.events(index) if self.reader.chunks else []
+        latest = {}
+        position = 0
+        while position < len(events) and events[position][0] <= timestamp:
+            latest[events[position][1]] = events[position]
+            position += 1
+        self.differ = SnapshotDiffer()
+        self.resync_requested = True
+        self.finished = False
+        for event_time, kind, data in sorted(latest.values(), key=lambda event: event[0]):
+            self.deliver(kind, data)
+        self.emit("position", timestamp)
+        return index, events, position
+
+    def run(self):
+        index, events, position = -1, [], 0
+        anchor = None
+        while True:
+            with self.condition:
+                while not self.stopped and self.seek_to is None and (not self.playing or self.finished):
+                    self.condition.wait()
+                    anchor = None
+                if self.stopped:
+                    break
+                seek_to, self.seek_to = self.seek_to, None
+                speed = self.speed
+            if seek_to is not None:
+                index, events, position = self.jump(seek_to)
+                anchor = None
+                continue
+            if position >= len(events):
+                if index + 1 >= len(self.reader.chunks):
+                    self.finished = True
+                    continue
+                index += 1
+                events, position = self.reader.events(index), 0
+                continue
+            event_time, kind, data = events[position]
+            if anchor is None or anchor[2] != speed:
+                anchor = (time.monotonic(), event_time, speed)
+            if speed > 0:
+                delay = anchor[0] + (event_time - anchor[1]) / speed - time.monotonic()
+                if delay > 0:
+                    with self.condition:
+                        self.condition.wait(delay)
+                    continue
+            position += 1
+            self.deliver(kind, data)
+            if kind == EVENT_STATS:
+                self.emit("position", event_time)
+        self.reader.close()
@@ -0,0 +1,674 @@
+""" Agent mode and the multi-host client
+
+An agent runs the Sampler without a GUI and streams its output to any number of
+clients over TCP or a Unix socket. The protocol has no authentication and carries
+every process's name and user, so an agent listens on loopback by default:
+
+    python resmon.py --agent                      (127.0.0.1:7373)
+    python resmon.py --agent --listen unix:/run/resmon.sock
+
+Remote agents are reached through an SSH tunnel to that loopback port, and the GUI
+watches several agents at once:
+
+    ssh -N -L 7374:127.0.0.1:7373 web1
+    python resmon.py --connect 127.0.0.1:7374 unix:/run/resmon.sock
+"""
+import os
+import sys
+import json
+import time
+import errno
+import socket
+import struct
+import argparse
+import platform
+import selectors
+import threading
+import psutil
+
+from components.sampler import Sampler
+from components.recording import write_varint, ChunkReader
+
+
+
+""" Define the wire format
+
+Every message is a frame of (payload length, message type) followed by the payload.
+Integers are LEB128 varints, percentages are sent in hundredths and memory in KB,
+strings are a varint length and UTF-8 bytes. Process updates are the Sampler's
+deltas: new rows, exited PIDs as gaps between sorted PIDs, and for changed rows a
+bit mask of the columns that follow, so an idle process costs nothing and a busy one
+a few bytes. The first frame an agent sends is always MSG_HELLO, whose JSON payload
+carries PROTOCOL_VERSION; a client drops an agent that speaks another version, or
+that sends anything before its hello, rather than misreading its frames.
+"""
+FRAME = struct.Struct("<IB")
+MSG_HELLO, MSG_STATS, MSG_PROCESSES, MSG_DRIVES, MSG_IO = range(5)
+PROTOCOL_VERSION = 1
+DEFAULT_PORT = 7373
+
+""" Pending output above which a client that is not reading is disconnected """
+MAX_CLIENT_BUFFER = 16 * 1024 * 1024
+
+""" Seconds between reconnection attempts to an agent, doubling up to the maximum """
+RECONNECT_DELAY = 1.0
+MAX_RECONNECT_DELAY = 30.0
+
+""" Seconds between host summaries sent to the overview """
+SUMMARY_INTERVAL = 1.0
+
+
+
+""" Utility function for appending a length-prefixed UTF-8 string """
+def write_string(out, string):
+    encoded = (string or "").encode()
+    write_varint(out, len(encoded))
+    out += encoded
+
+
+
+""" Utility function for building a frame """
+def frame(message_type, payload):
+    return FRAME.pack(len(payload), message_type) + payload
+
+
+
+""" Utility function for encoding one column of a process row """
+def write_column(out, column, value):
+    if column in (1, 3):
+        write_string(out, value)
+    elif column == 4:
+        write_varint(out, round((value or 0.0) * 1024))
+    elif column == 5:
+        write_varint(out, round((value or 0.0) * 100))
+    else:
+        write_varint(out, value or 0)
+
+
+
+""" Utility function for decoding one column of a process row """
+def read_column(reader, column):
+    if column == 1:
+        return reader.blob().decode(errors="replace")
+    if column == 3:
+        return reader.blob().decode(errors="replace") or None
+    if column == 4:
+        return reader.varint() / 1024
+    if column == 5:
+        return reader.varint() / 100
+    return reader.varint()
+
+
+
+""" Utility function for encoding a process delta """
+def encode_processes(added, removed, changed, reset):
+    out = bytearray()
+    out.append(1 if reset else 0)
+    write_varint(out, len(added))
+    for process in added:
+        for column in range(7):
+            write_column(out, column, process[column])
+    write_varint(out, len(removed))
+    last_pid = 0
+    for pid in sorted(removed):
+        write_varint(out, pid - last_pid)
+        last_pid = pid
+    write_varint(out, len(changed))
+    for pid, fields in changed:
+        write_varint(out, pid)
+        mask = 0
+        for column in fields:
+            mask |= 1 << column
+        out.append(mask)
+        for column in sorted(fields):
+            write_column(out, column, fields[column])
+    return bytes(out)
+
+
+
+""" Utility function for decoding a process delta """
+def decode_processes(reader):
+    reset = bool(reader.data[reader.position])
+    reader.position += 1
+    added = [[read_column(reader, column) for column in range(7)] for _ in range(reader.varint())]
+    removed = []
+    pid = 0
+    for _ in range(reader.varint()):
+        pid += reader.varint()
+        removed.append(pid)
+    changed = []
+    for _ in range(reader.varint()):
+        pid = reader.varint()
+        mask = reader.data[reader.position]
+        reader.position += 1
+        changed.append((pid, {column: read_column(reader, column) for column in range(1, 7) if mask & (1 << column)}))
+    return added, removed, changed, reset
+
+
+
+""" Utility function for encoding a CPU and memory sample """
+def encode_stats(cpu_usage, cpu_core_usages, memory_percent, disk_display):
+    out = bytearray()
+    write_varint(out, round(cpu_usage * 100))
+    write_varint(out, round(memory_percent * 100))
+    write_varint(out, len(cpu_core_usages))
+    for usage in cpu_core_usages:
+        write_varint(out, round(usage * 100))
+    write_string(out, disk_display)
+    return bytes(out)
+
+
+
+""" Utility function for decoding a CPU and memory sample """
+def decode_stats(reader):
+    cpu_usage = reader.varint() / 100
+    memory_percent = reader.varint() / 100
+    cpu_core_usages = [reader.varint() / 100 for _ in range(reader.varint())]
+    return cpu_usage, cpu_core_usages, memory_percent, reader.blob().decode(errors="replace")
+
+
+
+""" Utility function for parsing host:port, [ipv6]:port or unix:/path """
+def parse_address(address):
+    if address.startswith("unix:"):
+        return socket.AF_UNIX, address[5:]
+    host, _, port = address.rpartition(":")
+    if not host:
+        host, port = port, DEFAULT_PORT
+    host = host.strip("[]")
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    return family, (host, int(port))
+
+
+
+""" Define the class for one connected client of an agent """
+class AgentClient:
+    __slots__ = ("sock", "output", "ready")
+
+    def __init__(self, sock):
+        self.sock = sock
+        self.output = bytearray()
+        self.ready = False
+
+
+
+""" Define the class for serving a Sampler's output to any number of clients
+
+Every Sampler event is encoded once and the same bytes are queued for every client,
+so an extra client only costs a buffer append and its share of the socket writes.
+A new client is sent a hello, the latest CPU, drive and throughput reports, and is
+held back from process deltas until the next full snapshot, which the server asks
+the Sampler for. The process walk is paused while nobody is connected. Sockets are
+served by a selector loop on its own thread; the sampling thread wakes it through a
+socket pair when there is output to send.
+"""
+class AgentServer:
+    def __init__(self, sampler, address):
+        self.sampler = sampler
+        self.family, self.address = parse_address(address)
+        self.listener = socket.socket(self.family, socket.SOCK_STREAM)
+        if self.family == socket.AF_UNIX:
+            try:
+                os.unlink(self.address)
+            except FileNotFoundError:
+                pass
+        else:
+            self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(self.address)
+        self.listener.listen(16)
+        self.listener.setblocking(False)
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.listener, selectors.EVENT_READ)
+        self.wakeup_reader, self.wakeup_writer = socket.socketpair()
+        self.wakeup_reader.setblocking(False)
+        self.wakeup_writer.setblocking(False)
+        self.selector.register(self.wakeup_reader, selectors.EVENT_READ)
+        self.clients = {}
+        self.lock = threading.Lock()
+        self.latest = {}
+        self.running = False
+        hello = {"version": PROTOCOL_VERSION, "host": platform.node(), "cores": psutil.cpu_count(logical=True), "memory": psutil.virtual_memory().total}
+        self.hello = frame(MSG_HELLO, json.dumps(hello).encode())
+        sampler.set_paused("processes", True)
+        sampler.connect("cpu", self.on_cpu)
+        sampler.connect("processes", self.on_processes)
+        sampler.connect("drives", lambda drives: self.publish(MSG_DRIVES, json.dumps(drives).encode()))
+        sampler.connect("io", lambda disk_rates, nic_rates: self.publish(MSG_IO, json.dumps([disk_rates, nic_rates]).encode()))
+
+    @property
+    def bound_address(self):
+        return self.listener.getsockname()
+
+    def on_cpu(self, cpu_usage, cpu_core_usages, memory_percent):
+        self.publish(MSG_STATS, encode_stats(cpu_usage, cpu_core_usages, memory_percent, self.sampler.disk_display))
+
+    def on_processes(self, added, removed, changed, reset):
+        data = frame(MSG_PROCESSES, encode_processes(added, removed, changed, reset))
+        with self.lock:
+            for client in self.clients.values():
+                if reset:
+                    client.ready = True
+                if client.ready:
+                    client.output += data
+        self.wake()
+
+    def publish(self, message_type, payload):
+        data = frame(message_type, payload)
+        with self.lock:
+            self.latest[message_type] = data
+            for client in self.clients.values():
+                client.output += data
+        self.wake()
+
+    def wake(self):
+        try:
+            self.wakeup_writer.send(b"\0")
+        except (BlockingIOError, OSError):
+            pass
+
+    def accept(self):
+        try:
+            sock, _ = self.listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        sock.setblocking(False)
+        if self.family != socket.AF_UNIX:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        client = AgentClient(sock)
+        with self.lock:
+            client.output += self.hello
+            for message_type in (MSG_STATS, MSG_DRIVES, MSG_IO):
+                if message_type in self.latest:
+                    client.output += self.latest[message_type]
+            first = not self.clients
+            self.clients[sock] = client
+        self.selector.register(sock, selectors.EVENT_READ | selectors.EVENT_WRITE, client)
+        self.sampler.request_resync()
+        if first:
+            self.sampler.set_paused("processes", False)
+
+    def drop(self, client):
+        with self.lock:
+            self.clients.pop(client.sock, None)
+            last = not self.clients
+        self.selector.unregister(client.sock)
+        client.sock.close()
+        if last:
+            self.sampler.set_paused("processes", True)
+
+    def flush(self, client):
+        with self.lock:
+            if not client.output:
+                return True
+            try:
+                sent = client.sock.send(client.output)
+            except (BlockingIOError, InterruptedError):
+                return False
+            del client.output[:sent]
+            return not client.output
+
+    def serve(self):
+        self.running = True
+        while self.running:
+            for key, events in self.selector.select(timeout=1.0):
+                if key.fileobj is self.listener:
+                    self.accept()
+                    continue
+                if key.fileobj is self.wakeup_reader:
+                    try:
+                        self.wakeup_reader.recv(4096)
+                    except BlockingIOError:
+                        pass
+                    continue
+                client = key.data
+                if client.sock not in self.clients:
+                    continue
+                try:
+                    if events & selectors.EVENT_READ and not client.sock.recv(4096):
+                        self.drop(client)
+                        continue
+                    if events & selectors.EVENT_WRITE and self.flush(client):
+                        self.selector.modify(client.sock, selectors.EVENT_READ, client)
+                except (BlockingIOError, InterruptedError):
+                    continue
+                except OSError:
+                    self.drop(client)
+            for client in list(self.clients.values()):
+                if len(client.output) > MAX_CLIENT_BUFFER:
+                    self.drop(client)
+                elif client.output:
+                    self.selector.modify(client.sock, selectors.EVENT_READ | selectors.EVENT_WRITE, client)
+
+    def start(self):
+        thread = threading.Thread(target=self.serve, name="resmon-agent", daemon=True)
+        thread.start()
+        return thread
+
+    def stop(self):
+        self.running = False
+        self.wake()
+
+    def close(self):
+        self.stop()
+        for client in list(self.clients.values()):
+            client.sock.close()
+        self.listener.close()
+        if self.family == socket.AF_UNIX:
+            try:
+                os.unlink(self.address)
+            except OSError:
+                pass
+
+
+
+""" Define the class for the state of one agent as seen by the client """
+class RemoteHost:
+    def __init__(self, address):
+        self.address = address
+        self.family, self.target = parse_address(address)
+        self.name = address
+        self.cores = 0
+        self.memory_total = 0
+        self.version = None
+        self.sock = None
+        self.connected = False
+        self.status = "Connecting"
+        self.input = bytearray()
+        self.retry_at = 0.0
+        self.retry_delay = RECONNECT_DELAY
+        self.processes = {}
+        self.stats = None
+        self.drives = None
+        self.io = None
+
+    def summary(self):
+        cpu_usage, cpu_core_usages, memory_percent, disk_display = self.stats or (0.0, [], 0.0, "")
+        top = max(self.processes.values(), key=lambda process: process[5], default=None)
+        return {
+            "address": self.address, "name": self.name, "status": self.status, "cores": self.cores,
+            "memory_total": self.memory_total, "cpu": cpu_usage, "memory": memory_percent, "disk": disk_display,
+            "processes": len(self.processes), "top": f"{top[1]} ({top[5]:.1f}%)" if top else "",
+        }
+
+
+
+""" Define the class for watching several agents from one thread
+
+RemoteHosts talks to every agent over non-blocking sockets on a single selector
+loop and keeps each host's process table up to date from its deltas, so the cost of
+another host is its share of the network traffic and its own deltas. It offers the
+same connect/run interface as a Sampler: the events of the selected host are
+emitted as the usual cpu, processes, drives and io events (with a full snapshot
+whenever the selection changes or the process view resumes), and a "hosts" event
+carries a summary of every host once a second for the overview. Connections that
+fail or drop are retried with backoff. select(), set_paused() and request_resync()
+may be called from any thread.
+"""
+class RemoteHosts:
+    def __init__(self, addresses):
+        self.hosts = {address: RemoteHost(address) for address in addresses}
+        self.order = list(addresses)
+        self.selected = self.order[0] if self.order else None
+        self.listeners = {}
+        self.selector = selectors.DefaultSelector()
+        self.wakeup_reader, self.wakeup_writer = socket.socketpair()
+        self.wakeup_reader.setblocking(False)
+        self.selector.register(self.wakeup_reader, selectors.EVENT_READ)
+        self.requests = []
+        self.lock = threading.Lock()
+        self.paused = set()
+        self.running = False
+        self.disk_display = "0%"
+
+    def connect(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+
+    def emit(self, event, *args):
+        for callback in self.listeners.get(event, ()):
+            callback(*args)
+
+    def post(self, func):
+        with self.lock:
+            self.requests.append(func)
+        try:
+            self.wakeup_writer.send(b"\0")
+        except OSError:
+            pass
+
+    def select(self, address):
+        self.post(lambda: self.apply_selection(address))
+
+    def request_resync(self):
+        self.post(self.resync)
+
+    def set_paused(self, name, paused):
+        def apply():
+            was_paused = name in self.paused
+            if paused:
+                self.paused.add(name)
+            else:
+                self.paused.discard(name)
+                if was_paused and name == "processes":
+                    self.resync()
+        self.post(apply)
+
+    def set_slowdown(self, name, factor):
+        pass
+
+    def set_backoff(self, scale):
+        pass
+
+    def apply_selection(self, address):
+        if address not in self.hosts or address == self.selected:
+            return
+        self.selected = address
+        host = self.hosts[address]
+        if host.stats:
+            self.disk_display = host.stats[3]
+            self.emit("cpu", *host.stats[:3])
+        self.emit("drives", host.drives or [])
+        self.emit("io", *(host.io or ({}, {})))
+        self.resync()
+
+    def resync(self):
+        host = self.hosts.get(self.selected)
+        if host is not None and "processes" not in self.paused:
+            self.emit("processes", [list(process) for process in host.processes.values()], [], [], True)
+
+    def start_connection(self, host):
+        host.input.clear()
+        host.processes = {}
+        host.version = None
+        try:
+            host.sock = socket.socket(host.family, socket.SOCK_STREAM)
+            host.sock.setblocking(False)
+            result = host.sock.connect_ex(host.target)
+        except OSError as e:
+            self.connection_failed(host, str(e))
+            return
+        if result not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+            self.connection_failed(host, errno.errorcode.get(result, str(result)))
+            return
+        self.selector.register(host.sock, selectors.EVENT_WRITE, host)
+
+    def connection_failed(self, host, reason):
+        if host.sock is not None:
+            try:
+                self.selector.unregister(host.sock)
+            except (KeyError, ValueError):
+                pass
+            host.sock.close()
+            host.sock = None
+        if host.connected and host.address == self.selected:
+            self.emit("processes", [], [], [], True)
+        host.processes = {}
+        host.connected = False
+        host.status = f"Disconnected ({reason})"
+        host.retry_at = time.monotonic() + host.retry_delay
+        host.retry_delay = min(host.retry_delay * 2, MAX_RECONNECT_DELAY)
+
+    def connection_ready(self, host):
+        error = host.sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+        if error:
+            self.connection_failed(host, errno.errorcode.get(error, str(error)))
+            return
+        host.connected = True
+        host.status = "Connected"
+        host.retry_delay = RECONNECT_DELAY
+        self.selector.modify(host.sock, selectors.EVENT_READ, host)
+
+    def receive(self, host):
+        try:
+            data = host.sock.recv(1 << 16)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            self.connection_failed(host, e.strerror or str(e))
+            return
+        if not data:
+            self.connection_failed(host, "closed by agent")
+            return
+        host.input += data
+        buffer = host.input
+        offset = 0
+        while len(buffer) - offset >= FRAME.size:
+            length, message_type = FRAME.unpack_from(buffer, offset)
+            if len(buffer) - offset - FRAME.size < length:
+                break
+            start = offset + FRAME.size
+            self.handle(host, message_type, ChunkReader(buffer[start:start + length]))
+            if host.sock is None:
+                return
+            offset = start + length
+        del buffer[:offset]
+
+    def handle(self, host, message_type, reader):
+        selected = host.address == self.selected
+        if message_type == MSG_HELLO:
+            try:
+                hello = json.loads(bytes(reader.data))
+            except ValueError:
+                self.connection_failed(host, "malformed hello from agent")
+                return
+            version = hello.get("version")
+            if version != PROTOCOL_VERSION:
+                self.connection_failed(host, f"agent speaks protocol version {version}, this Resmon speaks {PROTOCOL_VERSION}")
+                return
+            host.version = version
+            host.name = hello.get("host") or host.address
+            host.cores = hello.get("cores", 0)
+            host.memory_total = hello.get("memory", 0)
+        elif host.version is None:
+            self.connection_failed(host, "agent sent data before its hello")
+        elif message_type == MSG_STATS:
+            host.stats = decode_stats(reader)
+            if selected:
+                self.disk_display = host.stats[3]
+                self.emit("cpu", *host.stats[:3])
+        elif message_type == MSG_PROCESSES:
+            added, removed, changed, reset = decode_processes(reader)
+            processes = host.processes
+            if reset:
+                processes = host.processes = {}
+            for pid in removed:
+                processes.pop(pid, None)
+            for pid, fields in changed:
+                process = processes.get(pid)
+                if process is not None:
+                    for column, value in fields.items():
+                        process[column] = value
+            for process in added:
+                processes[process[0]] = list(process)
+            if selected and "processes" not in self.paused:
+                self.emit("processes", added, removed, changed, reset)
+        elif message_type == MSG_DRIVES:
+            host.drives = [tuple(drive) for drive in json.loads(bytes(reader.data))]
+            if selected:
+                self.emit("drives", host.drives)
+        elif message_type == MSG_IO:
+            disk_rates, nic_rates = json.loads(bytes(reader.data))
+            host.io = ({name: tuple(rates) for name, rates in disk_rates.items()}, {name: tuple(rates) for name, rates in nic_rates.items()})
+            if selected:
+                self.emit("io", *host.io)
+
+    def run(self):
+        self.running = True
+        next_summary = time.monotonic()
+        while self.running:
+            now = time.monotonic()
+            for host in self.hosts.values():
+                if host.sock is None and now >= host.retry_at:
+                    self.start_connection(host)
+            timeout = max(0.0, min([next_summary - now] + [host.retry_at - now for host in self.hosts.values() if host.sock is None]))
+            for key, events in self.selector.select(timeout=timeout):
+                if key.fileobj is self.wakeup_reader:
+                    try:
+                        self.wakeup_reader.recv(4096)
+                    except BlockingIOError:
+                        pass
+                    continue
+                host = key.data
+                if not host.connected:
+                    self.connection_ready(host)
+                else:
+                    self.receive(host)
+            with self.lock:
+                requests, self.requests = self.requests, []
+            for request in requests:
+                request()
+            if time.monotonic() >= next_summary:
+                next_summary = time.monotonic() + SUMMARY_INTERVAL
+                self.emit("hosts", [self.hosts[address].summary() for address in self.order])
+        for host in self.hosts.values():
+            if host.sock is not None:
+                host.sock.close()
+
+    def stop(self):
+        self.running = False
+        try:
+            self.wakeup_writer.send(b"\0")
+        except OSError:
+            pass
+
+
+
+""" Utility function for whether an agent address only accepts connections from this machine """
+def is_local_address(address):
+    family, target = parse_address(address)
+    if family == socket.AF_UNIX:
+        return True
+    host = target[0]
+    return host == "localhost" or host == "::1" or host.startswith("127.")
+
+
+
+""" Utility function for parsing the agent command line """
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="resmon --agent", description="Serve Resmon samples to remote Resmon windows.")
+    parser.add_argument("--agent", action="store_true")
+    parser.add_argument("--listen", default=f"127.0.0.1:{DEFAULT_PORT}", help="host:port or unix:/path to listen on")
+    return parser.parse_args(argv)
+
+
+
+""" Entry point for the agent """
+def main(argv=None):
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    sampler = Sampler()
+    try:
+        server = AgentServer(sampler, args.listen)
+    except (OSError, ValueError) as e:
+        print(f"Cannot listen on {args.listen}: {e}", file=sys.stderr)
+        return 1
+    print(f"Resmon agent listening on {args.listen}", file=sys.stderr)
+    if not is_local_address(args.listen):
+        print("Warning: the agent protocol is unauthenticated and anyone who can reach this address sees every process; prefer loopback with an SSH tunnel", file=sys.stderr)
+    server.start()
+    try:
+        sampler.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sampler.stop()
+        server.close()
+    return 0
@@ -0,0 +1,266 @@
+""" Import the necessary modules for this component to work """
+import time
+import psutil
+from concurrent.futures import ThreadPoolExecutor
+
+from components.snapshot import SnapshotDiffer
+from components.scheduler import Scheduler
+from components.processes import create_process_collector
+from components.cgroups import CgroupCollector, find_cgroup_root
+from components.columns import ExtraColumnCollector, WALK_SOURCES
+from components.profiling import PROFILER
+
+
+
+""" Default sampling interval in seconds for each collector """
+COLLECTOR_INTERVALS = {
+    "cpu": 0.5,
+    "processes": 2.0,
+    "disk": 30.0,
+    "partitions": 10.0,
+    "drives": 10.0,
+    "io": 1.0,
+    "cgroups": 2.0,
+    "columns": 2.0,
+}
+
+""" Seconds a mount may take to report its usage before it is marked unresponsive """
+DRIVE_USAGE_TIMEOUT = 1.0
+
+""" Device name prefixes left out of the disk and network throughput reports """
+IGNORED_DISKS = ("loop", "ram", "zram")
+IGNORED_NICS = ("lo",)
+
+
+
+""" Define the class for sampling system metrics without any GUI dependency
+
+Each collector runs on its own interval through a Scheduler. Per-core CPU and memory
+run at the fastest rate, the process walk less often, the boot drive usage rarely
+and the partition list is only reported when it changes. Results are delivered to
+callbacks registered with connect(), named after the event:
+
+    "cpu"        (cpu_usage, cpu_core_usages, memory_percent)
+    "disk"       (used_percentage)
+    "partitions" (partitions)
+    "drives"     ([(device, mountpoint, total, used, status), ...])
+    "io"         ({disk: (read B/s, write B/s)}, {nic: (received B/s, sent B/s)})
+    "snapshot"   (process rows)
+    "processes"  (added, removed, changed, reset) deltas from a SnapshotDiffer
+    "cgroups"    (groups, assigned, reset) from a CgroupCollector, on Linux with cgroup v2
+    "columns"    ({pid: {column key: value}}) extra process columns from an ExtraColumnCollector
+
+Callbacks run on the thread that calls run(). Collectors left out of "enabled" are
+never scheduled, and the cgroups and columns collectors start paused, since only
+the Groups view and extra table columns need them; both work on the PIDs of the
+latest process walk. set_process_columns() picks the column sources to collect:
+the optional fields of the walk and the extra column sources, which also enables
+or pauses the columns collector, and set_slowdown() stretches one collector's
+interval by a factor.
+
+Drive usage is queried on a small thread pool that the sampling thread never waits
+on: each drives tick reports the last usage every mount returned and queries the
+mounts again, picking up the answers on the next tick (or as soon as a mount
+reports for the first time). A mount whose query has been outstanding for longer
+than DRIVE_USAGE_TIMEOUT is reported as not responding, with its last known usage,
+and is not queried again until the stuck call returns. set_paused(),
+set_slowdown() and set_backoff() may be called from any thread; they take effect
+on the sampling thread before its next round.
+"""
+class Sampler:
+    def __init__(self, intervals=None, history=None, enabled=None):
+        self.history = history
+        self.listeners = {}
+        self.differ = SnapshotDiffer()
+        self.resync_requested = True
+        self.partitions = None
+        self.disk_percent = None
+        self.disk_display = "0%"
+        self.usage_pool = None
+        self.pending_usage = {}
+        self.drive_usage = {}
+        self.drive_report_posted = False
+        self.io_counters = None
+        self.process_collector = create_process_collector()
+        self.columns = ExtraColumnCollector()
+        cgroup_root = find_cgroup_root()
+        self.cgroups = CgroupCollector(cgroup_root) if cgroup_root else None
+        self.scheduler = Scheduler(profiler=PROFILER)
+        intervals = {**COLLECTOR_INTERVALS, **(intervals or {})}
+        self.intervals = intervals
+        collectors = [
+            ("partitions", self.collect_partitions),
+            ("disk", self.collect_disk),
+            ("drives", self.collect_drives),
+            ("io", self.collect_io),
+            ("cpu", self.collect_cpu),
+            ("processes", self.collect_processes),
+            ("columns", self.collect_columns),
+        ]
+        if self.cgroups:
+            collectors.append(("cgroups", self.collect_cgroups))
+        for name, func in collectors:
+            if enabled is None or name in enabled:
+                self.scheduler.add(name, intervals[name], func).enabled = name not in ("cgroups", "columns")
+
+    def connect(self, event, callback):
+        self.listeners.setdefault(event, []).append(callback)
+
+    def emit(self, event, *args):
+        for callback in self.listeners.get(event, ()):
+            callback(*args)
+
+    def request_resync(self):
+        self.resync_requested = True
+        if self.cgroups:
+            self.cgroups.request_resync()
+
+    def set_paused(self, name, paused):
+        if name in self.scheduler.collectors:
+            self.scheduler.post(lambda: self.scheduler.set_enabled(name, not paused))
+
+    def set_slowdown(self, name, factor):
+        if name in self.scheduler.collectors:
+            self.scheduler.post(lambda: self.scheduler.set_interval(name, self.intervals[name] * factor))
+
+    def set_backoff(self, scale):
+        self.scheduler.post(lambda: self.scheduler.set_scale(scale))
+
+    def set_process_columns(self, sources):
+        sources = frozenset(sources)
+        self.scheduler.post(lambda: self.apply_process_columns(sources))
+
+    def apply_process_columns(self, sources):
+        self.process_collector.fields = sources & WALK_SOURCES
+        self.columns.sources = sources - WALK_SOURCES
+        if "columns" in self.scheduler.collectors:
+            self.scheduler.set_enabled("columns", bool(self.columns.sources))
+
+    def set_column_pids(self, pids):
+        pids = None if pids is None else list(pids)
+        self.scheduler.post(lambda: setattr(self.columns, "pids", pids))
+
+    def emit_processes(self, processes_info):
+        self.emit("snapshot", processes_info)
+        added, removed, changed = self.differ.diff(processes_info)
+        if self.resync_requested:
+            self.resync_requested = False
+            self.emit("processes", self.differ.snapshot(), [], [], True)
+        elif added or removed or changed:
+            self.emit("processes", added, removed, changed, False)
+
+    def collect_partitions(self):
+        partitions = psutil.disk_partitions()
+        if partitions != self.partitions:
+            self.partitions = partitions
+            self.emit("partitions", partitions)
+
+    def collect_disk(self):
+        if not self.partitions:
+            self.partitions = psutil.disk_partitions()
+            if not self.partitions:
+                return
+        disk_info = psutil.disk_usage(self.partitions[0].mountpoint)
+        self.disk_percent = disk_info.used / disk_info.total * 100
+        self.disk_display = f"{self.disk_percent:.1f}%"
+        self.emit("disk", self.disk_percent)
+
+    def collect_drives(self):
+        if self.usage_pool is None:
+            self.usage_pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="resmon-drives")
+        self.collect_drive_usage()
+        mountpoints = {partition.mountpoint for partition in self.partitions or []}
+        self.drive_usage = {mountpoint: usage for mountpoint, usage in self.drive_usage.items() if mountpoint in mountpoints}
+        now = time.monotonic()
+        for mountpoint in mountpoints:
+            if mountpoint not in self.pending_usage:
+                future = self.usage_pool.submit(psutil.disk_usage, mountpoint)
+                self.pending_usage[mountpoint] = (future, now)
+                if mountpoint not in self.drive_usage:
+                    future.add_done_callback(self.drive_usage_ready)
+        self.report_drives()
+
+    def collect_drive_usage(self):
+        for mountpoint, (future, submitted) in list(self.pending_usage.items()):
+            if not future.done():
+                continue
+            del self.pending_usage[mountpoint]
+            try:
+                usage = future.result()
+            except OSError:
+                self.drive_usage[mountpoint] = None
+            else:
+                self.drive_usage[mountpoint] = (usage.total, usage.used)
+
+    def drive_usage_ready(self, future):
+        if not self.drive_report_posted:
+            self.drive_report_posted = True
+            self.scheduler.post(self.report_drives)
+
+    def report_drives(self):
+        self.drive_report_posted = False
+        self.collect_drive_usage()
+        now = time.monotonic()
+        drives = []
+        for partition in self.partitions or []:
+            usage = self.drive_usage.get(partition.mountpoint)
+            pending = self.pending_usage.get(partition.mountpoint)
+            if pending is not None and now - pending[1] > DRIVE_USAGE_TIMEOUT:
+                drives.append((partition.device, partition.mountpoint, *(usage or (0, 0)), "Not responding"))
+            elif usage is not None:
+                drives.append((partition.device, partition.mountpoint, *usage, None))
+        self.emit("drives", drives)
+
+    def collect_io(self):
+        now = time.monotonic()
+        disks = psutil.disk_io_counters(perdisk=True) or {}
+        nics = psutil.net_io_counters(pernic=True) or {}
+        previous = self.io_counters
+        self.io_counters = (now, disks, nics)
+        if previous is None:
+            return
+        elapsed = now - previous[0]
+        if elapsed <= 0:
+            return
+        disk_rates = {}
+        for name, counters in disks.items():
+            old = previous[1].get(name)
+            if old is None or name.startswith(IGNORED_DISKS):
+                continue
+            disk_rates[name] = (max(0, counters.read_bytes - old.read_bytes) / elapsed, max(0, counters.write_bytes - old.write_bytes) / elapsed)
+        nic_rates = {}
+        for name, counters in nics.items():
+            old = previous[2].get(name)
+            if old is None or name.startswith(IGNORED_NICS):
+                continue
+            nic_rates[name] = (max(0, counters.bytes_recv - old.bytes_recv) / elapsed, max(0, counters.bytes_sent - old.bytes_sent) / elapsed)
+        self.emit("io", disk_rates, nic_rates)
+
+    def collect_cpu(self):
+        cpu_core_usages = psutil.cpu_percent(interval=None, percpu=True)
+        cpu_usage = sum(cpu_core_usages) / len(cpu_core_usages)
+        memory_info = psutil.virtual_memory()
+        self.emit("cpu", cpu_usage, cpu_core_usages, memory_info.percent)
+        if self.history:
+            samples = {f"cpu{i}": usage for i, usage in enumerate(cpu_core_usages)}
+            samples["cpu"] = cpu_usage
+            samples["memory"] = memory_info.percent
+            self.history.record_many(samples)
+
+    def collect_processes(self):
+        self.emit_processes(self.process_collector.collect())
+
+    def collect_columns(self):
+        if self.columns.sources:
+            self.emit("columns", self.columns.collect(self.differ.previous))
+
+    def collect_cgroups(self):
+        self.emit("cgroups", *self.cgroups.collect(self.differ.previous.keys()))
+
+    def run(self):
+        self.scheduler.run()
+
+    def stop(self):
+        self.scheduler.stop()
+        if self.usage_pool is not None:
+            self.usage_pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,114 @@
+""" Import the necessary modules for this component to work """
+import time
+import queue
+import threading
+
+
+
+""" Define the class for a single collector registered with the scheduler """
+class Collector:
+    def __init__(self, name, interval, func):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.next_due = 0.0
+        self.enabled = True
+
+
+
+""" Define the class for running collectors on their own intervals
+
+Every collector has its own interval and is kept on a fixed grid of the monotonic
+clock (next_due advances by whole intervals), so a slow sample never makes later
+samples drift. When a collector falls more than an interval behind, the missed ticks
+are skipped rather than run back to back. The loop sleeps on an event until the next
+deadline, so wake() can make it re-evaluate immediately. All intervals are multiplied
+by a common scale, which lets the whole schedule back off and return at once.
+
+Other threads change the schedule through post(), which runs the given function on
+the scheduler's own thread before the next round of due collectors. When given a
+profiler, every collector run is timed under "collector/<name>".
+"""
+class Scheduler:
+    def __init__(self, clock=time.monotonic, profiler=None):
+        self.clock = clock
+        self.profiler = profiler
+        self.collectors = {}
+        self.running = False
+        self.scale = 1.0
+        self.pending = queue.SimpleQueue()
+        self.wake_event = threading.Event()
+
+    def add(self, name, interval, func):
+        collector = Collector(name, interval, func)
+        collector.next_due = self.clock()
+        self.collectors[name] = collector
+        return collector
+
+    def set_interval(self, name, interval):
+        collector = self.collectors[name]
+        collector.next_due += interval - collector.interval
+        collector.interval = interval
+        self.wake()
+
+    def set_enabled(self, name, enabled):
+        collector = self.collectors[name]
+        if enabled and not collector.enabled:
+            collector.next_due = self.clock()
+        collector.enabled = enabled
+
+    def set_scale(self, scale):
+        if scale < self.scale:
+            now = self.clock()
+            for collector in self.collectors.values():
+                collector.next_due = min(collector.next_due, now)
+        self.scale = scale
+
+    def post(self, func):
+        self.pending.put(func)
+        self.wake()
+
+    def run_pending(self):
+        while True:
+            try:
+                func = self.pending.get_nowait()
+            except queue.Empty:
+                return
+            func()
+
+    def run_due(self):
+        self.run_pending()
+        now = self.clock()
+        for collector in list(self.collectors.values()):
+            if not collector.enabled or collector.next_due > now:
+                continue
+            if self.profiler:
+                with self.profiler.measure(f"collector/{collector.name}"):
+                    collector.func()
+            else:
+                collector.func()
+            interval = collector.interval * self.scale
+            collector.next_due += interval
+            if collector.next_due <= now:
+                missed = (now - collector.next_due) // interval + 1
+                collector.next_due += missed * interval
+
+    def next_deadline(self):
+        deadlines = [collector.next_due for collector in self.collectors.values() if collector.enabled]
+        return min(deadlines) if deadlines else self.clock() + 1.0
+
+    def wake(self):
+        self.wake_event.set()
+
+    def stop(self):
+        self.running = False
+        self.wake()
+
+    def run(self):
+        self.running = True
+        while self.running:
+            self.run_due()
+            timeout = self.next_deadline() - self.clock()
+            if timeout > 0:
+                self.wake_event.wait(timeout)
+            self.wake_event.clear()
@@ -0,0 +1,57 @@
+""" Define the default change thresholds, keyed by process row column
+
+A numeric column only counts as changed once it has moved at least this far from the
+value last sent, so the memory column ignores sub-display jitter and the CPU column
+ignores moves below 0.1%.
+"""
+DEFAULT_THRESHOLDS = {4: 0.01, 5: 0.1}
+
+
+
+""" Define the class for turning successive process snapshots into deltas
+
+Each call to diff() compares a full list of process rows against the rows that were
+last sent and returns only what the receiving side needs to stay in sync: rows for
+new PIDs, the PIDs that exited and, for everything else, the columns that changed.
+"""
+class SnapshotDiffer:
+    def __init__(self, thresholds=None):
+        self.thresholds = DEFAULT_THRESHOLDS if thresholds is None else thresholds
+        self.previous = {}
+
+    def diff(self, process_data):
+        previous = self.previous
+        current = {}
+        added = []
+        changed = []
+        thresholds = self.thresholds
+        for process in process_data:
+            pid = process[0]
+            sent = previous.get(pid)
+            if sent is None:
+                current[pid] = process
+                added.append(process)
+                continue
+            fields = None
+            for column, value in enumerate(process):
+                old = sent[column]
+                if value == old:
+                    continue
+                threshold = thresholds.get(column)
+                if threshold is not None and old is not None and value is not None and abs(value - old) < threshold:
+                    continue
+                if fields is None:
+                    fields = {}
+                fields[column] = value
+            if fields:
+                sent = list(sent)
+                for column, value in fields.items():
+                    sent[column] = value
+                changed.append((pid, fields))
+            current[pid] = sent
+        removed = [pid for pid in previous if pid not in current]
+        self.previous = current
+        return added, removed, changed
+
+    def snapshot(self):
+        return [list(process) for process in self.previous.values()]
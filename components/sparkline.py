@@ -0,0 +1,58 @@
+""" Import the necessary modules for this component to work """
+from PyQt5.QtCore import Qt, QPointF
+from PyQt5.QtGui import QPainter, QPen, QColor, QPolygonF
+from PyQt5.QtWidgets import QStyledItemDelegate, QStyleOptionViewItem, QStyle, QApplication
+from components.processmodel import SPARKLINE_ROLE
+from components.profiling import PROFILER
+
+
+
+""" Define the class for the sparkline delegate of the process table's History column
+
+Draws the (cpu, memory) series from SPARKLINE_ROLE inside the cell: memory as a
+faint area scaled to its own peak, CPU as a line on a 0-100% scale that grows for
+processes using more than one core. Samples from before the process was tracked
+are left blank.
+"""
+class SparklineDelegate(QStyledItemDelegate):
+    def paint(self, painter, option, index):
+        with PROFILER.measure("paint/SparklineDelegate.paint"):
+            item_option = QStyleOptionViewItem(option)
+            self.initStyleOption(item_option, index)
+            style = item_option.widget.style() if item_option.widget else QApplication.style()
+            style.drawControl(QStyle.CE_ItemViewItem, item_option, painter, item_option.widget)
+            series = index.data(SPARKLINE_ROLE)
+            if not series:
+                return
+            cpu, memory = series
+            rect = option.rect.adjusted(2, 3, -2, -3)
+            if rect.width() < 4 or rect.height() < 4:
+                return
+            selected = option.state & QStyle.State_Selected
+            line_color = option.palette.highlightedText().color() if selected else option.palette.highlight().color()
+            fill_color = QColor(line_color)
+            fill_color.setAlpha(60)
+            step = rect.width() / max(1, len(cpu) - 1)
+            painter.save()
+            painter.setRenderHint(QPainter.Antialiasing)
+            memory_peak = max((value for value in memory if value is not None), default=0.0)
+            if memory_peak > 0:
+                area = self.polyline(memory, memory_peak, rect, step)
+                area.append(QPointF(area.last().x(), rect.bottom()))
+                area.append(QPointF(area.first().x(), rect.bottom()))
+                painter.setPen(Qt.NoPen)
+                painter.setBrush(fill_color)
+                painter.drawPolygon(area)
+            cpu_peak = max(100.0, max((value for value in cpu if value is not None), default=0.0))
+            painter.setPen(QPen(line_color, 1))
+            painter.setBrush(Qt.NoBrush)
+            painter.drawPolyline(self.polyline(cpu, cpu_peak, rect, step))
+            painter.restore()
+
+    def polyline(self, values, peak, rect, step):
+        line = QPolygonF()
+        bottom, height, left = rect.bottom(), rect.height(), rect.left()
+        for i, value in enumerate(values):
+            if value is not None:
+                line.append(QPointF(left + i * step, bottom - value / peak * height))
+        return line
@@ -0,0 +1,250 @@
+""" Import the necessary modules for this component to work """
+import os
+import sys
+import time
+import socket
+import platform
+import threading
+import psutil
+from concurrent.futures import ThreadPoolExecutor
+from components.profiling import PROFILER
+
+
+
+""" Define where Linux describes CPU caches and NUMA nodes """
+CPU_CACHE_PATH = "/sys/devices/system/cpu/cpu0/cache"
+NODE_PATH = "/sys/devices/system/node"
+
+
+
+""" Utility function for running one section's collector, turning a failure into a row """
+def attempt(collect):
+    try:
+        return collect()
+    except psutil.AccessDenied:
+        return [("", "Access denied")]
+    except (OSError, psutil.Error, NotImplementedError, AttributeError) as e:
+        return [("", f"Not available ({e})")]
+
+
+
+""" Utility function for reading a small text file, or None if it cannot be read """
+def read_text(path):
+    try:
+        with open(path) as text_file:
+            return text_file.read().strip()
+    except OSError:
+        return None
+
+
+
+""" Utility function for the "key: value" lines of /proc/cpuinfo and /proc/meminfo style files, first occurrence of each key """
+def read_fields(path, separator=":"):
+    fields = {}
+    for line in (read_text(path) or "").splitlines():
+        key, found, value = line.partition(separator)
+        if found:
+            fields.setdefault(key.strip(), value.strip())
+    return fields
+
+
+
+""" Utility function for a sysfs cache size such as "32K" or "8M" in bytes """
+def parse_size(text):
+    units = {"K": 1024, "M": 1024 ** 2, "G": 1024 ** 3}
+    if text and text[-1] in units:
+        return int(text[:-1]) * units[text[-1]]
+    return int(text)
+
+
+
+""" Utility function for a duration in days, hours and minutes """
+def format_duration(seconds):
+    minutes, _ = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    days, hours = divmod(hours, 24)
+    return f"{days} days, {hours:02}:{minutes:02}" if days else f"{hours:02}:{minutes:02}"
+
+
+
+""" Utility function for the Operating System section """
+def os_rows():
+    system = platform.system()
+    if sys.platform.startswith("linux"):
+        name = read_fields("/etc/os-release", "=").get("PRETTY_NAME", "Linux").strip('"')
+    elif sys.platform == "darwin":
+        name = f"macOS {platform.mac_ver()[0]}"
+    else:
+        name = f"{system} {platform.release()}"
+    return [
+        ("Host Name", platform.node()),
+        ("Operating System", name),
+        ("Kernel", f"{system} {platform.release()} ({platform.version()})"),
+        ("Architecture", platform.machine()),
+        ("Boot Time", time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(psutil.boot_time()))),
+    ]
+
+
+
+""" Utility function for the Processor section: model, topology, caches and frequency range """
+def cpu_rows():
+    cpuinfo = read_fields("/proc/cpuinfo") if sys.platform.startswith("linux") else {}
+    model = cpuinfo.get("model name") or cpuinfo.get("Hardware") or platform.processor() or platform.machine()
+    logical = psutil.cpu_count(logical=True)
+    physical = psutil.cpu_count(logical=False)
+    rows = [("Model", model), ("Logical Processors", str(logical)), ("Cores", str(physical) if physical else "Unknown")]
+    if sys.platform.startswith("linux"):
+        packages = set()
+        for entry in os.scandir("/sys/devices/system/cpu"):
+            if entry.name.startswith("cpu") and entry.name[3:].isdigit():
+                package = read_text(f"{entry.path}/topology/physical_package_id")
+                if package is not None:
+                    packages.add(package)
+        if packages:
+            rows.append(("Sockets", str(len(packages))))
+    if logical and physical:
+        rows.append(("Threads per Core", str(logical // physical)))
+    if os.path.isdir(CPU_CACHE_PATH):
+        for entry in sorted(os.scandir(CPU_CACHE_PATH), key=lambda entry: entry.name):
+            if not entry.name.startswith("index"):
+                continue
+            level, kind, size = (read_text(f"{entry.path}/{name}") for name in ("level", "type", "size"))
+            if level and size:
+                suffix = {"Data": "d", "Instruction": "i"}.get(kind, "")
+                rows.append((f"L{level}{suffix} Cache", parse_size(size)))
+    frequency = psutil.cpu_freq()
+    if frequency and frequency.max:
+        rows.append(("Frequency", f"{frequency.min:.0f} - {frequency.max:.0f} MHz"))
+    return rows
+
+
+
+""" Utility function for the Memory section: totals, NUMA nodes and huge pages """
+def memory_rows():
+    rows = [("Physical Memory", psutil.virtual_memory().total), ("Swap", psutil.swap_memory().total)]
+    if os.path.isdir(NODE_PATH):
+        for entry in sorted(os.scandir(NODE_PATH), key=lambda entry: entry.name):
+            if entry.name.startswith("node") and entry.name[4:].isdigit():
+                total = read_fields(f"{entry.path}/meminfo").get(f"Node {entry.name[4:]} MemTotal")
+                if total:
+                    rows.append((f"NUMA Node {entry.name[4:]}", int(total.split()[0]) * 1024))
+    meminfo = read_fields("/proc/meminfo") if sys.platform.startswith("linux") else {}
+    if meminfo.get("HugePages_Total", "0") != "0":
+        rows.append(("Huge Pages", f"{meminfo['HugePages_Total']} of {meminfo.get('Hugepagesize', '?')}"))
+    return rows
+
+
+
+""" Utility function for the Status section, the figures that change all the time """
+def status_rows():
+    memory = psutil.virtual_memory()
+    swap = psutil.swap_memory()
+    rows = [
+        ("Uptime", format_duration(time.time() - psutil.boot_time())),
+        ("Processes", str(len(psutil.pids()))),
+        ("Memory Available", memory.available),
+        ("Swap Used", swap.used),
+    ]
+    if hasattr(psutil, "getloadavg") and not sys.platform.startswith("win"):
+        rows.append(("Load Average", " ".join(f"{load:.2f}" for load in psutil.getloadavg())))
+    frequency = psutil.cpu_freq()
+    if frequency and frequency.current:
+        rows.append(("Current Frequency", f"{frequency.current:.0f} MHz"))
+    users = sorted({user.name for user in psutil.users()})
+    rows.append(("Users", ", ".join(users) or "None"))
+    return rows
+
+
+
+""" Utility function for the Mounts section, one row per mounted file system """
+def mount_rows():
+    return [(partition.mountpoint, f"{partition.device} ({partition.fstype}, {partition.opts})") for partition in psutil.disk_partitions()]
+
+
+
+""" Utility function for the Network Interfaces section: state, speed and MTU, then one row per address """
+def nic_rows():
+    families = {socket.AF_INET: "IPv4", socket.AF_INET6: "IPv6", psutil.AF_LINK: "MAC"}
+    stats = psutil.net_if_stats()
+    rows = []
+    for name, addresses in sorted(psutil.net_if_addrs().items()):
+        stat = stats.get(name)
+        if stat is None:
+            rows.append((name, "Unknown"))
+        else:
+            speed = f", {stat.speed} Mb/s" if stat.speed else ""
+            rows.append((name, f"{'Up' if stat.isup else 'Down'}{speed}, MTU {stat.mtu}"))
+        for address in addresses:
+            netmask = f" / {address.netmask}" if address.netmask else ""
+            rows.append((f"{name} {families.get(address.family, 'Other')}", f"{address.address}{netmask}"))
+    return rows
+
+
+
+""" Define the sections in display order, with the seconds their contents stay valid (None until invalidated) """
+SECTIONS = [
+    ("Operating System", os_rows, None),
+    ("Processor", cpu_rows, None),
+    ("Memory", memory_rows, None),
+    ("Status", status_rows, 2.0),
+    ("Mounts", mount_rows, 30.0),
+    ("Network Interfaces", nic_rows, 30.0),
+]
+
+
+
+""" Define the class for the system information collector
+
+Collects the sections of SECTIONS on one background thread, never on the caller's
+thread, and caches each with its own lifetime: the static ones (operating system,
+processor, memory layout) are collected once until invalidate(), the others again
+once they are older than their TTL. sections() returns [(section, rows or None)]
+from the cache straight away and queues a refresh of the missing and expired ones;
+the callback receives (section, rows) on the worker thread as each finishes. Rows
+are (label, value) with byte counts as ints for the caller to format, like the
+process inspector's. Every collection is timed as "sysinfo/<section>".
+"""
+class SystemInfo:
+    def __init__(self, sections=SECTIONS):
+        self.sections_info = sections
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sysinfo")
+        self.cache = {}
+        self.pending = set()
+        self.lock = threading.Lock()
+
+    def sections(self, callback=None):
+        now = time.monotonic()
+        stale = []
+        with self.lock:
+            result = []
+            for name, collect, ttl in self.sections_info:
+                entry = self.cache.get(name)
+                result.append((name, entry[1] if entry is not None else None))
+                if (entry is None or (ttl is not None and now - entry[0] >= ttl)) and name not in self.pending:
+                    self.pending.add(name)
+                    stale.append((name, collect))
+        if stale:
+            self.executor.submit(self.refresh, stale, callback)
+        return result
+
+    def is_pending(self, name):
+        with self.lock:
+            return name in self.pending
+
+    def refresh(self, stale, callback):
+        for name, collect in stale:
+            with PROFILER.measure(f"sysinfo/{name}"):
+                rows = attempt(collect)
+            with self.lock:
+                self.pending.discard(name)
+                self.cache[name] = (time.monotonic(), rows)
+            if callback:
+                callback(name, rows)
+
+    def invalidate(self, names=None):
+        with self.lock:
+            for name in list(self.cache) if names is None else names:
+                self.cache.pop(name, None)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
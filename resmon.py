@@ -1,21 +1,56 @@
-""" Import the necessary modules for the program to work """
+""" Import the necessary modules for the program to work, timing them for --startup-profile """
+import time
+STARTED = time.perf_counter()
 import sys
 import os
+import json
 import math
 import psutil
 import platform
 import subprocess
+import argparse
 import importlib.util
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 
-from PyQt5.QtCore import Qt, QThread, pyqtSignal
-from PyQt5.QtGui import QIcon, QFont
+if __name__ == "__main__" and "--headless" in sys.argv:
+    from components.headless import main
+    sys.exit(main(sys.argv[1:]))
+
+if __name__ == "__main__" and "--agent" in sys.argv:
+    from components.remote import main
+    sys.exit(main(sys.argv[1:]))
+
+from PyQt5.QtCore import Qt, QEvent, QThread, QTimer, pyqtSignal
+from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, QAction, QWidget,
     QDialog, QLineEdit, QFormLayout, QDialogButtonBox, QMessageBox, QMenu,
-    QTableWidget, QHeaderView, QSplitter, QTableWidgetItem, QLabel, QTextBrowser, QTabWidget, QProgressBar,
-    QGridLayout
+    QTableView, QHeaderView, QSplitter, QLabel, QTabWidget, QScrollArea,
+    QGridLayout, QComboBox, QStackedWidget, QTreeView, QSlider, QPushButton, QSystemTrayIcon,
+    QTreeWidget, QTreeWidgetItem
 )
 from components.graph import RGraph
+from components.heatmap import CoreHeatmap
+from components.processmodel import ProcessTableModel, ProcessTreeModel, CgroupTreeModel, ProcessSortProxy, PID_ROLE, HISTORY_COLUMN, EXTRA_COLUMNS
+from components.columns import ProcessColumn, WALK_SOURCES
+from components.sparkline import SparklineDelegate
+from components.query import ProcessQuery
+from components.sampler import Sampler
+from components.history import HistoryStore
+from components.profiling import PROFILER, StartupProfile
+from components.diagnostics import DiagnosticsPanel
+from components.drives import DriveWidget, format_size
+from components.recording import SessionRecorder, SessionPlayer
+from components.remote import RemoteHosts
+from components.overview import HostOverview
+from components.inspector import ProcessInspector
+from components.details import ProcessDetails
+from components.alerts import AlertEngine, load_rules, parse_rules
+from components.alertspanel import AlertsPanel
+from components.plugins import PluginHost, PluginAPI
+from components.pluginspanel import PluginsPanel
+from components.sysinfo import SystemInfo
 
 
 
@@ -30,35 +65,99 @@ def load_icon(icon_name):
 
 
 
-""" Utility function to load plugins
+""" Define the folder plugins are loaded from and the manifest kept in it """
+PLUGINS_DIR = os.path.join(os.path.expanduser("~"), "resmonplugins")
+PLUGIN_MANIFEST = ".manifest.json"
+
+
+
+""" Utility function to find plugins
 
 This function checks for a "Resmonplugins" directory located in your user folder.
-If the folder doesn't exist, it creates it. It then loads every Python file in the
-folder (ignoring files starting with an underscore) and, if the module defines a
+If the folder doesn't exist, it creates it. It returns the Python files in the
+folder (ignoring files starting with an underscore) as (filename, path, signature)
+together with the folder's manifest. The manifest remembers, by modification time
+and size, the files that turned out not to define "register_plugin", so unchanged
+helper modules are not imported again on every start.
+"""
+def discover_plugins(plugins_dir=PLUGINS_DIR):
+    os.makedirs(plugins_dir, exist_ok=True)
+    try:
+        with open(os.path.join(plugins_dir, PLUGIN_MANIFEST)) as manifest_file:
+            known = json.load(manifest_file)
+    except (OSError, ValueError):
+        known = {}
+    candidates = []
+    manifest = {}
+    for entry in sorted(os.scandir(plugins_dir), key=lambda entry: entry.name):
+        if not entry.name.endswith(".py") or entry.name.startswith("_"):
+            continue
+        stat = entry.stat()
+        signature = [stat.st_mtime_ns, stat.st_size]
+        entry_info = known.get(entry.name)
+        if isinstance(entry_info, dict) and entry_info.get("signature") == signature:
+            manifest[entry.name] = entry_info
+            if not entry_info.get("plugin"):
+                continue
+        candidates.append((entry.name, entry.path, signature))
+    return candidates, manifest
+
+
+
+""" Utility function to load a plugin
+
+Loads one file found by discover_plugins() and, if the module defines a
 "register_plugin(app_context)" function, calls it. The app_context is a dictionary
 containing a reference to the main window, so plugins can integrate with Construct
-(e.g., by adding menu items). Plugins should be written in Python. They do not
-require a separate Python installation.
+(e.g., by adding menu items), and, under "collectors", a PluginAPI for sampling
+functions that run off the GUI thread within a time budget and feed a callback,
+a graph or a process table column. Plugins should be written in Python. They do not
+require a separate Python installation. Returns whether the file is a plugin, or
+None if it failed to load.
+"""
+def load_plugin(filename, plugin_path, app_context):
+    plugins_dir = os.path.dirname(plugin_path)
+    mod_name = os.path.splitext(filename)[0]
+    spec = importlib.util.spec_from_file_location(mod_name, plugin_path)
+    module = importlib.util.module_from_spec(spec)
+    try:
+        spec.loader.exec_module(module)
+        if not hasattr(module, "register_plugin"):
+            return False
+        module.register_plugin(app_context)
+        print(f"Plugin '{mod_name}' loaded successfully from {plugins_dir}")
+        return True
+    except Exception as e:
+        print(f"Failed to load plugin '{filename}' from {plugins_dir}: {e}")
+        return None
+
+
+
+""" Utility function to save the plugin manifest, which is only a cache """
+def save_plugin_manifest(manifest, plugins_dir=PLUGINS_DIR):
+    try:
+        with open(os.path.join(plugins_dir, PLUGIN_MANIFEST), "w") as manifest_file:
+            json.dump(manifest, manifest_file)
+    except OSError as e:
+        print(f"Could not save the plugin manifest: {e}")
+
+
+
+""" Utility function to load every plugin at once
+
+The window loads its plugins one per event loop pass after the first frame instead;
+this is kept for callers that want them all immediately.
 """
 def load_plugins(app_context):
-    user_home = os.path.expanduser("~")
-    plugins_dir = os.path.join(user_home, "resmonplugins")
-    os.makedirs(plugins_dir, exist_ok=True)
+    candidates, manifest = discover_plugins()
     loaded_plugins = []
-    for filename in os.listdir(plugins_dir):
-        if filename.endswith(".py") and not filename.startswith("_"):
-            plugin_path = os.path.join(plugins_dir, filename)
-            mod_name = os.path.splitext(filename)[0]
-            spec = importlib.util.spec_from_file_location(mod_name, plugin_path)
-            module = importlib.util.module_from_spec(spec)
-            try:
-                spec.loader.exec_module(module)
-                if hasattr(module, "register_plugin"):
-                    module.register_plugin(app_context)
-                    loaded_plugins.append(mod_name)
-                    print(f"Plugin '{mod_name}' loaded successfully from {plugins_dir}")
-            except Exception as e:
-                print(f"Failed to load plugin '{filename}' from {plugins_dir}: {e}")
+    for filename, plugin_path, signature in candidates:
+        result = load_plugin(filename, plugin_path, app_context)
+        if result is not None:
+            manifest[filename] = {"signature": signature, "plugin": result}
+        if result:
+            loaded_plugins.append(os.path.splitext(filename)[0])
+    save_plugin_manifest(manifest)
     return loaded_plugins
 
 
@@ -116,86 +215,303 @@ def optimal_grid(n):
 
 
 
-""" Thread for fetching the processes """
+""" Logical core count above which the Graphs tab shows one heatmap instead of a graph per core """
+MANY_CORE_THRESHOLD = 32
+
+
+
+""" Time ranges offered by the Graphs tab, in seconds (0 shows the live buffers) """
+HISTORY_RANGES = [
+    ("Live", 0),
+    ("Last hour", 3600),
+    ("Last 24 hours", 86400),
+    ("Last 30 days", 30 * 86400),
+]
+
+
+
+""" Factor applied to every sampling interval while the window is minimized or hidden """
+MINIMIZED_BACKOFF = 4.0
+
+""" Factor applied to the process walk's interval while only process alert rules need it, on top of the backoff """
+ALERT_WALK_SLOWDOWN = 2.5
+
+""" Playback speeds offered while replaying a recording; 0 plays as fast as possible """
+REPLAY_SPEEDS = [("0.5x", 0.5), ("1x", 1.0), ("2x", 2.0), ("5x", 5.0), ("10x", 10.0), ("Max", 0.0)]
+
+
+
+""" Thread for fetching the processes
+
+Runs a Sampler (or anything with the same connect/run interface, such as a
+SessionPlayer) on its own thread and re-emits its results as Qt signals, so the
+collectors themselves stay free of any GUI dependency. Emit times are queued per
+signal and matched by delivered() in the receiving slot, which records how long the
+signal waited for the GUI thread. A local Sampler also gets a PluginHost, whose
+results arrive on update_plugin.
+"""
 class ProcessFetcher(QThread):
-    update_processes = pyqtSignal(list)
+    update_processes = pyqtSignal(list, list, list, bool)
     update_stats = pyqtSignal(float, float, str)
     update_graphs = pyqtSignal(list, float)
     update_drives = pyqtSignal(list)
+    update_io = pyqtSignal(dict, dict)
+    update_cgroups = pyqtSignal(list, dict, bool)
+    update_columns = pyqtSignal(dict)
+    update_plugin = pyqtSignal(object, object)
+
+    def __init__(self, parent=None, intervals=None, history=None, sampler=None):
+        super().__init__(parent)
+        self.sampler = sampler or Sampler(intervals=intervals, history=history)
+        self.cgroups_paused = True
+        self.emitted_at = {name: deque(maxlen=256) for name in ("update_processes", "update_stats", "update_graphs", "update_drives", "update_io", "update_cgroups", "update_columns", "update_plugin")}
+        self.sampler.connect("processes", lambda *args: self.emit_timed("update_processes", *args))
+        self.sampler.connect("cpu", self.emit_cpu)
+        self.sampler.connect("drives", lambda *args: self.emit_timed("update_drives", *args))
+        self.sampler.connect("io", lambda *args: self.emit_timed("update_io", *args))
+        self.sampler.connect("cgroups", lambda *args: self.emit_timed("update_cgroups", *args))
+        self.sampler.connect("columns", lambda *args: self.emit_timed("update_columns", *args))
+        self.plugin_host = PluginHost(self.sampler) if isinstance(self.sampler, Sampler) else None
+        if self.plugin_host:
+            self.plugin_host.connect("result", lambda *args: self.emit_timed("update_plugin", *args))
+
+    def request_resync(self):
+        self.sampler.request_resync()
+
+    def set_processes_paused(self, paused):
+        self.sampler.set_paused("processes", paused)
+
+    def set_processes_slowed(self, slowed):
+        self.sampler.set_slowdown("processes", ALERT_WALK_SLOWDOWN if slowed else 1.0)
+
+    def set_cgroups_paused(self, paused):
+        if paused == self.cgroups_paused:
+            return
+        self.cgroups_paused = paused
+        if not paused:
+            self.sampler.cgroups.request_resync()
+        self.sampler.set_paused("cgroups", paused)
+
+    def set_process_columns(self, sources):
+        self.sampler.set_process_columns(sources)
+
+    def set_column_pids(self, pids):
+        self.sampler.set_column_pids(pids)
+
+    def set_backoff(self, scale):
+        self.sampler.set_backoff(scale)
+
+    def emit_timed(self, name, *args):
+        self.emitted_at[name].append(time.perf_counter())
+        getattr(self, name).emit(*args)
+
+    def delivered(self, name):
+        try:
+            emitted = self.emitted_at[name].popleft()
+        except IndexError:
+            return
+        PROFILER.record(f"signal/{name}", time.perf_counter() - emitted)
+
+    def emit_cpu(self, cpu_usage, cpu_core_usages, memory_percent):
+        self.emit_timed("update_stats", cpu_usage, memory_percent, self.sampler.disk_display)
+        self.emit_timed("update_graphs", cpu_core_usages, memory_percent)
 
     def run(self):
-        while True:
-            processes_info = []
-            for proc in psutil.process_iter(['pid', 'name', 'num_threads', 'username', 'memory_info', 'cpu_percent']):
-                if proc.info['name'] == "System Idle Process":
-                    continue
-                processes_info.append([
-                    proc.info['pid'],
-                    proc.info['name'],
-                    proc.info['num_threads'],
-                    proc.info['username'],
-                    proc.info['memory_info'].rss / (1024 * 1024),
-                    round(proc.info['cpu_percent'], 1)
-                ])
-            self.update_processes.emit(processes_info)
-            cpu_core_usages = psutil.cpu_percent(interval=0.5, percpu=True)
-            cpu_usage = sum(cpu_core_usages) / len(cpu_core_usages)
-            memory_info = psutil.virtual_memory()
-            boot_drive = psutil.disk_partitions()[0].device
-            disk_info = psutil.disk_usage(boot_drive)
-            total_disk = disk_info.total / (1024**3)
-            used_disk = disk_info.used / (1024**3)
-            used_percentage = used_disk / total_disk * 100
-            disk_display = f"{used_percentage:.1f}%"
-            self.update_stats.emit(cpu_usage, memory_info.percent, disk_display)
-            self.update_graphs.emit(cpu_core_usages, memory_info.percent)
-            self.update_drives.emit(psutil.disk_partitions())
-
-
-
-""" Dialog for displaying System Information """
+        self.sampler.run()
+
+
+
+""" Thread for replaying a recorded session through the same signals as ProcessFetcher """
+class ReplayFetcher(ProcessFetcher):
+    update_position = pyqtSignal(float)
+
+    def __init__(self, path, speed=1.0, parent=None):
+        self.player = SessionPlayer(path, speed)
+        super().__init__(parent, sampler=self.player)
+        self.player.connect("position", self.update_position.emit)
+
+    def seek(self, timestamp):
+        self.player.seek(timestamp)
+
+    def set_speed(self, speed):
+        self.player.set_speed(speed)
+
+    def set_playing(self, playing):
+        self.player.set_playing(playing)
+
+
+
+""" Thread for watching remote agents through the same signals as ProcessFetcher
+
+The selected host's samples arrive on the usual signals; update_hosts carries the
+summary of every host for the overview.
+"""
+class RemoteFetcher(ProcessFetcher):
+    update_hosts = pyqtSignal(list)
+
+    def __init__(self, addresses, parent=None):
+        self.hosts = RemoteHosts(addresses)
+        super().__init__(parent, sampler=self.hosts)
+        self.hosts.connect("hosts", self.update_hosts.emit)
+
+    def select_host(self, address):
+        self.hosts.select(address)
+
+
+
+""" Dialog for displaying System Information
+
+Opens with whatever the SystemInfo collector has cached, and shows "Loading..."
+for the sections it has not collected yet. Once a second while the dialog is
+visible, it asks the collector to refresh the sections that have expired.
+Results arrive from the worker thread through section_ready, and each one
+replaces its own section's rows in place, so the static sections stay as they are.
+"""
 class SystemInfoDialog(QDialog):
-    def __init__(self, parent=None):
+    section_ready = pyqtSignal(str, object)
+
+    def __init__(self, system_info, parent=None):
         super().__init__(parent)
         self.setWindowTitle("System Information")
         self.setGeometry(100, 100, 800, 600)
+        self.system_info = system_info
+        self.section_items = {}
         layout = QVBoxLayout(self)
-        self.info_browser = QTextBrowser(self)
-        layout.addWidget(self.info_browser)
-        self.display_system_info()
+        self.tree = QTreeWidget(self)
+        self.tree.setColumnCount(2)
+        self.tree.setHeaderLabels(["Property", "Value"])
+        self.tree.header().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        layout.addWidget(self.tree)
+        button_box = QDialogButtonBox(QDialogButtonBox.Close)
+        button_box.addButton("Refresh", QDialogButtonBox.ActionRole).clicked.connect(self.refresh_all)
+        button_box.addButton("Copy", QDialogButtonBox.ActionRole).clicked.connect(self.copy)
+        button_box.rejected.connect(self.reject)
+        layout.addWidget(button_box)
+        self.section_ready.connect(self.show_section)
+        for name, rows in self.system_info.sections(self.section_ready.emit):
+            self.show_section(name, rows)
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(lambda: self.system_info.sections(self.section_ready.emit))
 
-    def display_system_info(self):
-        try:
-            process = subprocess.Popen("systeminfo", stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True, encoding="mbcs")
-            stdout, stderr = process.communicate()
-            if process.returncode == 0:
-                self.info_browser.setPlainText(stdout)
-            else:
-                self.info_browser.setPlainText(f"Error running systeminfo command: {stderr}")
-        except Exception as e:
-            self.info_browser.setPlainText(f"An error occurred: {str(e)}")
+    def show_section(self, name, rows):
+        section_item = self.section_items.get(name)
+        if section_item is None:
+            section_item = self.section_items[name] = QTreeWidgetItem([name, ""])
+            self.tree.addTopLevelItem(section_item)
+            section_item.setExpanded(True)
+        values = [("", "Loading...")] if rows is None else [(label, format_size(value) if isinstance(value, int) else value) for label, value in rows]
+        while section_item.childCount() > len(values):
+            section_item.removeChild(section_item.child(section_item.childCount() - 1))
+        for index, (label, value) in enumerate(values):
+            item = section_item.child(index)
+            if item is None:
+                item = QTreeWidgetItem()
+                section_item.addChild(item)
+            if item.text(0) != label or item.text(1) != value:
+                item.setText(0, label)
+                item.setText(1, value)
+                item.setToolTip(1, value)
+
+    def refresh_all(self):
+        self.system_info.invalidate()
+        self.system_info.sections(self.section_ready.emit)
+
+    def copy(self):
+        lines = []
+        for index in range(self.tree.topLevelItemCount()):
+            section_item = self.tree.topLevelItem(index)
+            lines.append(section_item.text(0))
+            lines += [f"    {item.text(0)}: {item.text(1)}" for item in (section_item.child(row) for row in range(section_item.childCount()))]
+        QApplication.clipboard().setText("\n".join(lines))
+
+    def showEvent(self, event):
+        self.timer.start(1000)
+        super().showEvent(event)
+
+    def hideEvent(self, event):
+        self.timer.stop()
+        super().hideEvent(event)
 
 
 
 """ Main class for the program """
 class Resmon(QMainWindow):
-    def __init__(self):
+    history_ready = pyqtSignal(int, object)
+
+    def __init__(self, record=None, replay=None, speed=1.0, connect=None, alert_rules=None, alert_log=None, startup=None):
         super().__init__()
-        self.setWindowTitle("Resmon")
+        self.startup = startup or StartupProfile(STARTED)
+        self.first_frame = False
+        self.plugins = []
+        self.plugin_columns = {}
+        self.plugins_tab = None
+        self.system_info = SystemInfo()
+        self.system_info_dialog = None
+        if replay:
+            self.setWindowTitle(f"Resmon - Replay of {os.path.basename(replay)}")
+        elif connect:
+            self.setWindowTitle(f"Resmon - {len(connect)} hosts")
+        else:
+            self.setWindowTitle("Resmon")
         self.setWindowIcon(load_icon('resmon.png'))
         self.setGeometry(100, 100, 770, 700)
         self.always_on_top = False
-        self.selected_pid = None
-        self.prev_drive = None
+        self.fetcher = None
+        self.recorder = None
+        self.replaying = replay is not None
+        self.remote_hosts = list(connect or [])
+        self.local = not self.replaying and not self.remote_hosts
+        self.history = None
+        if self.local:
+            try:
+                self.history = HistoryStore()
+            except OSError as e:
+                print(f"Metric history disabled: {e}")
+        self.inspector = ProcessInspector() if self.local else None
+        self.alerts = None
+        if not self.replaying:
+            rules, errors = parse_rules(load_rules(alert_rules))
+            for error in errors:
+                print(f"Skipping alert rule: {error}", file=sys.stderr)
+            self.alerts = AlertEngine(rules, alert_log)
+        self.tray = None
+        self.history_range = 0
+        self.history_timer = QTimer(self)
+        self.history_timer.timeout.connect(self.load_history)
+        self.history_pool = None
+        self.history_pending = False
+        self.history_ready.connect(self.apply_history)
         self.init_ui()
-        self.fetcher = ProcessFetcher()
+        if self.replaying:
+            self.fetcher = ReplayFetcher(replay, speed)
+            self.init_replay_bar(speed)
+        elif self.remote_hosts:
+            self.fetcher = RemoteFetcher(self.remote_hosts)
+            self.init_host_bar()
+        else:
+            self.fetcher = ProcessFetcher(history=self.history)
+        self.cgroups_available = self.local and self.fetcher.sampler.cgroups is not None
+        if self.cgroups_available:
+            self.process_view_box.addItem("Groups")
+        if record:
+            self.recorder = SessionRecorder(record)
+            self.recorder.attach(self.fetcher.sampler)
+        if self.alerts:
+            self.alerts.attach(self.fetcher.sampler)
+        self.update_process_columns()
         self.fetcher.update_processes.connect(self.update_process_table)
         self.fetcher.update_graphs.connect(self.update_graphs)
         self.fetcher.update_drives.connect(self.update_drives)
+        self.fetcher.update_io.connect(self.update_io)
         self.fetcher.update_stats.connect(self.update_stats)
+        self.fetcher.update_cgroups.connect(self.update_cgroups)
+        self.fetcher.update_columns.connect(self.update_columns)
+        self.fetcher.update_plugin.connect(self.update_plugin)
+        self.fetcher.update_stats.connect(lambda *args: self.startup.mark("first stats"))
+        self.fetcher.update_processes.connect(lambda *args: self.startup.mark("first processes"))
+        self.tabs.currentChanged.connect(self.update_visibility)
+        self.update_visibility()
         self.fetcher.start()
-        app_context = {"main_window": self}
-        self.plugins = load_plugins(app_context)
 
     def init_ui(self):
         loadStyle()
@@ -218,13 +534,76 @@ class Resmon(QMainWindow):
         view_system_info_action = QAction("View System Information", self)
         view_system_info_action.triggered.connect(self.view_system_info)
         options_menu.addAction(view_system_info_action)
-        self.process_table = QTableWidget(self)
-        self.process_table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.process_table.setSelectionMode(QTableWidget.SingleSelection)
-        self.process_table.setColumnCount(6)
-        self.process_table.setHorizontalHeaderLabels(["Process ID", "Program", "Threads", "User", "Memory", "CPU"])
+        refresh_processes_action = QAction("Refresh Process List", self)
+        refresh_processes_action.triggered.connect(self.refresh_processes)
+        options_menu.addAction(refresh_processes_action)
+        self.process_model = ProcessTableModel(self)
+        self.process_table = QTableView(self)
+        self.process_table.setModel(self.process_model)
+        self.process_table.setSelectionBehavior(QTableView.SelectRows)
+        self.process_table.setSelectionMode(QTableView.SingleSelection)
+        self.process_table.verticalHeader().setVisible(False)
+        self.process_table.setSortingEnabled(True)
+        self.process_table.sortByColumn(1, Qt.AscendingOrder)
         self.process_table.setContextMenuPolicy(Qt.CustomContextMenu)
         self.process_table.customContextMenuRequested.connect(self.show_process_context_menu)
+        self.process_table.setItemDelegateForColumn(HISTORY_COLUMN, SparklineDelegate(self.process_table))
+        self.process_table.selectionModel().selectionChanged.connect(self.select_process)
+        for index, column in enumerate(self.process_model.columns):
+            self.process_table.setColumnHidden(index, not column.visible)
+        self.process_query = None
+        self.process_sources = None
+        self.column_pids = []
+        column_header = self.process_table.horizontalHeader()
+        column_header.setContextMenuPolicy(Qt.CustomContextMenu)
+        column_header.customContextMenuRequested.connect(self.show_column_menu)
+        column_header.sortIndicatorChanged.connect(lambda *args: self.update_column_pids())
+        self.process_table.verticalScrollBar().valueChanged.connect(lambda *args: self.update_column_pids())
+        self.process_table.verticalScrollBar().valueChanged.connect(lambda *args: self.update_visible_rows())
+        self.active_tree = None
+        self.process_tree_model = ProcessTreeModel(self)
+        self.process_tree_proxy, self.process_tree = self.create_tree_view(self.process_tree_model)
+        self.cgroup_model = CgroupTreeModel(self)
+        self.cgroup_proxy, self.cgroup_tree = self.create_tree_view(self.cgroup_model)
+        self.processes_tab = QWidget()
+        processes_tab_layout = QVBoxLayout(self.processes_tab)
+        processes_tab_layout.setContentsMargins(0, 0, 0, 0)
+        process_bar_layout = QHBoxLayout()
+        self.process_filter = QLineEdit()
+        self.process_filter.setPlaceholderText("Filter: name, /regex/, user:name, cpu>5 mem>500MB")
+        self.process_filter.setClearButtonEnabled(True)
+        self.process_filter.textChanged.connect(self.filter_processes)
+        process_bar_layout.addWidget(self.process_filter)
+        self.process_view_box = QComboBox()
+        self.process_view_box.addItems(["List", "Tree"])
+        process_bar_layout.addWidget(self.process_view_box)
+        processes_tab_layout.addLayout(process_bar_layout)
+        self.process_views = QStackedWidget()
+        self.process_views.addWidget(self.process_table)
+        self.process_views.addWidget(self.process_tree)
+        self.process_views.addWidget(self.cgroup_tree)
+        self.process_view_box.currentIndexChanged.connect(self.select_process_view)
+        process_splitter = QSplitter(Qt.Horizontal)
+        process_splitter.addWidget(self.process_views)
+        self.process_details = ProcessDetails(self.inspector) if self.inspector else None
+        if self.process_details:
+            self.process_details.setVisible(False)
+            process_splitter.addWidget(self.process_details)
+            process_splitter.setStretchFactor(0, 3)
+            process_splitter.setStretchFactor(1, 2)
+        processes_tab_layout.addWidget(process_splitter)
+        self.process_detail = QWidget()
+        self.process_detail.setMaximumHeight(140)
+        self.process_detail.setVisible(False)
+        process_detail_layout = QHBoxLayout(self.process_detail)
+        process_detail_layout.setContentsMargins(0, 0, 0, 0)
+        history_points = self.process_model.history.length - 1
+        self.process_cpu_graph = RGraph(x_points = history_points, y_points = 100, autoscale = True, label = "CPU")
+        self.process_memory_graph = RGraph(x_points = history_points, y_points = 1024, hue_offset = 270, autoscale = True, label = "Memory")
+        process_detail_layout.addWidget(self.process_cpu_graph)
+        process_detail_layout.addWidget(self.process_memory_graph)
+        processes_tab_layout.addWidget(self.process_detail)
+        self.detail_pid = None
         splitter = QSplitter(Qt.Vertical)
         main_layout.addWidget(splitter)
         top_widget = QWidget(self)
@@ -248,45 +627,239 @@ class Resmon(QMainWindow):
             column_layout.setSpacing(0)
             column_layout.setContentsMargins(0, 0, 0, 0)
             column_layout.setAlignment(Qt.AlignVCenter)
-            return column_widget, value_label
+            return column_widget, title_label, value_label
 
-        self.cpu_column, self.cpu_label = create_stat_column("CPU")
-        self.memory_column, self.memory_label = create_stat_column("Memory")
-        self.disk_column, self.disk_label = create_stat_column(f"Disk ({psutil.disk_partitions()[0].device})")
+        self.cpu_column, _, self.cpu_label = create_stat_column("CPU")
+        self.memory_column, _, self.memory_label = create_stat_column("Memory")
+        self.disk_column, self.disk_title, self.disk_label = create_stat_column("Disk")
         stats_layout.addWidget(self.cpu_column)
         stats_layout.addWidget(self.memory_column)
         stats_layout.addWidget(self.disk_column)
         splitter.addWidget(top_widget)
         bottom_widget = QWidget(self)
         bottom_layout = QVBoxLayout(bottom_widget)
+        self.replay_bar = QWidget()
+        self.replay_bar.setVisible(False)
+        bottom_layout.addWidget(self.replay_bar)
+        self.host_bar = QWidget()
+        self.host_bar.setVisible(False)
+        bottom_layout.addWidget(self.host_bar)
         self.tabs = QTabWidget()
-        self.tabs.addTab(self.process_table, "Processes")
-        self.graphs_tab = QWidget()
-        self.graphs_tab_layout = QVBoxLayout(self.graphs_tab)
-        self.graphs_tab_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-        num_cores = psutil.cpu_count(logical=True)
+        self.lazy_tabs = {}
+        self.tabs.currentChanged.connect(self.build_lazy_tab)
+        self.tabs.addTab(self.processes_tab, "Processes")
+        self.graph_samples = deque(maxlen=61)
         self.cpu_graphs = []
-        grid_rows, grid_cols = optimal_grid(num_cores)
-        self.cpu_graph_layout = QGridLayout()
-        for i in range(num_cores):
-            cpu_graph = RGraph(x_points=60, y_points=100, hue_offset=(120 // num_cores) * i, label=f"CPU #{i}")
-            self.cpu_graphs.append(cpu_graph)
-            self.cpu_graph_layout.addWidget(cpu_graph, i // grid_cols, i % grid_cols)
-        self.graphs_tab_layout.addLayout(self.cpu_graph_layout)
-        self.memory_graph = RGraph(x_points = 60, y_points = 1024, hue_offset = 270, label = f"Memory ({memory_string()})")
-        self.graphs_tab_layout.addWidget(self.memory_graph)
-        self.graphs_tab.setLayout(self.graphs_tab_layout)
-        self.tabs.addTab(self.graphs_tab, "Graphs")
-        self.disk_tab = QWidget()
-        self.disk_tab_layout = QVBoxLayout(self.disk_tab)
-        self.disk_tab_layout.setAlignment(Qt.AlignTop)
-        self.disk_tab.setLayout(self.disk_tab_layout)
-        self.tabs.addTab(self.disk_tab, "Drives")
+        self.cpu_heatmap = None
+        self.memory_graph = None
+        self.memory_title = "Memory"
+        self.graphs_tab = self.add_lazy_tab("Graphs", self.build_graphs_tab)
+        self.drive_samples = None
+        self.io_samples = deque(maxlen=60)
+        self.disk_tab_layout = None
+        self.drive_widgets = {}
+        self.io_graphs = {}
+        self.disk_tab = self.add_lazy_tab("Drives", self.build_drives_tab)
+        if self.alerts:
+            self.alerts_tab = AlertsPanel(self.alerts)
+            self.alerts_tab.fired.connect(self.notify_alert)
+            self.alerts_tab.cleared.connect(lambda alert: self.update_alert_count())
+            self.tabs.addTab(self.alerts_tab, "Alerts")
+            if QSystemTrayIcon.isSystemTrayAvailable():
+                self.tray = QSystemTrayIcon(load_icon('resmon.png') or self.windowIcon(), self)
+                self.tray.setToolTip("Resmon")
+                self.tray.show()
+        self.diagnostics_tab = self.add_lazy_tab("Diagnostics", lambda container: QVBoxLayout(container).addWidget(DiagnosticsPanel()))
         bottom_layout.addWidget(self.tabs)
         splitter.addWidget(bottom_widget)
         self.process_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.process_tree.header().setSectionResizeMode(QHeaderView.Stretch)
+        self.cgroup_tree.header().setSectionResizeMode(QHeaderView.Stretch)
         splitter.setSizes([int(self.height() * 0.10), int(self.height() * 0.90)])
 
+    def create_tree_view(self, model):
+        proxy = ProcessSortProxy(self)
+        proxy.setSourceModel(model)
+        view = QTreeView(self)
+        view.setModel(proxy)
+        view.setSelectionBehavior(QTreeView.SelectRows)
+        view.setSelectionMode(QTreeView.SingleSelection)
+        view.setUniformRowHeights(True)
+        view.setSortingEnabled(True)
+        view.sortByColumn(0, Qt.AscendingOrder)
+        view.setContextMenuPolicy(Qt.CustomContextMenu)
+        view.customContextMenuRequested.connect(self.show_process_context_menu)
+        view.selectionModel().selectionChanged.connect(self.select_process)
+        return proxy, view
+
+    def add_lazy_tab(self, title, builder):
+        container = QWidget()
+        self.lazy_tabs[container] = builder
+        self.tabs.addTab(container, title)
+        return container
+
+    def build_lazy_tab(self, index):
+        container = self.tabs.widget(index)
+        builder = self.lazy_tabs.pop(container, None)
+        if builder is not None:
+            with PROFILER.measure(f"startup/build {self.tabs.tabText(index)} tab"):
+                builder(container)
+
+    def build_graphs_tab(self, container):
+        self.graphs_tab_layout = QVBoxLayout(container)
+        self.graphs_tab_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        self.history_range_box = QComboBox()
+        for range_name, seconds in HISTORY_RANGES:
+            self.history_range_box.addItem(range_name, seconds)
+        self.history_range_box.setEnabled(self.history is not None)
+        self.history_range_box.currentIndexChanged.connect(self.select_history_range)
+        self.graphs_tab_layout.addWidget(self.history_range_box, alignment=Qt.AlignRight)
+        self.cpu_graphs_widget = QWidget()
+        self.cpu_graph_layout = QGridLayout(self.cpu_graphs_widget)
+        self.cpu_graph_layout.setContentsMargins(0, 0, 0, 0)
+        self.graphs_tab_layout.addWidget(self.cpu_graphs_widget)
+        if self.graph_samples:
+            self.build_cpu_graphs(len(self.graph_samples[-1][0]))
+        else:
+            self.build_cpu_graphs(psutil.cpu_count(logical=True) if self.local else 0)
+        if self.local:
+            self.memory_title = f"Memory ({memory_string()})"
+        self.memory_graph = RGraph(x_points = 60, y_points = 1024, hue_offset = 270, label = self.memory_title)
+        self.graphs_tab_layout.addWidget(self.memory_graph)
+        for cpu_usages, memory_usage in self.graph_samples:
+            self.apply_graphs(cpu_usages, memory_usage)
+        self.graph_samples.clear()
+
+    def build_drives_tab(self, container):
+        container_layout = QVBoxLayout(container)
+        container_layout.setContentsMargins(0, 0, 0, 0)
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        disk_content = QWidget()
+        disk_content_layout = QVBoxLayout(disk_content)
+        disk_content_layout.setAlignment(Qt.AlignTop)
+        self.disk_tab_layout = QVBoxLayout()
+        disk_content_layout.addLayout(self.disk_tab_layout)
+        self.io_layout = QGridLayout()
+        disk_content_layout.addLayout(self.io_layout)
+        scroll_area.setWidget(disk_content)
+        container_layout.addWidget(scroll_area)
+        if self.drive_samples is not None:
+            self.apply_drives(self.drive_samples)
+        for disk_rates, nic_rates in self.io_samples:
+            self.apply_io(disk_rates, nic_rates)
+        self.drive_samples = None
+        self.io_samples.clear()
+
+    def build_cpu_graphs(self, num_cores):
+        for graph in self.cpu_graphs + ([self.cpu_heatmap] if self.cpu_heatmap else []):
+            self.cpu_graph_layout.removeWidget(graph)
+            graph.deleteLater()
+        self.cpu_graphs = []
+        self.cpu_heatmap = None
+        if num_cores > MANY_CORE_THRESHOLD:
+            self.cpu_heatmap = CoreHeatmap(cores=num_cores, x_points=60, label="CPU")
+            self.cpu_graph_layout.addWidget(self.cpu_heatmap, 0, 0)
+        elif num_cores:
+            grid_rows, grid_cols = optimal_grid(num_cores)
+            for i in range(num_cores):
+                cpu_graph = RGraph(x_points=60, y_points=100, hue_offset=(120 // num_cores) * i, label=f"CPU #{i}")
+                self.cpu_graphs.append(cpu_graph)
+                self.cpu_graph_layout.addWidget(cpu_graph, i // grid_cols, i % grid_cols)
+
+    def init_host_bar(self):
+        host_layout = QHBoxLayout(self.host_bar)
+        host_layout.setContentsMargins(0, 0, 0, 0)
+        host_layout.addWidget(QLabel("Host:"))
+        self.host_box = QComboBox()
+        for address in self.remote_hosts:
+            self.host_box.addItem(address, address)
+        self.host_box.currentIndexChanged.connect(lambda index: self.select_host(self.host_box.itemData(index)))
+        host_layout.addWidget(self.host_box, 1)
+        self.host_bar.setVisible(True)
+        self.hosts_tab = HostOverview()
+        self.hosts_tab.host_selected.connect(self.show_host)
+        self.tabs.insertTab(0, self.hosts_tab, "Hosts")
+        self.tabs.setCurrentIndex(0)
+        self.host_summaries = {}
+        self.fetcher.update_hosts.connect(self.update_hosts)
+
+    def update_hosts(self, hosts):
+        with PROFILER.measure("gui/update_hosts"):
+            self.hosts_tab.update_hosts(hosts)
+            for host in hosts:
+                self.host_summaries[host["address"]] = host
+                index = self.host_box.findData(host["address"])
+                label = host["address"] if host["name"] == host["address"] else f"{host['name']} ({host['address']})"
+                if self.host_box.itemText(index) != label:
+                    self.host_box.setItemText(index, label)
+            summary = self.host_summaries.get(self.host_box.currentData())
+            if summary and summary["memory_total"]:
+                self.memory_title = f"Memory ({summary['memory_total'] / (1024 ** 3):.2f} GB)"
+                if self.memory_graph:
+                    self.memory_graph.setLabel(self.memory_title)
+
+    def show_host(self, address):
+        self.host_box.setCurrentIndex(self.host_box.findData(address))
+        self.tabs.setCurrentWidget(self.processes_tab)
+
+    def select_host(self, address):
+        self.process_model.history.clear()
+        self.memory_title = "Memory"
+        self.graph_samples.clear()
+        self.io_samples.clear()
+        if self.memory_graph:
+            self.build_cpu_graphs(0)
+            self.memory_graph.setData([])
+            self.memory_graph.setLabel(self.memory_title)
+        for graphs in self.io_graphs.values():
+            for graph in graphs:
+                self.io_layout.removeWidget(graph)
+                graph.deleteLater()
+        self.io_graphs = {}
+        self.fetcher.select_host(address)
+
+    def init_replay_bar(self, speed):
+        reader = self.fetcher.player.reader
+        self.replay_start = reader.start_time
+        replay_layout = QHBoxLayout(self.replay_bar)
+        replay_layout.setContentsMargins(0, 0, 0, 0)
+        self.replay_button = QPushButton("Pause")
+        self.replay_button.clicked.connect(self.toggle_replay)
+        replay_layout.addWidget(self.replay_button)
+        self.replay_slider = QSlider(Qt.Horizontal)
+        self.replay_slider.setRange(0, max(1, int(reader.end_time - reader.start_time)))
+        self.replay_slider.sliderReleased.connect(self.seek_replay)
+        self.replay_slider.valueChanged.connect(self.show_replay_time)
+        replay_layout.addWidget(self.replay_slider)
+        self.replay_time_label = QLabel("")
+        replay_layout.addWidget(self.replay_time_label)
+        self.replay_speed_box = QComboBox()
+        for name, value in REPLAY_SPEEDS:
+            self.replay_speed_box.addItem(name, value)
+        self.replay_speed_box.setCurrentIndex(next((index for index, (name, value) in enumerate(REPLAY_SPEEDS) if value == speed), 1))
+        self.replay_speed_box.currentIndexChanged.connect(lambda index: self.fetcher.set_speed(self.replay_speed_box.itemData(index)))
+        replay_layout.addWidget(self.replay_speed_box)
+        self.replay_bar.setVisible(True)
+        self.fetcher.update_position.connect(self.update_replay_position)
+        self.show_replay_time(0)
+
+    def seek_replay(self):
+        self.process_model.history.clear()
+        self.fetcher.seek(self.replay_start + self.replay_slider.value())
+
+    def toggle_replay(self):
+        playing = self.replay_button.text() == "Play"
+        self.fetcher.set_playing(playing)
+        self.replay_button.setText("Pause" if playing else "Play")
+
+    def update_replay_position(self, timestamp):
+        if not self.replay_slider.isSliderDown():
+            self.replay_slider.setValue(int(timestamp - self.replay_start))
+
+    def show_replay_time(self, offset):
+        self.replay_time_label.setText(time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.replay_start + offset)))
+
     def apply_stylesheet(self):
         stylesheet_path = self.get_default_stylesheet_path()
         try:
@@ -304,110 +877,392 @@ class Resmon(QMainWindow):
         return os.path.join(base_path, 'style.css')
 
     def update_stats(self, cpu_usage, memory_usage, disk_usage):
+        self.fetcher.delivered("update_stats")
         self.cpu_label.setText(f"{cpu_usage:.1f}%")
         self.memory_label.setText(f"{memory_usage:.1f}%")
         self.disk_label.setText(disk_usage)
 
-    def update_process_table(self, process_data):
-        self.process_table.setRowCount(0)
-        sorted_process_data = sorted(process_data, key=lambda x: x[1].lower())
-        row_to_select = None
-        for index, process in enumerate(sorted_process_data):
-            process_id = process[0]
-            program_name = process[1]
-            threads = process[2]
-            user = process[3]
-            memory = process[4]
-            cpu = process[5]
-            if not program_name:
+    def update_process_table(self, added, removed, changed, reset):
+        self.fetcher.delivered("update_processes")
+        with PROFILER.measure("gui/update_process_table"):
+            self.process_model.apply_delta(added, removed, changed, reset)
+            if self.active_tree:
+                self.active_tree.apply_delta(added, removed, changed, reset)
+            if self.inspector:
+                for pid in removed:
+                    self.inspector.forget(pid)
+            self.update_process_detail()
+            self.update_column_pids()
+            self.update_visible_rows()
+
+    def update_columns(self, values):
+        self.fetcher.delivered("update_columns")
+        with PROFILER.measure("gui/update_columns"):
+            self.process_model.apply_columns(values, EXTRA_COLUMNS.values())
+
+    def show_column_menu(self, position):
+        costs = PROFILER.summary()
+        menu = QMenu(self)
+        for index, column in enumerate(self.process_model.columns):
+            if column.key == "name" or (column.source and column.source not in WALK_SOURCES and not self.local):
                 continue
-            row_position = self.process_table.rowCount()
-            self.process_table.insertRow(row_position)
-            self.process_table.setItem(row_position, 0, QTableWidgetItem(str(process_id)))
-            self.process_table.setItem(row_position, 1, QTableWidgetItem(program_name))
-            self.process_table.setItem(row_position, 2, QTableWidgetItem(str(threads)))
-            self.process_table.setItem(row_position, 3, QTableWidgetItem(user))
-            self.process_table.setItem(row_position, 4, QTableWidgetItem(f"{memory:.2f} MB"))
-            self.process_table.setItem(row_position, 5, QTableWidgetItem(f"{cpu:.1f}%"))
-            if self.selected_pid and self.selected_pid == process_id:
-                row_to_select = row_position
-        if row_to_select is not None:
-            self.process_table.selectRow(row_to_select)
+            cost = costs.get(column.source if column.source in self.plugin_columns else f"column/{column.source}", {}).get("p50")
+            label = column.header if cost is None else f"{column.header} ({cost * 1000:.2f} ms per collection)"
+            action = QAction(label, menu, checkable=True)
+            action.setChecked(not self.process_table.isColumnHidden(index))
+            action.toggled.connect(lambda checked, index=index: self.set_column_visible(index, checked))
+            menu.addAction(action)
+        menu.exec_(self.process_table.horizontalHeader().mapToGlobal(position))
+
+    def set_column_visible(self, index, visible):
+        self.process_table.setColumnHidden(index, not visible)
+        self.update_process_columns()
+        self.update_column_pids()
+
+    def update_process_columns(self):
+        if not self.local:
+            return
+        sources = {column.source for index, column in enumerate(self.process_model.columns) if column.source and not self.process_table.isColumnHidden(index)}
+        for key, collector in self.plugin_columns.items():
+            self.fetcher.plugin_host.set_paused(collector, key not in sources)
+        sources -= self.plugin_columns.keys()
+        if self.process_query:
+            sources |= {source for row, source in ((2, "threads"), (3, "user")) if row in self.process_query.columns}
+        if self.recorder or self.active_tree:
+            sources |= WALK_SOURCES
+        if sources != self.process_sources:
+            self.process_sources = sources
+            self.fetcher.set_process_columns(sources)
+
+    def update_column_pids(self):
+        if not self.local or self.active_tree or all(self.process_table.isColumnHidden(index) for index in self.process_model.extra_columns):
+            pids = []
+        elif self.process_model.sorted_by_extra():
+            pids = None
+        else:
+            first = self.process_table.rowAt(0)
+            last = self.process_table.rowAt(self.process_table.viewport().height() - 1)
+            if last < 0:
+                last = self.process_model.rowCount() - 1
+            pids = [self.process_model.pid_at(row) for row in range(first, last + 1)] if first >= 0 else []
+        if pids != self.column_pids:
+            self.column_pids = pids
+            self.fetcher.set_column_pids(pids)
+
+    def update_visible_rows(self):
+        if not self.process_table.isVisible():
+            self.process_model.set_visible_rows(0, -1)
+            return
+        first = self.process_table.rowAt(0)
+        last = self.process_table.rowAt(self.process_table.viewport().height() - 1)
+        self.process_model.set_visible_rows(first, self.process_model.rowCount() - 1 if last < 0 else last)
+
+    def select_process(self):
+        rows = self.process_views.currentWidget().selectionModel().selectedRows()
+        pid = rows[0].data(PID_ROLE) if rows else None
+        if pid is not None and pid < 0:
+            pid = None
+        self.detail_pid = pid
+        self.process_model.history.pin(pid)
+        process = self.process_model.process(pid)
+        if process is not None:
+            if pid not in self.process_model.history:
+                self.process_model.history.record(pid, process[5], process[4])
+            self.process_cpu_graph.setLabel(f"CPU - {process[1]} ({pid})")
+            self.process_memory_graph.setLabel(f"Memory (MB) - {process[1]} ({pid})")
+        if self.process_details:
+            self.process_details.show_process(pid)
+        self.update_process_detail()
+
+    def update_process_detail(self):
+        series = self.process_model.history.series(self.detail_pid) if self.detail_pid is not None else None
+        self.process_detail.setVisible(series is not None)
+        if series is None:
+            return
+        cpu, memory = series
+        self.process_cpu_graph.setData(cpu)
+        self.process_memory_graph.setData(memory)
+
+    def filter_processes(self, text):
+        try:
+            query = ProcessQuery(text)
+        except ValueError as e:
+            self.process_filter.setStyleSheet("QLineEdit { border: 1px solid red; }")
+            self.process_filter.setToolTip(str(e))
+            return
+        self.process_filter.setStyleSheet("")
+        self.process_filter.setToolTip("")
+        self.process_query = query if query else None
+        self.update_process_columns()
+        with PROFILER.measure("gui/filter_processes"):
+            selected = [row.data(PID_ROLE) for row in self.process_table.selectionModel().selectedRows()]
+            self.process_model.set_query(query)
+            for pid in selected:
+                row = self.process_model.row_of(pid)
+                if row is not None:
+                    self.process_table.selectRow(row)
+            if self.active_tree:
+                self.active_tree_proxy().set_filter(self.process_model.matches if query else None)
+
+    def active_tree_proxy(self):
+        return self.cgroup_proxy if self.active_tree is self.cgroup_model else self.process_tree_proxy
+
+    def select_process_view(self, index):
+        if self.active_tree:
+            self.active_tree_proxy().set_filter(None)
+            self.active_tree.apply_delta([], [], [], True)
+        view = self.process_views.widget(index)
+        self.active_tree = {self.process_tree: self.process_tree_model, self.cgroup_tree: self.cgroup_model}.get(view)
+        if self.active_tree:
+            self.active_tree.apply_delta(self.process_model.processes(), [], [], True)
+            view.expandToDepth(0)
+        self.process_views.setCurrentIndex(index)
+        self.select_process()
+        if self.active_tree and self.process_filter.text().strip():
+            self.active_tree_proxy().set_filter(self.process_model.matches)
+        self.update_process_columns()
+        self.update_column_pids()
+        self.update_visibility()
+
+    def update_cgroups(self, groups, assigned, reset):
+        self.fetcher.delivered("update_cgroups")
+        with PROFILER.measure("gui/update_cgroups"):
+            self.cgroup_model.apply_groups(groups, assigned, reset)
+            if reset:
+                self.cgroup_tree.expandToDepth(0)
 
     def update_graphs(self, cpu_usages, memory_usage):
-        for i, usage in enumerate(cpu_usages):
-            self.cpu_graphs[i].updateLatestDatapoint(usage)
+        self.fetcher.delivered("update_graphs")
+        if self.memory_graph is None:
+            self.graph_samples.append((cpu_usages, memory_usage))
+            return
+        with PROFILER.measure("gui/update_graphs"):
+            self.apply_graphs(cpu_usages, memory_usage)
+
+    def apply_graphs(self, cpu_usages, memory_usage):
+        if len(cpu_usages) != (self.cpu_heatmap.cores if self.cpu_heatmap else len(self.cpu_graphs)):
+            self.build_cpu_graphs(len(cpu_usages))
+        if self.cpu_heatmap:
+            self.cpu_heatmap.updateLatestDatapoints(cpu_usages)
+        for graph, usage in zip(self.cpu_graphs, cpu_usages):
+            graph.updateLatestDatapoint(usage)
         self.memory_graph.updateLatestDatapoint(memory_usage)
 
-    def update_drives(self, drive_data):
-        if drive_data == self.prev_drive:
+    def select_history_range(self, index):
+        self.history_range = self.history_range_box.itemData(index)
+        if self.history_range:
+            self.load_history()
+            self.history_timer.start(10000)
             return
-        self.prev_drive = drive_data
-        disks = drive_data
-        for i in reversed(range(self.disk_tab_layout.count())):
-            self.disk_tab_layout.itemAt(i).widget().setParent(None)
-        for disk in disks:
-            drive_path = disk.device
-            try:
-                disk_info = psutil.disk_usage(drive_path)
-            except PermissionError:
-                continue
-            except OSError:
-                continue
-            disk_container = QVBoxLayout()
-            disk_container.setAlignment(Qt.AlignTop | Qt.AlignLeft)
-            disk_info = psutil.disk_usage(disk[1])
-            total_disk = disk_info.total
-            used_disk = disk_info.used
-            used_percentage = used_disk / total_disk * 100
-            used_percentage_100k = used_disk / total_disk * 100000
-
-            def format_size(size):
-                for unit in ['B', 'KB', 'MB', 'GB', 'TB', 'PB', 'EB', 'ZB', 'YB']:
-                    if size < 1024:
-                        return f"{size:.2f} {unit}"
-                    size /= 1024
-                return f"{size:.2f} YB"
-
-            total_disk_display = format_size(total_disk)
-            used_disk_display = format_size(used_disk)
-            disk_display = f"{used_disk_display}/{total_disk_display} ({used_percentage:.1f}%)"
-            disk_label = QLabel(f"{disk.device} ({disk.mountpoint})")
-            disk_label.setFont(QFont("Arial", 14, QFont.Bold))
-            disk_container.addWidget(disk_label)
-            filled_disk = QProgressBar()
-            filled_disk.setRange(0, 100000)
-            filled_disk.setValue(round(used_percentage_100k))
-            if used_percentage > 90:
-                filled_disk.setStyleSheet("QProgressBar::chunk { background-color: red; }")
-            filled_disk.setTextVisible(False)
-            disk_container.addWidget(filled_disk)
-            disk_usage_label = QLabel(disk_display)
-            disk_usage_label.setFont(QFont("Arial", 12))
-            disk_container.addWidget(disk_usage_label)
-            disk_widget = QWidget()
-            disk_widget.setLayout(disk_container)
-            self.disk_tab_layout.addWidget(disk_widget)
+        self.history_timer.stop()
+        if self.cpu_heatmap:
+            self.cpu_heatmap.setHistory(None)
+        for graph in self.cpu_graphs:
+            graph.setHistory(None)
+        self.memory_graph.setHistory(None)
 
-    def start_process(self):
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Start a Process")
-        layout = QFormLayout(dialog)
-        process_input = QLineEdit()
-        layout.addRow("Run:", process_input)
-        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
-        buttons.accepted.connect(lambda: self.run_process(dialog, process_input.text()))
-        buttons.rejected.connect(dialog.reject)
-        layout.addWidget(buttons)
-        dialog.exec_()
-
-    def run_process(self, dialog, command):
-        if command:
+    def load_history(self):
+        if not self.history_range or self.history_pending:
+            return
+        if self.history_pool is None:
+            self.history_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="history")
+        self.history_pending = True
+        cores = self.cpu_heatmap.cores if self.cpu_heatmap else len(self.cpu_graphs)
+        self.history_pool.submit(self.read_history, self.history_range, cores)
+
+    def read_history(self, seconds, cores):
+        max_points = 600
+        try:
+            with PROFILER.measure("collector/history"):
+                cpu = [self.history.read_window(f"cpu{i}", seconds, max_points) for i in range(cores)]
+                memory = self.history.read_window("memory", seconds, max_points)
+            series = (cpu, memory)
+        except (OSError, ValueError) as e:
+            print(f"Could not read the metric history: {e}")
+            series = None
+        self.history_ready.emit(seconds, series)
+
+    def apply_history(self, seconds, series):
+        self.history_pending = False
+        if seconds != self.history_range:
+            self.load_history()
+            return
+        if series is None:
+            return
+        cpu, memory = series
+        with PROFILER.measure("gui/apply_history"):
+            if self.cpu_heatmap and len(cpu) == self.cpu_heatmap.cores:
+                self.cpu_heatmap.setHistory(cpu)
+            for graph, values in zip(self.cpu_graphs, cpu):
+                graph.setHistory(values)
+            self.memory_graph.setHistory(memory)
+
+    def notify_alert(self, alert):
+        self.update_alert_count()
+        if self.tray:
+            self.tray.showMessage("Resmon alert", alert.describe(), QSystemTrayIcon.Warning, 10000)
+
+    def update_alert_count(self):
+        firing = len(self.alerts_tab.active)
+        self.tabs.setTabText(self.tabs.indexOf(self.alerts_tab), f"Alerts ({firing})" if firing else "Alerts")
+
+    def update_visibility(self):
+        if self.fetcher is None:
+            return
+        hidden = self.isMinimized() or not self.isVisible()
+        if self.cgroups_available:
+            self.fetcher.set_cgroups_paused(hidden or self.tabs.currentWidget() is not self.processes_tab or self.active_tree is not self.cgroup_model)
+        if self.recorder:
+            return
+        idle = hidden or self.tabs.currentWidget() is not self.processes_tab
+        watched = self.alerts is not None and "processes" in self.alerts.collectors()
+        self.fetcher.set_backoff(MINIMIZED_BACKOFF if hidden else 1.0)
+        self.fetcher.set_processes_paused(idle and not watched)
+        self.fetcher.set_processes_slowed(idle and watched)
+
+    def changeEvent(self, event):
+        if event.type() == QEvent.WindowStateChange:
+            self.update_visibility()
+        super().changeEvent(event)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.update_visibility()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_frame:
+            self.first_frame = True
+            self.startup.mark("first frame")
+            self.system_info.sections()
+            QTimer.singleShot(0, self.start_plugins)
+
+    def start_plugins(self):
+        try:
+            self.plugin_queue, self.plugin_manifest = discover_plugins()
+        except OSError as e:
+            print(f"Plugins disabled: {e}")
+            self.plugin_queue, self.plugin_manifest = [], None
+        self.load_next_plugin()
+
+    def load_next_plugin(self):
+        if not self.plugin_queue:
+            if self.plugin_manifest is not None:
+                save_plugin_manifest(self.plugin_manifest)
+            self.startup.mark("plugins loaded")
+            return
+        filename, plugin_path, signature = self.plugin_queue.pop(0)
+        plugin = os.path.splitext(filename)[0]
+        with PROFILER.measure(f"startup/plugin {filename}"):
+            result = load_plugin(filename, plugin_path, {"main_window": self, "collectors": PluginAPI(self.fetcher.plugin_host, plugin, self)})
+        if result is not None:
+            self.plugin_manifest[filename] = {"signature": signature, "plugin": result}
+        if result:
+            self.plugins.append(plugin)
+        QTimer.singleShot(0, self.load_next_plugin)
+
+    def show_plugins_tab(self):
+        if self.plugins_tab is None:
+            self.plugins_tab = PluginsPanel(self.fetcher.plugin_host)
+            self.tabs.insertTab(self.tabs.indexOf(self.diagnostics_tab), self.plugins_tab, "Plugins")
+        return self.plugins_tab
+
+    def add_plugin_collector(self, collector, callback):
+        self.show_plugins_tab()
+        return callback
+
+    def add_plugin_series(self, collector, label, unit, maximum, autoscale):
+        return self.show_plugins_tab().add_series(label, unit, maximum, autoscale)
+
+    def add_plugin_column(self, collector, header):
+        self.show_plugins_tab()
+        key = collector.key
+        self.plugin_columns[key] = collector
+        self.process_model.add_column(ProcessColumn(key, header, source=key))
+        self.update_process_columns()
+        self.update_column_pids()
+        return lambda values: self.process_model.apply_columns({pid: {key: value} for pid, value in values.items()}, (key,))
+
+    def update_plugin(self, collector, value):
+        self.fetcher.delivered("update_plugin")
+        if collector.target is None or collector.state == "disabled":
+            return
+        with PROFILER.measure("gui/update_plugin"):
             try:
-                os.startfile(command)
-                dialog.accept()
+                collector.target(value)
             except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to start process: {e}")
+                self.fetcher.plugin_host.disable(collector, f"could not show its result: {e}")
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_visibility()
+
+    def closeEvent(self, event):
+        if self.history_pool:
+            self.history_pool.shutdown(wait=False, cancel_futures=True)
+        if self.history:
+            self.history.flush()
+        if self.recorder:
+            self.recorder.close()
+        if self.inspector:
+            self.inspector.close()
+        if self.alerts:
+            self.alerts.close()
+        if self.fetcher and self.fetcher.plugin_host:
+            self.fetcher.plugin_host.close()
+        self.system_info.close()
+        if self.tray:
+            self.tray.hide()
+        super().closeEvent(event)
+
+    def update_drives(self, drive_data):
+        self.fetcher.delivered("update_drives")
+        if self.local and drive_data and self.disk_title.text() == "Disk":
+            self.disk_title.setText(f"Disk ({drive_data[0][0]})")
+        if self.disk_tab_layout is None:
+            self.drive_samples = drive_data
+            return
+        with PROFILER.measure("gui/update_drives"):
+            self.apply_drives(drive_data)
+
+    def apply_drives(self, drive_data):
+        seen = set()
+        for device, mountpoint, total, used, status in drive_data:
+            seen.add(mountpoint)
+            widget = self.drive_widgets.get(mountpoint)
+            if widget is None:
+                widget = self.drive_widgets[mountpoint] = DriveWidget(device, mountpoint)
+                self.disk_tab_layout.addWidget(widget)
+            widget.set_usage(total, used, status)
+        for mountpoint in [mountpoint for mountpoint in self.drive_widgets if mountpoint not in seen]:
+            self.drive_widgets.pop(mountpoint).deleteLater()
+
+    def update_io(self, disk_rates, nic_rates):
+        self.fetcher.delivered("update_io")
+        if self.disk_tab_layout is None:
+            self.io_samples.append((disk_rates, nic_rates))
+            return
+        with PROFILER.measure("gui/update_io"):
+            self.apply_io(disk_rates, nic_rates)
+
+    def apply_io(self, disk_rates, nic_rates):
+        for kind, rates, directions in (("Disk", disk_rates, ("read", "write")), ("Network", nic_rates, ("received", "sent"))):
+            for name, values in rates.items():
+                graphs = self.io_graphs.get((kind, name))
+                if graphs is None:
+                    row = len(self.io_graphs)
+                    graphs = self.io_graphs[(kind, name)] = [
+                        RGraph(x_points=60, y_points=100, max=64 * 1024, hue_offset=60 * column, autoscale=True)
+                        for column in range(2)
+                    ]
+                    for column, graph in enumerate(graphs):
+                        self.io_layout.addWidget(graph, row, column)
+                for graph, direction, value in zip(graphs, directions, values):
+                    graph.updateLatestDatapoint(value)
+                    graph.setLabel(f"{kind} {name} {direction}: {format_size(value)}/s")
+
+    def start_process(self):
+        StartProcessDialog(self).exec_()
 
     def toggle_always_on_top(self):
         self.always_on_top = not self.always_on_top
@@ -418,22 +1273,29 @@ class Resmon(QMainWindow):
             self.setWindowFlags(flags & ~Qt.WindowStaysOnTopHint)
         self.show()
 
-    def view_system_info(self):
-        dialog = SystemInfoDialog(self)
-        dialog.exec_()
+    def refresh_processes(self):
+        self.fetcher.request_resync()
 
     def show_process_context_menu(self, position):
-        selected_rows = self.process_table.selectionModel().selectedRows()
-        if not selected_rows:
+        view = self.process_views.currentWidget()
+        selected_rows = view.selectionModel().selectedRows()
+        if not selected_rows or not self.local:
+            return
+        self.selected_pids = [row.data(PID_ROLE) for row in selected_rows if row.data(PID_ROLE) >= 0]
+        if not self.selected_pids:
             return
-        self.selected_pids = [
-            int(self.process_table.item(row.row(), 0).text()) for row in selected_rows
-        ]
         menu = QMenu(self)
+        properties_action = QAction("Properties", self)
+        properties_action.triggered.connect(lambda: self.show_process_details(self.selected_pids[0]))
+        menu.addAction(properties_action)
         terminate_action = QAction("Force Terminate", self)
         terminate_action.triggered.connect(self.force_terminate_selected_processes)
         menu.addAction(terminate_action)
-        menu.exec_(self.process_table.viewport().mapToGlobal(position))
+        menu.exec_(view.viewport().mapToGlobal(position))
+
+    def show_process_details(self, pid):
+        self.process_details.setVisible(True)
+        self.process_details.show_process(pid)
 
     def force_terminate_selected_processes(self):
         for pid in self.selected_pids:
@@ -443,21 +1305,10 @@ class Resmon(QMainWindow):
             except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
                 pass
 
-    def start_process(self):
-        dialog = StartProcessDialog(self)
-        if dialog.exec_():
-            self.fetcher.start()
-
-    def toggle_always_on_top(self):
-        self.always_on_top = not self.always_on_top
-        self.setWindowFlags(
-            Qt.WindowStaysOnTopHint if self.always_on_top else Qt.Window
-        )
-        self.show()
-
     def view_system_info(self):
-        dialog = SystemInfoDialog(self)
-        dialog.exec_()
+        if self.system_info_dialog is None:
+            self.system_info_dialog = SystemInfoDialog(self.system_info, self)
+        self.system_info_dialog.exec_()
 
 
 
@@ -481,8 +1332,37 @@ class StartProcessDialog(QDialog):
             subprocess.Popen(process_name)
         super().accept()
 
+""" Utility function for parsing the GUI command line, leaving Qt's own options alone """
+def parse_args(argv):
+    parser = argparse.ArgumentParser(prog="resmon", description="A fast, lightweight system resource monitor.")
+    parser.add_argument("--record", metavar="FILE", help="record every sample to a session file while running")
+    parser.add_argument("--replay", metavar="FILE", help="replay a recorded session instead of monitoring this machine")
+    parser.add_argument("--speed", type=float, default=1.0, help="replay speed multiplier (0 plays as fast as possible)")
+    parser.add_argument("--connect", nargs="+", metavar="ADDRESS", help="watch Resmon agents at host:port or unix:/path instead of this machine")
+    parser.add_argument("--alert-rule", action="append", metavar="RULE", help='alert rule such as "process cpu > 90 for 30s" (repeatable; replaces ~/resmonalerts.txt and the defaults)')
+    parser.add_argument("--alert-log", metavar="FILE", help="append fired and cleared alerts to a log file")
+    parser.add_argument("--startup-profile", action="store_true", help="print how long imports, window construction, the first frame, the first data and plugins took")
+    args, _ = parser.parse_known_args(argv)
+    if args.replay and args.connect:
+        parser.error("--replay and --connect cannot be combined")
+    if args.record and args.replay:
+        parser.error("--record and --replay cannot be combined")
+    return args
+
+
+
 if __name__ == "__main__":
+    args = parse_args(sys.argv[1:])
+    expected = ["first frame", "first stats", "plugins loaded"] + ([] if args.replay or args.connect else ["first processes"])
+    startup = StartupProfile(STARTED, expected, report=args.startup_profile)
+    startup.mark("imports")
     app = QApplication(sys.argv)
-    window = Resmon()
+    startup.mark("application")
+    try:
+        window = Resmon(record=args.record, replay=args.replay, speed=args.speed, connect=args.connect, alert_rules=args.alert_rule, alert_log=args.alert_log, startup=startup)
+    except (OSError, ValueError) as e:
+        QMessageBox.critical(None, "Resmon", str(e))
+        sys.exit(1)
+    startup.mark("window")
     window.show()
     sys.exit(app.exec_())
@@ -0,0 +1,176 @@
+""" Import the necessary modules for these tests """
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from components.alerts import DEFAULT_RULES, GROWTH_STEP, AlertEngine, AlertRule, load_rules, parse_rules
+
+
+
+""" Test that a rule with units, a duration and a clear level parses """
+def test_rule_with_everything():
+    rule = AlertRule("Process   memory >= 2GB for 5m clear 1.5gb")
+    assert rule.text == "Process memory >= 2GB for 5m clear 1.5gb"
+    assert (rule.scope, rule.metric) == ("process", "memory")
+    assert rule.threshold == 2048
+    assert rule.duration == 300
+    assert rule.clear == 1536
+
+
+
+""" Test the defaults for duration and the hysteresis clear level """
+@pytest.mark.parametrize("text, threshold, duration, clear", [
+    ("drive usage > 90", 90, 0, 81),
+    ("system cpu < 10 for 30", 10, 30, 11),
+    ("process cpu > 90% for 1h", 90, 3600, 81),
+    ("process growth > 100/min for 60s", 100, 60, 90),
+    ("process memory > 512 mb", 512, 0, 512 * 0.9),
+])
+def test_rule_defaults(text, threshold, duration, clear):
+    rule = AlertRule(text)
+    assert rule.threshold == pytest.approx(threshold)
+    assert rule.duration == duration
+    assert rule.clear == pytest.approx(clear)
+
+
+
+""" Test that malformed rules raise ValueError """
+@pytest.mark.parametrize("text", [
+    "",
+    "process cpu",
+    "process cpu > ninety",
+    "network usage > 5",
+    "drive memory > 5",
+    "process cpu > 5gb",
+    "process cpu > 5 for 10 days",
+    "process cpu = 5",
+])
+def test_rule_rejects_malformed_text(text):
+    with pytest.raises(ValueError):
+        AlertRule(text)
+
+
+
+""" Test that parse_rules keeps the good rules and reports the bad ones """
+def test_parse_rules_skips_bad_rules():
+    rules, errors = parse_rules(["process cpu > 90", "bogus", "drive usage > 80"])
+    assert [rule.text for rule in rules] == ["process cpu > 90", "drive usage > 80"]
+    assert len(errors) == 1 and "bogus" in errors[0]
+
+
+
+""" Test where rules are read from """
+def test_load_rules(tmp_path):
+    path = tmp_path / "rules.txt"
+    assert load_rules(path=str(path)) == DEFAULT_RULES
+    path.write_text("# comment\n\nprocess cpu > 50\n")
+    assert load_rules(path=str(path)) == ["process cpu > 50"]
+    path.write_text("")
+    assert load_rules(path=str(path)) == []
+    assert load_rules(["system cpu > 1"], path=str(path)) == ["system cpu > 1"]
+
+
+
+""" Define a fixture for a controllable monotonic clock seen by the alert engine """
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr("components.alerts.time", SimpleNamespace(
+        monotonic=lambda: now[0], time=time.time, perf_counter=time.perf_counter,
+        strftime=time.strftime, localtime=time.localtime,
+    ))
+    return now
+
+
+
+""" Define a process row helper, in the order [pid, name, threads, user, memory, cpu, ppid] """
+def row(pid, cpu=0.0, memory=10.0):
+    return [pid, f"proc{pid}", 1, "user", memory, cpu, 1]
+
+
+
+""" Utility function for recording what an engine fires and clears """
+def watch(engine):
+    log = []
+    engine.connect("fired", lambda alert: log.append(("fired", alert.key)))
+    engine.connect("cleared", lambda alert: log.append(("cleared", alert.key, alert.reason)))
+    return log
+
+
+
+""" Test that a rule fires only after its duration and clears past the hysteresis level """
+def test_engine_duration_and_hysteresis(clock, tmp_path):
+    engine = AlertEngine(["process cpu > 50 for 10s"], tmp_path / "alerts.log")
+    log = watch(engine)
+    engine.on_processes([row(1, cpu=60.0)], [], [])
+    clock[0] += 5
+    engine.on_processes([], [], [(1, {5: 70.0})])
+    assert log == []
+    clock[0] += 5
+    engine.on_processes([], [], [(1, {5: 70.0})])
+    assert log == [("fired", 1)]
+    engine.on_processes([], [], [(1, {5: 48.0})])
+    assert log == [("fired", 1)]
+    engine.on_processes([], [], [(1, {5: 44.0})])
+    assert log == [("fired", 1), ("cleared", 1, None)]
+    engine.close()
+    lines = (tmp_path / "alerts.log").read_text().splitlines()
+    assert [line.split()[1] for line in lines] == ["FIRED", "CLEARED"]
+
+
+
+""" Test that dipping below the threshold restarts the duration """
+def test_engine_dip_resets_pending(clock):
+    engine = AlertEngine(["process cpu > 50 for 10s"])
+    log = watch(engine)
+    engine.on_processes([row(1, cpu=60.0)], [], [])
+    clock[0] += 8
+    engine.on_processes([], [], [(1, {5: 10.0})])
+    clock[0] += 1
+    engine.on_processes([], [], [(1, {5: 60.0})])
+    clock[0] += 8
+    engine.on_processes([], [], [(1, {5: 61.0})])
+    assert log == []
+
+
+
+""" Test that exited processes clear their alerts and free their slots for reuse """
+def test_engine_exit_and_reset(clock):
+    engine = AlertEngine(["process cpu > 50"])
+    log = watch(engine)
+    engine.on_processes([row(1, cpu=90.0), row(2, cpu=90.0)], [], [])
+    engine.on_processes([], [1], [])
+    assert log == [("fired", 1), ("fired", 2), ("cleared", 1, "exited")]
+    engine.on_processes([row(3)], [], [], True)
+    assert log[-1] == ("cleared", 2, "exited")
+    assert engine.active() == []
+    assert list(engine.slot_of) == [3]
+    assert len(engine.cpu) == 2
+
+
+
+""" Test that growth is measured over the window, so a steady climb fires """
+def test_engine_growth(clock):
+    engine = AlertEngine(["process growth > 100 for 30s"])
+    log = watch(engine)
+    engine.on_processes([row(1, memory=100.0), row(2, memory=100.0)], [], [])
+    memory = 100.0
+    for _ in range(6):
+        clock[0] += GROWTH_STEP
+        memory += 50.0
+        engine.on_processes([], [], [(1, {4: memory})])
+    assert log == [("fired", 1)]
+    assert engine.process_values("growth", [1, 2], clock[0]) == pytest.approx([200.0, 0.0])
+
+
+
+""" Test that system and drive rules evaluate their own events """
+def test_engine_system_and_drives(clock):
+    engine = AlertEngine(["system memory > 90", "drive usage > 80"])
+    log = watch(engine)
+    assert engine.collectors() == {"cpu", "partitions", "drives"}
+    engine.on_cpu(5.0, [5.0], 95.0)
+    engine.on_drives([("sda1", "/", 100, 85, "OK"), ("sdb1", "/data", 0, 0, "OK")])
+    engine.on_drives([])
+    assert log == [("fired", "System"), ("fired", "/"), ("cleared", "/", "removed")]
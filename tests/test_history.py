@@ -0,0 +1,151 @@
+""" Import the necessary modules for these tests """
+import pytest
+
+from components.history import HistoryStore, HistoryWindow, downsample
+
+
+
+""" Define small tiers so the tests can cover every tier and wrap the rings """
+TIERS = [(1, 60), (10, 60), (60, 60)]
+
+
+
+""" Define a fixture for a history store in a temporary directory """
+@pytest.fixture
+def store(tmp_path):
+    history = HistoryStore(str(tmp_path), TIERS)
+    yield history
+    history.close()
+
+
+
+""" Test that samples read back from the finest tier and roll up into the coarser ones """
+def test_record_and_roll_up(store):
+    for second in range(20):
+        store.record("cpu", float(second), 1000 + second)
+    store.flush()
+    series = store.get_series("cpu")
+    assert series.read(0, 1000, 1002) == [(1000, 0.0, 0.0, 0.0), (1001, 1.0, 1.0, 1.0), (1002, 2.0, 2.0, 2.0)]
+    assert series.read(1, 1000, 1019) == [(1000, 0.0, 9.0, 4.5), (1010, 10.0, 19.0, 14.5)]
+    assert series.read(2, 960, 1019) == [(960, 0.0, 19.0, 9.5)]
+
+
+
+""" Test that samples in one slot are merged into its min, max and average """
+def test_samples_in_one_slot_merge(store):
+    for value in (1.0, 5.0, 3.0):
+        store.record("cpu", value, 1000.5)
+    assert store.get_series("cpu").read(0, 1000, 1000) == [(1000, 1.0, 5.0, 3.0)]
+
+
+
+""" Test that flushing twice during one bucket only rolls up what was added since """
+def test_repeated_flush_rolls_up_once(store):
+    for second in range(5):
+        store.record("cpu", 1.0, 1000 + second)
+    store.flush()
+    for second in range(5, 10):
+        store.record("cpu", 3.0, 1000 + second)
+    store.flush()
+    store.flush()
+    assert store.get_series("cpu").read(1, 1000, 1009) == [(1000, 1.0, 3.0, 2.0)]
+
+
+
+""" Test that a restart within a bucket carries on from what is on disk """
+def test_restart_merges_open_buckets(tmp_path):
+    first = HistoryStore(str(tmp_path), TIERS)
+    first.record("cpu", 2.0, 1000)
+    first.record("cpu", 2.0, 1001)
+    first.close()
+    second = HistoryStore(str(tmp_path), TIERS)
+    second.record("cpu", 5.0, 1001)
+    second.record("cpu", 8.0, 1005)
+    second.flush()
+    series = second.get_series("cpu")
+    assert series.read(0, 1001, 1001) == [(1001, 2.0, 5.0, 3.5)]
+    low, high, average = series.read(1, 1000, 1009)[0][1:]
+    assert (low, high, average) == (2.0, 8.0, pytest.approx(17.0 / 4))
+    second.close()
+
+
+
+""" Test that slots left from an earlier lap of the ring are not read as current """
+def test_stale_slots_are_skipped(store):
+    store.record("cpu", 1.0, 1000)
+    store.record("cpu", 2.0, 1060)
+    store.flush()
+    assert store.get_series("cpu").read(0, 1000, 1060) == [(1060, 2.0, 2.0, 2.0)]
+
+
+
+""" Test that a file with another tier layout is started afresh """
+def test_changed_layout_resets_file(tmp_path):
+    store = HistoryStore(str(tmp_path), TIERS)
+    store.record("cpu", 1.0, 1000)
+    store.close()
+    other = HistoryStore(str(tmp_path), [(1, 30)])
+    assert other.get_series("cpu").read(0, 990, 1010) == []
+    other.close()
+
+
+
+""" Test that read() picks the tier for the range and leaves gaps as None """
+def test_read_range(store):
+    store.record("cpu", 4.0, 1000)
+    store.record("cpu", 6.0, 1002)
+    assert store.tier_for(60) == 0
+    assert store.tier_for(61) == 1
+    assert store.tier_for(10 ** 9) == 2
+    assert store.read("cpu", 3, now=1003) == [4.0, None, 6.0, None]
+    assert store.read("cpu", 3, max_points=2, now=1003) == [4.0, 6.0]
+
+
+
+""" Test that downsampling averages each group and ignores gaps """
+def test_downsample():
+    assert downsample([1.0, 3.0, None, None, 5.0, None], 3) == [2.0, None, 5.0]
+
+
+
+""" Utility function for the values a window should show, computed from scratch """
+def expected_window(series, resolution, seconds, max_points, end):
+    window = HistoryWindow(resolution, seconds, max_points)
+    first = end - seconds
+    first -= first % window.span
+    sums = {}
+    for stamp, low, high, average in series.read(0, first, end):
+        entry = sums.setdefault(stamp - stamp % window.span, [0.0, 0])
+        entry[0] += average
+        entry[1] += 1
+    return [sums[point][0] / sums[point][1] if point in sums else None for point in range(first, end + 1, window.span)]
+
+
+
+""" Test that a window kept up to date incrementally matches one read from scratch """
+@pytest.mark.parametrize("max_points", [None, 4, 7])
+def test_window_matches_fresh_read(store, max_points):
+    series = store.get_series("cpu")
+    for second in range(200):
+        now = 1000 + second
+        if second % 7 != 3:
+            store.record("cpu", float(second % 13), now)
+            store.record("cpu", float(second % 5), now)
+        if second % 3 == 0:
+            values = store.read_window("cpu", 30, max_points, now=now)
+            assert values == pytest.approx(expected_window(series, 1, 30, max_points, now), nan_ok=True)
+
+
+
+""" Test that a window only reads the slots after the ones it has settled """
+def test_window_reads_incrementally():
+    reads = []
+
+    def read(start, stop):
+        reads.append((start, stop))
+        return []
+    window = HistoryWindow(1, 100)
+    window.update(read, 1000)
+    window.update(read, 1010)
+    assert reads[0] == (900, 1000)
+    assert reads[1][0] == 1000 - 3
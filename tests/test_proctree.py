@@ -0,0 +1,171 @@
+""" Import the necessary modules for these tests """
+import pytest
+
+from components.proctree import ProcessTree
+
+
+
+""" Define a process row helper, in the order [pid, name, threads, user, memory, cpu, ppid] """
+def row(pid, ppid, threads=1, memory=10.0, cpu=1.0):
+    return [pid, f"proc{pid}", threads, "user", memory, cpu, ppid]
+
+
+
+""" Define a listener that records the structural changes it is told about """
+class Listener:
+    def __init__(self):
+        self.calls = []
+
+    def begin_insert(self, parent, position):
+        self.calls.append(("insert", parent and parent.pid, position))
+
+    def end_insert(self):
+        pass
+
+    def begin_remove(self, parent, position):
+        self.calls.append(("remove", parent and parent.pid, position))
+
+    def end_remove(self):
+        pass
+
+    def begin_reset(self):
+        self.calls.append(("reset",))
+
+    def end_reset(self):
+        pass
+
+    def totals_changed(self, nodes):
+        pass
+
+
+
+""" Utility function for checking that every node's position and totals match its subtree """
+def check_consistent(tree):
+    def walk(node):
+        threads, memory, cpu = node.row[2], node.row[4], node.row[5]
+        for position, child in enumerate(node.children):
+            assert child.parent is node
+            assert child.position == position
+            child_threads, child_memory, child_cpu = walk(child)
+            threads, memory, cpu = threads + child_threads, memory + child_memory, cpu + child_cpu
+        assert node.threads == threads
+        assert node.memory == pytest.approx(memory)
+        assert node.cpu == pytest.approx(cpu)
+        return threads, memory, cpu
+    for position, root in enumerate(tree.roots):
+        assert root.parent is None
+        assert root.position == position
+        walk(root)
+    counted = []
+    stack = list(tree.roots)
+    while stack:
+        node = stack.pop()
+        counted.append(node.pid)
+        stack.extend(node.children)
+    assert sorted(counted) == sorted(tree.nodes)
+
+
+
+""" Test that children attach under their parent and totals cover the subtree """
+def test_attach_builds_totals():
+    tree = ProcessTree()
+    tree.apply_delta([row(1, 0), row(2, 1, threads=3), row(3, 2, memory=5.0, cpu=2.5)], [], [])
+    assert [node.pid for node in tree.roots] == [1]
+    root = tree.nodes[1]
+    assert (root.threads, root.memory, root.cpu) == (5, 25.0, 4.5)
+    assert tree.nodes[3].parent is tree.nodes[2]
+    check_consistent(tree)
+
+
+
+""" Test that an orphan waits at the top level and moves under its parent when it appears """
+def test_orphan_adopted_when_parent_appears():
+    tree = ProcessTree()
+    tree.apply_delta([row(5, 4)], [], [])
+    assert tree.waiting == {4: {5}}
+    assert tree.nodes[5].parent is None
+    tree.apply_delta([row(4, 1)], [], [])
+    assert tree.nodes[5].parent is tree.nodes[4]
+    assert tree.waiting == {1: {4}}
+    check_consistent(tree)
+
+
+
+""" Test that orphans that exit, or never see their parent, do not stay in the waiting index """
+def test_waiting_index_does_not_leak():
+    tree = ProcessTree()
+    tree.apply_delta([row(pid, 1000 + pid) for pid in range(1, 50)], [], [])
+    assert len(tree.waiting) == 49
+    tree.apply_delta([], list(range(1, 50)), [])
+    assert tree.waiting == {}
+    assert tree.roots == [] and tree.nodes == {}
+
+
+
+""" Test that removing a process lifts its children to the top level and fixes positions """
+def test_remove_lifts_children():
+    listener = Listener()
+    tree = ProcessTree(listener)
+    tree.apply_delta([row(1, 0), row(2, 1), row(3, 1), row(4, 1), row(5, 3)], [], [])
+    listener.calls.clear()
+    touched = tree.apply_delta([], [3], [])
+    assert 3 not in tree.nodes
+    assert [node.pid for node in tree.nodes[1].children] == [2, 4]
+    assert [node.pid for node in tree.roots] == [1, 5]
+    assert tree.nodes[5].waits is None and 3 not in tree.waiting
+    assert ("remove", 1, 1) in listener.calls
+    assert tree.nodes[1] in touched
+    assert all(node.pid in tree.nodes for node in touched)
+    check_consistent(tree)
+
+
+
+""" Test that a parent PID change moves the process and refuses cycles """
+def test_reparent_and_cycle():
+    tree = ProcessTree()
+    tree.apply_delta([row(1, 0), row(2, 1), row(3, 2)], [], [])
+    tree.apply_delta([], [], [(3, {6: 1})])
+    assert tree.nodes[3].parent is tree.nodes[1]
+    tree.apply_delta([], [], [(1, {6: 3})])
+    assert tree.nodes[1].parent is None
+    check_consistent(tree)
+
+
+
+""" Test that figure changes are pushed up the chain of ancestors """
+def test_changed_figures_propagate():
+    tree = ProcessTree()
+    tree.apply_delta([row(1, 0), row(2, 1), row(3, 2)], [], [])
+    touched = tree.apply_delta([], [], [(3, {4: 110.0, 5: 0.5, 2: 4})])
+    assert {node.pid for node in touched} == {1, 2, 3}
+    assert (tree.nodes[1].threads, tree.nodes[1].memory, tree.nodes[1].cpu) == (6, 130.0, 2.5)
+    check_consistent(tree)
+
+
+
+""" Test that totals never drop below a node's own figures after float churn """
+def test_totals_never_negative():
+    tree = ProcessTree()
+    tree.apply_delta([row(1, 0, memory=0.1, cpu=0.1)], [], [])
+    for step in range(200):
+        pid = 100 + step
+        tree.apply_delta([row(pid, 1, memory=0.1 * step, cpu=0.3)], [], [])
+        tree.apply_delta([], [pid], [])
+    root = tree.nodes[1]
+    assert root.children == []
+    assert (root.threads, root.memory, root.cpu) == (1, 0.1, 0.1)
+
+
+
+""" Test that a reset rebuilds the tree and tells the listener once """
+def test_reset():
+    listener = Listener()
+    tree = ProcessTree(listener)
+    tree.apply_delta([row(1, 0), row(2, 1), row(9, 8)], [], [])
+    listener.calls.clear()
+    touched = tree.apply_delta([row(2, 1), row(3, 2)], [], [], True)
+    assert listener.calls == [("reset",)]
+    assert set(tree.nodes) == {2, 3}
+    assert tree.waiting == {1: {2}}
+    assert touched == set(tree.nodes.values())
+    check_consistent(tree)
@@ -0,0 +1,192 @@
+""" Import the necessary modules for these tests """
+from types import SimpleNamespace
+
+import pytest
+
+from components.recording import (
+    EVENT_DRIVES, EVENT_IO, EVENT_PROCESSES, EVENT_STATS, MAGIC, ChunkEncoder, ChunkReader,
+    SessionReader, SessionRecorder, StringDictionary, decode_chunk, write_signed, write_varint,
+)
+
+
+
+""" Test that varints round-trip across byte boundaries """
+@pytest.mark.parametrize("value", [0, 1, 127, 128, 300, 16383, 16384, 2 ** 32, 2 ** 63 + 5])
+def test_varint_round_trip(value):
+    out = bytearray()
+    write_varint(out, value)
+    reader = ChunkReader(bytes(out))
+    assert reader.varint() == value
+    assert reader.position == len(out)
+
+
+
+""" Test that varints use the expected number of bytes """
+def test_varint_sizes():
+    for value, size in ((0, 1), (127, 1), (128, 2), (16383, 2), (16384, 3)):
+        out = bytearray()
+        write_varint(out, value)
+        assert len(out) == size
+
+
+
+""" Test that zigzag values round-trip and small magnitudes stay small """
+@pytest.mark.parametrize("value", [0, 1, -1, 63, -64, 64, -65, 10 ** 12, -(10 ** 12)])
+def test_signed_round_trip(value):
+    out = bytearray()
+    write_signed(out, value)
+    assert ChunkReader(bytes(out)).signed() == value
+    if -64 <= value <= 63:
+        assert len(out) == 1
+
+
+
+""" Test that consecutive values are read back in order """
+def test_reader_reads_a_sequence():
+    out = bytearray()
+    for value in (5, -3, 1000):
+        write_signed(out, value)
+    write_varint(out, 3)
+    out += b"abc"
+    reader = ChunkReader(memoryview(bytes(out)))
+    assert [reader.signed() for _ in range(3)] == [5, -3, 1000]
+    assert reader.blob() == b"abc"
+
+
+
+""" Test that repeated strings are written once and read back by id """
+def test_string_dictionary_round_trip():
+    out = bytearray()
+    writer = StringDictionary()
+    for string in ("python", "bash", "python", None, "ünïcode", "bash"):
+        writer.write(out, string)
+    reader = ChunkReader(bytes(out))
+    strings = StringDictionary()
+    assert [strings.read(reader) for _ in range(6)] == ["python", "bash", "python", "", "ünïcode", "bash"]
+    assert out.count(b"python") == 1
+
+
+
+""" Define the events used by the chunk round-trip tests """
+def sample_events():
+    processes = [
+        [20, "python", 4, "alice", 123.5, 12.25, 1],
+        [3, "init", 1, None, 8.0, 0.0, 0],
+        [7, "bash", 1, "alice", 4.25, 0.5, 3],
+    ]
+    return [
+        (1000.0, EVENT_STATS, (10.5, [20.0, 1.25], 55.75, "12%")),
+        (1000.5, EVENT_PROCESSES, processes),
+        (1001.0, EVENT_STATS, (9.0, [0.0, 100.0], 56.0, "12%")),
+        (1001.25, EVENT_PROCESSES, [[3, "init", 1, None, 8.0, 0.0, 0], [20, "python", 5, "alice", 99.0, 0.0, 1], [40, "new", 2, "bob", 1.0, 3.0, 20]]),
+        (1001.5, EVENT_DRIVES, [("/dev/sda1", "/", 1000, 500, "OK")]),
+        (1002.0, EVENT_IO, ({"sda": (1.5, 2.0)}, {"eth0": (3.0, 4.0)})),
+        (1002.0, EVENT_STATS, (9.0, [0.0, 100.0, 50.0], 56.0, "13%")),
+    ]
+
+
+
+""" Test that every kind of event survives an encode and decode """
+def test_chunk_round_trip():
+    events = sample_events()
+    encoder = ChunkEncoder()
+    for timestamp, kind, data in events:
+        encoder.add(timestamp, kind, data)
+    decoded = decode_chunk(encoder.payload(), encoder.first_time)
+    assert len(decoded) == len(events)
+    for (timestamp, kind, data), (decoded_time, decoded_kind, decoded_data) in zip(events, decoded):
+        assert decoded_time == pytest.approx(timestamp)
+        assert decoded_kind == kind
+        if kind == EVENT_PROCESSES:
+            assert decoded_data == sorted(data, key=lambda process: process[0])
+        elif kind == EVENT_STATS:
+            assert decoded_data == (data[0], data[1], data[2], data[3])
+        else:
+            assert decoded_data == data
+
+
+
+""" Test that values are kept to the recorder's fixed-point precision """
+def test_chunk_rounds_to_fixed_point():
+    encoder = ChunkEncoder()
+    encoder.add(5.0, EVENT_PROCESSES, [[1, "p", None, None, None, 33.333333, None]])
+    encoder.add(5.0, EVENT_STATS, (12.3456, [], 0.004, None))
+    (_, _, processes), (_, _, stats) = decode_chunk(encoder.payload(), 5.0)
+    assert processes == [[1, "p", 0, None, 0.0, 33.33, 0]]
+    assert stats == (12.35, [], 0.0, "")
+
+
+
+""" Test that event times never go backwards, even if the clock does """
+def test_chunk_clamps_backward_times():
+    encoder = ChunkEncoder()
+    for timestamp in (10.0, 9.0, 11.0):
+        encoder.add(timestamp, EVENT_DRIVES, [])
+    times = [timestamp for timestamp, kind, data in decode_chunk(encoder.payload(), encoder.first_time)]
+    assert times == [10.0, 10.0, 11.0]
+
+
+
+""" Test that a recording written in several chunks reads back in order """
+def test_session_round_trip(tmp_path, monkeypatch):
+    path = tmp_path / "session.rmrec"
+    clock = iter(timestamp for timestamp, kind, data in sample_events())
+    monkeypatch.setattr("components.recording.time", SimpleNamespace(time=lambda: next(clock)))
+    recorder = SessionRecorder(str(path), chunk_seconds=1.0)
+    for timestamp, kind, data in sample_events():
+        recorder.add(kind, data)
+    recorder.close()
+    reader = SessionReader(str(path))
+    try:
+        assert len(reader.chunks) == 3
+        assert reader.start_time == 1000.0
+        assert reader.end_time == 1002.0
+        assert reader.chunk_at(1001.3) == 1
+        assert reader.chunk_at(0.0) == 0
+        events = [event for index in range(len(reader.chunks)) for event in reader.events(index)]
+    finally:
+        reader.close()
+    assert [kind for timestamp, kind, data in events] == [kind for timestamp, kind, data in sample_events()]
+    assert events[3][2][1] == [20, "python", 5, "alice", 99.0, 0.0, 1]
+
+
+
+""" Test that uncompressed recordings read back the same """
+def test_session_uncompressed(tmp_path):
+    path = tmp_path / "plain.rmrec"
+    recorder = SessionRecorder(str(path), compress=False)
+    recorder.add(EVENT_DRIVES, [("a", "/", 10, 5, "OK")])
+    recorder.close()
+    reader = SessionReader(str(path))
+    assert reader.events(0)[0][2] == [("a", "/", 10, 5, "OK")]
+    reader.close()
+
+
+
+""" Test that a chunk cut short by a crash is skipped and earlier chunks still read """
+def test_session_truncated_chunk(tmp_path):
+    path = tmp_path / "crash.rmrec"
+    recorder = SessionRecorder(str(path))
+    recorder.add(EVENT_DRIVES, [])
+    recorder.close()
+    recorder = SessionRecorder(str(path))
+    recorder.add(EVENT_DRIVES, [("b", "/b", 10, 5, "OK")])
+    recorder.close()
+    data = path.read_bytes()
+    path.write_bytes(data[:-3])
+    reader = SessionReader(str(path))
+    assert len(reader.chunks) == 1
+    assert reader.events(0)[0][2] == []
+    reader.close()
+
+
+
+""" Test that files that are not recordings are refused """
+def test_session_rejects_other_files(tmp_path):
+    path = tmp_path / "other.bin"
+    path.write_bytes(b"not a recording")
+    with pytest.raises(ValueError):
+        SessionReader(str(path))
+    with pytest.raises(ValueError):
+        SessionRecorder(str(path))
+    assert not path.read_bytes().startswith(MAGIC)
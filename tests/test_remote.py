@@ -0,0 +1,136 @@
+""" Import the necessary modules for these tests """
+import json
+import socket
+
+import pytest
+
+from components.recording import ChunkReader
+from components.remote import (
+    DEFAULT_PORT, FRAME, MSG_HELLO, MSG_PROCESSES, MSG_STATS, PROTOCOL_VERSION, RemoteHosts,
+    decode_processes, decode_stats, encode_processes, encode_stats, frame, is_local_address, parse_address,
+)
+
+
+
+""" Utility function for splitting a byte string back into (message type, payload) frames """
+def split_frames(data):
+    frames = []
+    offset = 0
+    while offset < len(data):
+        length, message_type = FRAME.unpack_from(data, offset)
+        offset += FRAME.size
+        frames.append((message_type, data[offset:offset + length]))
+        offset += length
+    return frames
+
+
+
+""" Test that frames carry their type and exact payload, including empty ones """
+def test_frame_round_trip():
+    data = frame(MSG_STATS, b"abc") + frame(MSG_HELLO, b"") + frame(MSG_PROCESSES, bytes(300))
+    assert split_frames(data) == [(MSG_STATS, b"abc"), (MSG_HELLO, b""), (MSG_PROCESSES, bytes(300))]
+
+
+
+""" Test that a process delta round-trips to the protocol's precision """
+def test_processes_round_trip():
+    added = [[12, "python", 4, "alice", 123.5, 12.25, 1], [5, "kworker", 1, None, 0.0, 0.0, 2]]
+    removed = [900, 3, 70000]
+    changed = [(12, {5: 50.5}), (40, {1: "renamed", 2: 9, 3: "bob", 4: 2048.25, 6: 1})]
+    assert decode_processes(ChunkReader(encode_processes(added, removed, changed, False))) == (added, sorted(removed), changed, False)
+
+
+
+""" Test that an empty reset delta round-trips """
+def test_processes_empty_reset():
+    assert decode_processes(ChunkReader(encode_processes([], [], [], True))) == ([], [], [], True)
+
+
+
+""" Test that missing values go over the wire as zeros and empty strings """
+def test_processes_missing_values():
+    added, removed, changed, reset = decode_processes(ChunkReader(encode_processes([[1, None, None, None, None, None, None]], [], [], False)))
+    assert added == [[1, "", 0, None, 0.0, 0.0, 0]]
+
+
+
+""" Test that a stats sample round-trips to hundredths """
+def test_stats_round_trip():
+    payload = encode_stats(12.346, [0.0, 100.0, 3.33], 45.5, "7%")
+    assert decode_stats(ChunkReader(payload)) == (12.35, [0.0, 100.0, 3.33], 45.5, "7%")
+
+
+
+""" Test that every address form parses """
+@pytest.mark.parametrize("address, expected", [
+    ("unix:/run/resmon.sock", (socket.AF_UNIX, "/run/resmon.sock")),
+    ("127.0.0.1:7374", (socket.AF_INET, ("127.0.0.1", 7374))),
+    ("example.com", (socket.AF_INET, ("example.com", DEFAULT_PORT))),
+    ("[::1]:9000", (socket.AF_INET6, ("::1", 9000))),
+])
+def test_parse_address(address, expected):
+    assert parse_address(address) == expected
+
+
+
+""" Test which addresses only accept local connections """
+@pytest.mark.parametrize("address, local", [
+    ("unix:/tmp/agent.sock", True),
+    ("127.0.0.1:7373", True),
+    ("localhost:7373", True),
+    ("[::1]:7373", True),
+    ("0.0.0.0:7373", False),
+    ("192.168.1.5:7373", False),
+])
+def test_is_local_address(address, local):
+    assert is_local_address(address) == local
+
+
+
+""" Define a fixture for a client watching one unconnected agent """
+@pytest.fixture
+def hosts():
+    remote = RemoteHosts(["127.0.0.1:1"])
+    yield remote
+    remote.wakeup_reader.close()
+    remote.wakeup_writer.close()
+    remote.selector.close()
+
+
+
+""" Utility function for handing a payload to the client as if it came from the agent """
+def deliver(remote, message_type, payload):
+    remote.handle(remote.hosts["127.0.0.1:1"], message_type, ChunkReader(payload))
+
+
+
+""" Test that a matching hello is accepted and the host's deltas are applied """
+def test_client_applies_deltas_after_hello(hosts):
+    events = []
+    hosts.connect("processes", lambda *args: events.append(args))
+    deliver(hosts, MSG_HELLO, json.dumps({"version": PROTOCOL_VERSION, "host": "web1", "cores": 8}).encode())
+    deliver(hosts, MSG_PROCESSES, encode_processes([[1, "init", 1, None, 8.0, 0.0, 0], [2, "sh", 1, None, 1.0, 0.0, 1]], [], [], True))
+    deliver(hosts, MSG_PROCESSES, encode_processes([], [1], [(2, {5: 25.0})], False))
+    host = hosts.hosts["127.0.0.1:1"]
+    assert host.name == "web1"
+    assert host.cores == 8
+    assert host.processes == {2: [2, "sh", 1, None, 1.0, 25.0, 1]}
+    assert len(events) == 2
+
+
+
+""" Test that an agent speaking another protocol version is dropped """
+def test_client_drops_other_versions(hosts):
+    deliver(hosts, MSG_HELLO, json.dumps({"version": PROTOCOL_VERSION + 1}).encode())
+    host = hosts.hosts["127.0.0.1:1"]
+    assert host.version is None
+    assert "protocol version" in host.status
+
+
+
+""" Test that frames sent before the hello are not decoded """
+def test_client_drops_data_before_hello(hosts):
+    deliver(hosts, MSG_STATS, encode_stats(1.0, [], 2.0, ""))
+    host = hosts.hosts["127.0.0.1:1"]
+    assert host.stats is None
+    assert host.status.startswith("Disconnected")
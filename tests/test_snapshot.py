@@ -0,0 +1,48 @@
+""" Import the necessary modules for these tests """
+from components.snapshot import SnapshotDiffer
+
+
+
+""" Define a process row helper, in the order [pid, name, threads, user, memory, cpu, ppid] """
+def row(pid, memory=10.0, cpu=0.0, name="proc", threads=1, ppid=1):
+    return [pid, name, threads, "user", memory, cpu, ppid]
+
+
+
+""" Test that the first snapshot is sent as new rows only """
+def test_first_diff_adds_everything():
+    differ = SnapshotDiffer()
+    added, removed, changed = differ.diff([row(1), row(2)])
+    assert [process[0] for process in added] == [1, 2]
+    assert removed == []
+    assert changed == []
+
+
+
+""" Test that exits, new PIDs and changed columns are reported """
+def test_diff_reports_added_removed_and_changed():
+    differ = SnapshotDiffer()
+    differ.diff([row(1), row(2, cpu=5.0)])
+    added, removed, changed = differ.diff([row(2, cpu=7.5, name="renamed"), row(3)])
+    assert [process[0] for process in added] == [3]
+    assert removed == [1]
+    assert changed == [(2, {1: "renamed", 5: 7.5})]
+
+
+
+""" Test that moves below the column thresholds are ignored and do not build up """
+def test_diff_ignores_jitter_below_thresholds():
+    differ = SnapshotDiffer()
+    differ.diff([row(1, memory=100.0, cpu=1.0)])
+    assert differ.diff([row(1, memory=100.005, cpu=1.05)]) == ([], [], [])
+    added, removed, changed = differ.diff([row(1, memory=100.009, cpu=1.1)])
+    assert changed == [(1, {5: 1.1})]
+
+
+
+""" Test that snapshot() returns the rows as last sent """
+def test_snapshot_returns_sent_rows():
+    differ = SnapshotDiffer()
+    differ.diff([row(1, cpu=1.0)])
+    differ.diff([row(1, cpu=1.05)])
+    assert differ.snapshot() == [row(1, cpu=1.0)]